@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the CPU execution profile: concurrent conversions with every
+worker using all cores (torch's default) against the profile's split threads, with
+and without core pinning, in conversions/minute.
+
+Usage:
+    python benchmarks/bench_cpu_profile.py [--workers 2] [--conversions 8]
+                                           [--model models/obama.pth] [--index models/obama.index]
+                                           [--input minimal_tts_rvc/output_tts.wav]
+"""
+
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import soundfile as sf
+import torch
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from minimal_tts_rvc.configs.config import Config
+from minimal_tts_rvc.cpu_profile import apply_cpu_profile, available_cores
+from minimal_tts_rvc.infer import VoiceConverter
+
+
+def run(converters, audio, sample_rate, args):
+    def convert(i):
+        return converters[i % len(converters)].convert_audio_array(
+            audio.copy(), sample_rate, args.model, args.index
+        )
+
+    # Fresh threads, so each picks up the current per-thread profile
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        list(executor.map(convert, range(args.workers)))  # warm up
+        start = time.perf_counter()
+        list(executor.map(convert, range(args.conversions)))
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--conversions", type=int, default=8)
+    parser.add_argument("--model", default=os.path.join(project_root, "models", "obama.pth"))
+    parser.add_argument("--index", default=os.path.join(project_root, "models", "obama.index"))
+    parser.add_argument(
+        "--input", default=os.path.join(project_root, "minimal_tts_rvc", "output_tts.wav")
+    )
+    args = parser.parse_args()
+
+    audio, sample_rate = sf.read(args.input, dtype="float32")
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+    config = Config()
+    cores = len(available_cores())
+    converters = [VoiceConverter() for _ in range(args.workers)]
+
+    results = {}
+    # Unprofiled: every worker thread runs torch with one thread per core
+    torch.set_num_threads(cores)
+    results[f"default ({cores} threads each)"] = run(converters, audio, sample_rate, args)
+    for pinning in (False, True):
+        config.cpu_pinning = pinning
+        profile = apply_cpu_profile(args.workers)
+        name = f"profile ({profile['threads']} threads each{', pinned' if pinning else ''})"
+        results[name] = run(converters, audio, sample_rate, args)
+
+    seconds = len(audio) / sample_rate
+    print(f"{args.conversions} conversions of {seconds:.1f} s on {args.workers} workers, {cores} cores")
+    baseline = next(iter(results.values()))
+    for name, elapsed in results.items():
+        print(f"  {name:34s} {args.conversions / elapsed * 60:7.1f} conversions/min  ({baseline / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for split_audio.merge_audio: the concatenating loop it used to run
+against the current preallocated merge, over many silence-split segments.
+
+Checks that both produce identical audio without crossfades, and also times the
+merge with crossfades. The old loop is quadratic in the number of segments, so the
+current merge is also timed alone on a larger input.
+
+Usage:
+    python benchmarks/bench_merge_audio.py [--segments 2000] [--large-segments 10000]
+                                           [--segment-ms 10] [--crossfade-ms 5]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from minimal_tts_rvc.tools.split_audio import merge_audio
+
+
+def concat_merge_audio(audio_segments_org, audio_segments_new, intervals, sr_orig, sr_new):
+    """The original implementation, kept for comparison"""
+    merged_audio = np.array([], dtype=audio_segments_new[0].dtype)
+    sr_ratio = sr_new / sr_orig
+
+    for i, (start, end) in enumerate(intervals):
+
+        start_new = int(start * sr_ratio)
+        end_new = int(end * sr_ratio)
+
+        original_duration = len(audio_segments_org[i]) / sr_orig
+        new_duration = len(audio_segments_new[i]) / sr_new
+        duration_diff = new_duration - original_duration
+
+        silence_samples = int(abs(duration_diff) * sr_new)
+        silence_compensation = np.zeros(
+            silence_samples, dtype=audio_segments_new[0].dtype
+        )
+
+        if i == 0 and start_new > 0:
+            initial_silence = np.zeros(start_new, dtype=audio_segments_new[0].dtype)
+            merged_audio = np.concatenate((merged_audio, initial_silence))
+
+        if duration_diff > 0:
+            merged_audio = np.concatenate((merged_audio, silence_compensation))
+
+        merged_audio = np.concatenate((merged_audio, audio_segments_new[i]))
+
+        if duration_diff < 0:
+            merged_audio = np.concatenate((merged_audio, silence_compensation))
+
+        if i < len(intervals) - 1:
+            next_start_new = int(intervals[i + 1][0] * sr_ratio)
+            silence_duration = next_start_new - end_new
+            if silence_duration > 0:
+                silence = np.zeros(silence_duration, dtype=audio_segments_new[0].dtype)
+                merged_audio = np.concatenate((merged_audio, silence))
+
+    return merged_audio
+
+
+def make_segments(count, segment_ms, sr_orig=16000, sr_new=40000, seed=0):
+    """Segments of random length with random silent gaps, converted to slightly shorter output"""
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(segment_ms * sr_orig // 2000, segment_ms * sr_orig // 1000 * 3 // 2, count)
+    gaps = rng.integers(sr_orig // 1000, sr_orig // 100, count)
+    starts = np.cumsum(gaps + np.concatenate([[0], lengths[:-1]]))
+    intervals = np.stack([starts, starts + lengths], axis=1)
+    segments_org = [np.zeros(length, dtype=np.float32) for length in lengths]
+    # The pipeline returns whole 10 ms frames, so converted segments are a little shorter
+    segments_new = [
+        rng.standard_normal(length * sr_new // sr_orig // (sr_new // 100) * (sr_new // 100)).astype(np.float32)
+        for length in lengths
+    ]
+    return segments_org, segments_new, intervals
+
+
+def time_it(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--segments", type=int, default=2000, help="Segments for the comparison")
+    parser.add_argument(
+        "--large-segments", type=int, default=10000, help="Segments for the current merge alone"
+    )
+    parser.add_argument("--segment-ms", type=int, default=10, help="Mean segment length")
+    parser.add_argument("--crossfade-ms", type=float, default=5)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    sr_orig, sr_new = 16000, 40000
+    segments_org, segments_new, intervals = make_segments(args.segments, args.segment_ms, sr_orig, sr_new)
+    merge_args = (segments_org, segments_new, intervals, sr_orig, sr_new)
+
+    concat_time, expected = time_it(lambda: concat_merge_audio(*merge_args), 1)
+    prealloc_time, merged = time_it(lambda: merge_audio(*merge_args), args.repeats)
+    np.testing.assert_array_equal(merged, expected)
+    crossfade_time, _ = time_it(
+        lambda: merge_audio(*merge_args, crossfade_ms=args.crossfade_ms), args.repeats
+    )
+
+    print(f"{args.segments} segments, {len(merged) / sr_new:.1f} s of output at {sr_new} Hz")
+    print(f"  concatenate loop     {concat_time * 1000:9.1f} ms")
+    print(f"  preallocated         {prealloc_time * 1000:9.1f} ms  ({concat_time / prealloc_time:.0f}x faster)")
+    print(f"  preallocated + {args.crossfade_ms:g} ms crossfade {crossfade_time * 1000:6.1f} ms")
+
+    segments_org, segments_new, intervals = make_segments(
+        args.large_segments, args.segment_ms, sr_orig, sr_new
+    )
+    merge_args = (segments_org, segments_new, intervals, sr_orig, sr_new)
+    prealloc_time, merged = time_it(lambda: merge_audio(*merge_args), args.repeats)
+    crossfade_time, _ = time_it(
+        lambda: merge_audio(*merge_args, crossfade_ms=args.crossfade_ms), args.repeats
+    )
+
+    print(f"{args.large_segments} segments, {len(merged) / sr_new:.1f} s of output at {sr_new} Hz")
+    print(f"  preallocated         {prealloc_time * 1000:9.1f} ms")
+    print(f"  preallocated + {args.crossfade_ms:g} ms crossfade {crossfade_time * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Cold-start load time and peak memory of a voice model from its .pth and from a package.
+
+Converts the model to a package in a temporary directory, then loads each format in
+fresh processes, the way a new worker would, and reports the time to a ready
+Synthesizer and the growth of the peak RSS during loading. The file stays in the
+page cache after the first run, so these are warm-cache cold starts. Both networks
+must produce the same audio for the same random seed.
+
+Usage:
+    python benchmarks/bench_model_load.py [--model models/obama.pth] [--repeats 3]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+
+def load(model_path, package_dir):
+    """Loads one model the way VoiceConverter does and reports time and peak RSS growth"""
+    import torch
+
+    from minimal_tts_rvc.model_package import find_package, load_package
+    from minimal_tts_rvc.synth_export import build_synthesizer
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if package_dir:
+        cpt = load_package(*find_package(model_path, package_dir))
+    else:
+        cpt = torch.load(model_path, map_location="cpu", weights_only=True)
+    net_g = build_synthesizer(cpt)
+    seconds = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return net_g, cpt, seconds, (rss_after - rss_before) / 1024
+
+
+def run_child(model_path, package_dir):
+    _, _, seconds, peak_mb = load(model_path, package_dir)
+    print(json.dumps({"seconds": seconds, "peak_mb": peak_mb}))
+
+
+def cold_start(model_path, package_dir):
+    command = [sys.executable, os.path.abspath(__file__), "--child", "--model", model_path]
+    if package_dir:
+        command += ["--package-dir", package_dir]
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", default=os.path.join(project_root, "models", "obama.pth"))
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--package-dir", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.model, args.package_dir)
+        return
+
+    import numpy as np
+    import torch
+
+    from minimal_tts_rvc.model_package import convert_model
+    from minimal_tts_rvc.synth_export import example_inputs
+
+    torch.set_grad_enabled(False)
+    with tempfile.TemporaryDirectory() as package_dir:
+        tensor_path = convert_model(args.model, package_dir)
+
+        reference, cpt, _, _ = load(args.model, None)
+        packaged, _, _, _ = load(args.model, package_dir)
+        inputs = example_inputs(reference, cpt)[:5]
+        outputs = []
+        for net_g in (reference, packaged):
+            torch.manual_seed(0)
+            outputs.append(net_g.infer(*inputs)[0][0, 0].numpy())
+        np.testing.assert_allclose(outputs[1], outputs[0], atol=1e-5)
+
+        results = {}
+        for name, directory in (("pth", None), ("package", package_dir)):
+            runs = [cold_start(args.model, directory) for _ in range(args.repeats)]
+            results[name] = min(runs, key=lambda run: run["seconds"])
+
+        sizes = {
+            "pth": os.path.getsize(args.model),
+            "package": os.path.getsize(tensor_path),
+        }
+
+    print(f"Model {os.path.basename(args.model)}, best of {args.repeats} fresh processes")
+    print(f"  {'format':8s} {'size':>9s} {'load':>9s} {'peak RSS':>10s}")
+    for name, result in results.items():
+        print(
+            f"  {name:8s} {sizes[name] / 1024**2:7.1f}MB {result['seconds'] * 1000:7.1f}ms "
+            f"{result['peak_mb']:8.1f}MB"
+        )
+    print(f"  package loads {results['pth']['seconds'] / results['package']['seconds']:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
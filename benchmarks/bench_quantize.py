@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Quality check and throughput benchmark for RVC_HUBERT_QUANT and RVC_SYNTH_QUANT on CPU.
+
+Converts the same clip with fp32 and with each reduced-precision mode, and reports
+the mean log-mel distance and the median F0 deviation (cents, voiced frames) of
+every output against fp32, together with conversion time. Run it per voice model
+to decide which modes keep acceptable quality.
+
+Usage:
+    python benchmarks/bench_quantize.py [--model models/obama.pth] [--index models/obama.index]
+                                        [--input minimal_tts_rvc/output_tts.wav] [--repeats 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import torch
+import librosa
+import soundfile as sf
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from minimal_tts_rvc.configs.config import Config
+from minimal_tts_rvc.infer import VoiceConverter
+
+# (RVC_HUBERT_QUANT, RVC_SYNTH_QUANT)
+MODES = [
+    ("none", "none"),
+    ("int8", "none"),
+    ("none", "bf16"),
+    ("int8", "bf16"),
+]
+
+
+def log_mel(audio, sample_rate):
+    mel = librosa.feature.melspectrogram(y=audio, sr=sample_rate, n_mels=80)
+    return np.log(mel + 1e-5)
+
+
+def f0_cents(audio, sample_rate):
+    f0, voiced, _ = librosa.pyin(audio, fmin=50, fmax=1100, sr=sample_rate)
+    return 1200 * np.log2(np.where(voiced, f0, np.nan) / 10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", default=os.path.join(project_root, "models", "obama.pth"))
+    parser.add_argument("--index", default=os.path.join(project_root, "models", "obama.index"))
+    parser.add_argument(
+        "--input", default=os.path.join(project_root, "minimal_tts_rvc", "output_tts.wav")
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    config = Config()
+    if config.device != "cpu":
+        print(f"Running on {config.device}; quantized modes only apply on CPU")
+    audio, sample_rate = sf.read(args.input, dtype="float32")
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+    seconds = len(audio) / sample_rate
+
+    results = {}
+    for hubert_quant, synth_quant in MODES:
+        config.hubert_quant, config.synth_quant = hubert_quant, synth_quant
+        # A fresh converter rebuilds net_g; HuBERT is shared per quantization mode
+        converter = VoiceConverter()
+
+        def convert():
+            torch.manual_seed(0)
+            return converter.convert_audio_array(
+                audio.copy(), sample_rate, args.model, args.index
+            )
+
+        output, tgt_sr = convert()  # warm up and load models
+        best = float("inf")
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            convert()
+            best = min(best, time.perf_counter() - start)
+        results[(hubert_quant, synth_quant)] = (output, tgt_sr, best)
+
+    reference, tgt_sr, reference_time = results[MODES[0]]
+    reference_mel = log_mel(reference, tgt_sr)
+    reference_f0 = f0_cents(reference, tgt_sr)
+
+    print(f"Input: {seconds:.1f} s, model {os.path.basename(args.model)}, {torch.get_num_threads()} threads")
+    print(f"  {'hubert':8s} {'synth':8s} {'time':>9s} {'speedup':>8s} {'log-mel':>8s} {'F0 cents':>9s}")
+    for (hubert_quant, synth_quant), (output, _, elapsed) in results.items():
+        mel = log_mel(output, tgt_sr)
+        frames = min(mel.shape[1], reference_mel.shape[1])
+        mel_distance = np.abs(mel[:, :frames] - reference_mel[:, :frames]).mean()
+        f0 = f0_cents(output, tgt_sr)
+        frames = min(len(f0), len(reference_f0))
+        f0_distance = np.nanmedian(np.abs(f0[:frames] - reference_f0[:frames]))
+        print(
+            f"  {hubert_quant:8s} {synth_quant:8s} {elapsed * 1000:7.0f}ms "
+            f"{reference_time / elapsed:7.2f}x {mel_distance:8.4f} {f0_distance:9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Equivalence check and timing of batched segment conversion (RVC_SEGMENT_BATCH_SIZE).
+
+Converts the same long clip, which the pipeline splits into several segments, with a
+batch size of 1 and with each larger batch size, and checks that the outputs match.
+The synthesizer's random noise and sine phase are zeroed while converting, so both
+paths are deterministic; the remaining differences come from padding the shorter
+segments of a batch. Features are not cached, so every run goes through HuBERT.
+A batch holds several full segments (about 40 s each on CPU), so on small machines
+pass --segment-seconds to cut the input into shorter ones.
+
+Usage:
+    python benchmarks/bench_segment_batch.py [--model models/obama.pth] [--index models/obama.index]
+                                             [--input minimal_tts_rvc/output_tts.wav] [--seconds 120]
+                                             [--batch-sizes 2,4] [--f0-method rmvpe]
+                                             [--segment-seconds 10]
+"""
+
+import os
+import sys
+import time
+import argparse
+import contextlib
+
+import numpy as np
+import torch
+import soundfile as sf
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from minimal_tts_rvc.configs.config import Config
+from minimal_tts_rvc.infer import VoiceConverter, resolve_index_path
+from minimal_tts_rvc.utils import prepare_audio_infer
+
+
+@contextlib.contextmanager
+def zero_noise():
+    """Makes torch.rand and torch.randn_like return zeros"""
+    rand, randn_like = torch.rand, torch.randn_like
+    torch.rand = lambda *size, **kwargs: torch.zeros(*size, **kwargs)
+    torch.randn_like = lambda input, **kwargs: torch.zeros_like(input, **kwargs)
+    try:
+        yield
+    finally:
+        torch.rand, torch.randn_like = rand, randn_like
+
+
+def time_it(fn, repeats):
+    best, result = None, None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", default=os.path.join(project_root, "models", "obama.pth"))
+    parser.add_argument("--index", default=os.path.join(project_root, "models", "obama.index"))
+    parser.add_argument(
+        "--input", default=os.path.join(project_root, "minimal_tts_rvc", "output_tts.wav")
+    )
+    parser.add_argument(
+        "--seconds", type=float, default=120, help="The input is looped to this length"
+    )
+    parser.add_argument("--batch-sizes", default="2,4")
+    parser.add_argument("--f0-method", default="rmvpe")
+    parser.add_argument("--embedder-model", default="contentvec")
+    parser.add_argument("--embedder-model-custom", default=None)
+    parser.add_argument(
+        "--segment-seconds", type=int, default=None, help="Nominal segment length (x_center)"
+    )
+    parser.add_argument("--repeats", type=int, default=1)
+    parser.add_argument("--atol", type=float, default=1e-3)
+    args = parser.parse_args()
+
+    config = Config()
+    # Nothing is cached, so a batched run cannot reuse the features of the sequential one
+    config.feature_cache_mb = 0
+    if args.segment_seconds:
+        # Keep the device defaults' proportions (x_query 6, x_center 38, x_max 41)
+        config.x_query = max(1, args.segment_seconds // 6)
+        config.x_center = args.segment_seconds
+        config.x_max = args.segment_seconds + 3
+    torch.set_grad_enabled(False)
+
+    audio, sample_rate = sf.read(args.input, dtype="float32")
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+    audio = np.resize(audio, int(args.seconds * sample_rate))
+    audio = prepare_audio_infer(audio, sample_rate, 16000)
+
+    converter = VoiceConverter()
+    converter.get_vc(args.model, 0)
+    if converter.vc is None:
+        sys.exit(f"Could not load {args.model}")
+    converter.load_hubert(args.embedder_model, args.embedder_model_custom)
+    file_index = resolve_index_path(args.index)
+    pipeline = converter.vc
+
+    def convert(batch_size):
+        with zero_noise():
+            return pipeline.pipeline(
+                model=converter.hubert_model,
+                net_g=converter.net_g,
+                sid=0,
+                audio=audio.copy(),
+                pitch=0,
+                f0_method=args.f0_method,
+                file_index=file_index,
+                index_rate=0.75,
+                pitch_guidance=converter.use_f0,
+                volume_envelope=1,
+                version=converter.version,
+                protect=0.33,
+                hop_length=128,
+                f0_autotune=False,
+                f0_autotune_strength=1,
+                f0_file=None,
+                batch_size=batch_size,
+            )
+
+    segments = len(pipeline.find_split_points(audio)) + 1
+    print(f"{len(audio) / 16000:.1f}s input, {segments} segments, {config.device}")
+    if segments < 2:
+        sys.exit("The input is not split; pass a larger --seconds")
+
+    reference_time, reference = time_it(lambda: convert(1), args.repeats)
+    print(f"  batch  1: {reference_time:.3f}s")
+    for batch_size in [int(size) for size in args.batch_sizes.split(",")]:
+        elapsed, output = time_it(lambda: convert(batch_size), args.repeats)
+        assert output.shape == reference.shape, (output.shape, reference.shape)
+        max_diff = np.abs(output - reference).max()
+        np.testing.assert_allclose(output, reference, atol=args.atol)
+        print(
+            f"  batch {batch_size:2d}: {elapsed:.3f}s ({reference_time / elapsed:.2f}x), "
+            f"max abs diff {max_diff:.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark for Pipeline.find_split_points: the window-by-window moving sum it used
+to run against the current cumulative-sum search, in seconds of audio per second.
+
+Usage:
+    python benchmarks/bench_split_points.py [--minutes 10] [--repeats 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from minimal_tts_rvc.pipeline import Pipeline
+
+SAMPLE_RATE = 16000
+
+
+def loop_split_points(pipeline, audio):
+    """The original implementation, kept for comparison"""
+    audio_pad = np.pad(audio, (pipeline.window // 2, pipeline.window // 2), mode="reflect")
+    opt_ts = []
+    if audio_pad.shape[0] > pipeline.t_max:
+        audio_sum = np.zeros_like(audio)
+        for i in range(pipeline.window):
+            audio_sum += audio_pad[i : i - pipeline.window]
+        for t in range(pipeline.t_center, audio.shape[0], pipeline.t_center):
+            opt_ts.append(
+                t
+                - pipeline.t_query
+                + np.where(
+                    np.abs(audio_sum[t - pipeline.t_query : t + pipeline.t_query])
+                    == np.abs(audio_sum[t - pipeline.t_query : t + pipeline.t_query]).min()
+                )[0][0]
+            )
+    return opt_ts
+
+
+def make_pipeline():
+    """A pipeline with only the split settings from Pipeline.__init__, so no models are loaded"""
+    pipeline = Pipeline.__new__(Pipeline)
+    pipeline.window = 160
+    pipeline.t_query = SAMPLE_RATE * 6
+    pipeline.t_center = SAMPLE_RATE * 38
+    pipeline.t_max = SAMPLE_RATE * 41
+    return pipeline
+
+
+def time_it(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=10, help="Length of the simulated input")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    seconds = args.minutes * 60
+    rng = np.random.default_rng(0)
+    audio = rng.standard_normal(int(seconds * SAMPLE_RATE)) * 0.1
+
+    pipeline = make_pipeline()
+    expected = loop_split_points(pipeline, audio)
+    actual = pipeline.find_split_points(audio)
+    assert actual == [int(t) for t in expected], "split points differ"
+
+    loop_time = time_it(lambda: loop_split_points(pipeline, audio), args.repeats)
+    vec_time = time_it(lambda: pipeline.find_split_points(audio), args.repeats)
+
+    print(f"Input: {args.minutes:g} min of audio ({len(actual)} split points)")
+    print(f"  loop:    {seconds / loop_time:10.0f} s audio/sec ({loop_time * 1000:.1f} ms)")
+    print(f"  cumsum:  {seconds / vec_time:10.0f} s audio/sec ({vec_time * 1000:.1f} ms)")
+    print(f"  speedup: {loop_time / vec_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
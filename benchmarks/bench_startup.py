@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Import-time profile of the API server module.
+
+Imports the module in a fresh interpreter with `python -X importtime` and reports
+the total import time, the slowest imports by cumulative time, and which of the
+heavy inference/RAG dependencies were loaded at import time; with lazy imports none
+of them should be, as the server's background warm-up loads them.
+
+Usage:
+    python benchmarks/bench_startup.py [--module main] [--top 20]
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+import subprocess
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = [
+    "torch",
+    "transformers",
+    "faiss",
+    "torchcrepe",
+    "librosa",
+    "noisereduce",
+    "pedalboard",
+    "langchain",
+    "langchain_openai",
+    "langchain_chroma",
+    "chromadb",
+    "openai",
+    "edge_tts",
+]
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)")
+
+
+def profile_import(module):
+    """Returns the -X importtime entries as (cumulative us, depth, name) and the heavy modules loaded"""
+    script = (
+        f"import sys, json; import {module}; "
+        f"print(json.dumps([name for name in {HEAVY_MODULES!r} if name in sys.modules]))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        cwd=project_root,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        sys.exit(result.stderr.strip().splitlines()[-1])
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            cumulative, indent, name = int(match.group(2)), len(match.group(3)), match.group(4)
+            entries.append((cumulative, (indent - 1) // 2, name))
+    return entries, json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--top", type=int, default=20, help="Number of slowest imports to list")
+    args = parser.parse_args()
+
+    entries, heavy = profile_import(args.module)
+    total = next((cumulative for cumulative, _, name in entries if name == args.module), 0)
+
+    print(f"import {args.module}: {total / 1000:.1f} ms")
+    print("Slowest imports (cumulative, nesting depth):")
+    for cumulative, depth, name in sorted(entries, reverse=True)[: args.top]:
+        print(f"  {cumulative / 1000:9.1f} ms  {depth:2d}  {name}")
+    if heavy:
+        print(f"Heavy modules loaded at import time: {', '.join(heavy)}")
+    else:
+        print("No heavy modules loaded at import time")
+
+
+if __name__ == "__main__":
+    main()
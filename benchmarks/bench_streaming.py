@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Per-block latency of StreamingConverter for several block sizes.
+
+Feeds a clip through the converter in real-time sized chunks and reports the mean
+and 95th percentile processing time per block, the real-time factor (processing
+time / block length; it must stay below 1 for live use) and the end-to-end latency.
+
+Usage:
+    python benchmarks/bench_streaming.py [--model models/obama.pth] [--index models/obama.index]
+                                         [--input minimal_tts_rvc/output_tts.wav] [--blocks 200 300 500]
+"""
+
+import os
+import sys
+import argparse
+
+import numpy as np
+import soundfile as sf
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from minimal_tts_rvc.infer import VoiceConverter
+from minimal_tts_rvc.streaming import StreamingConverter
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", default=os.path.join(project_root, "models", "obama.pth"))
+    parser.add_argument("--index", default=os.path.join(project_root, "models", "obama.index"))
+    parser.add_argument(
+        "--input", default=os.path.join(project_root, "minimal_tts_rvc", "output_tts.wav")
+    )
+    parser.add_argument("--blocks", type=int, nargs="+", default=[200, 300, 500], help="Block sizes in ms")
+    parser.add_argument("--output", default=None, help="Write the streamed conversion of the last block size here")
+    args = parser.parse_args()
+
+    audio, sample_rate = sf.read(args.input, dtype="float32")
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+    converter = VoiceConverter()
+    chunk = sample_rate // 50  # 20 ms, as a microphone would deliver it
+
+    print(f"Input: {len(audio) / sample_rate:.1f} s at {sample_rate} Hz, model {os.path.basename(args.model)}")
+    print(f"  {'block':>7s} {'mean':>9s} {'p95':>9s} {'RTF':>6s} {'latency':>9s}")
+    for block_ms in args.blocks:
+        streamer = StreamingConverter(
+            converter, args.model, args.index, sample_rate=sample_rate, block_ms=block_ms
+        )
+        outputs = []
+        for start in range(0, len(audio), chunk):
+            outputs.extend(streamer.push(audio[start : start + chunk]))
+        outputs.extend(streamer.flush())
+        stats = streamer.stats()
+        latency = stats["algorithmic_latency_ms"] + stats["processing_ms_p95"]
+        print(
+            f"  {block_ms:5d}ms {stats['processing_ms_mean']:7.1f}ms {stats['processing_ms_p95']:7.1f}ms "
+            f"{stats['real_time_factor']:6.2f} {latency:7.0f}ms"
+        )
+    if args.output:
+        sf.write(args.output, np.concatenate(outputs), streamer.tgt_sr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Parity check and latency benchmark for exported Synthesizer graphs against eager mode.
+
+Exports the model to TorchScript and (if onnx/onnxruntime are installed) ONNX in a
+temporary directory. The TorchScript export is never skipped, since it is the default
+format and runtime; it must match eager output for the same random seed;
+ONNX draws its own generator noise, so it is compared by log-mel distance. Decoding
+only the last frames (`rate`, as the streaming converter does) must return as many
+samples as eager mode, and the same samples for TorchScript.
+
+Usage:
+    python benchmarks/bench_synth_export.py [--model models/obama.pth] [--seconds 5] [--repeats 5]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+import torch
+import librosa
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root)
+
+from minimal_tts_rvc.synth_export import (
+    build_synthesizer,
+    example_inputs,
+    export_model,
+    load_exported_synthesizer,
+)
+
+FRAMES_PER_SECOND = 100  # feature frames after the pipeline's 2x upsampling
+
+
+def log_mel(audio, sample_rate):
+    mel = librosa.feature.melspectrogram(y=audio, sr=sample_rate, n_mels=80)
+    return np.log(mel + 1e-5)
+
+
+def time_it(fn, repeats):
+    fn()  # warm up
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", default=os.path.join(project_root, "models", "obama.pth"))
+    parser.add_argument("--seconds", type=float, default=5, help="Length of the simulated input")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    torch.set_grad_enabled(False)
+    cpt = torch.load(args.model, map_location="cpu", weights_only=True)
+    sample_rate = cpt["config"][-1]
+    eager = build_synthesizer(cpt)
+    phone, phone_lengths, pitch, nsff0, sid, _ = example_inputs(
+        eager, cpt, frames=int(args.seconds * FRAMES_PER_SECOND)
+    )
+
+    def run_eager():
+        torch.manual_seed(0)
+        return eager.infer(phone, phone_lengths, pitch, nsff0, sid)[0]
+
+    reference = run_eager()[0, 0].numpy()
+    rate = torch.tensor([0.25])
+    torch.manual_seed(0)
+    reference_tail = eager.infer(phone, phone_lengths, pitch, nsff0, sid, rate)[0][0, 0].numpy()
+    reference_mel = log_mel(reference, sample_rate)
+    timings = {"eager": time_it(run_eager, args.repeats)}
+
+    with tempfile.TemporaryDirectory() as export_dir:
+        for fmt in ("torchscript", "onnx"):
+            try:
+                export_model(args.model, fmt, export_dir)
+                exported = load_exported_synthesizer(args.model, fmt, export_dir)
+            except ImportError as error:
+                print(f"Skipping {fmt}: {error}")
+                continue
+
+            def run_exported():
+                torch.manual_seed(0)
+                return exported.infer(phone, phone_lengths, pitch, nsff0, sid)[0]
+
+            output = run_exported()[0, 0].numpy()
+            mel_distance = np.abs(log_mel(output, sample_rate) - reference_mel).mean()
+            torch.manual_seed(0)
+            tail = exported.infer(phone, phone_lengths, pitch, nsff0, sid, rate)[0][0, 0].numpy()
+            assert tail.shape == reference_tail.shape, (tail.shape, reference_tail.shape)
+            if fmt == "torchscript":
+                np.testing.assert_allclose(output, reference, atol=1e-4)
+                np.testing.assert_allclose(tail, reference_tail, atol=1e-4)
+            print(f"{fmt}: max abs diff {np.abs(output - reference).max():.2e}, mean log-mel distance {mel_distance:.4f}")
+            timings[fmt] = time_it(run_exported, args.repeats)
+
+    print(f"Input: {args.seconds:g} s of audio, model {os.path.basename(args.model)}")
+    for name, seconds in timings.items():
+        print(f"  {name:12s} {seconds * 1000:8.1f} ms  ({args.seconds / seconds:6.1f}x real time, {timings['eager'] / seconds:.2f}x eager)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import time
+import uuid
+import queue
+import threading
+import traceback
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+class SynthesisJobQueue:
+    """Bounded job queue drained by a fixed pool of inference worker threads.
+
+    Workers are threads rather than processes so every job shares the warm
+    converter pool of the server process. The handler is called as
+    handler(payload, progress); progress(done, total) updates the job record.
+    """
+
+    def __init__(self, handler: Callable, num_workers: int = 2, max_queue: int = 32, max_finished: int = 1000):
+        self.handler = handler
+        self.num_workers = num_workers
+        self.max_queue = max_queue
+        self.max_finished = max_finished
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._jobs: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._workers = []
+        self._wait_times = []
+
+    def start(self):
+        """Start the worker threads"""
+        for i in range(self.num_workers - len(self._workers)):
+            worker = threading.Thread(target=self._worker_loop, name=f"synthesis-worker-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, payload) -> Dict:
+        """Enqueue a job and return its record; raises QueueFullError when at capacity"""
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "status": "queued",
+            "submitted_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "wait_time": None,
+            "result": None,
+            "error": None,
+            "progress": None,
+        }
+        with self._lock:
+            try:
+                self._queue.put_nowait((job["job_id"], payload))
+            except queue.Full:
+                raise QueueFullError(f"Job queue is full ({self.max_queue} jobs)")
+            self._jobs[job["job_id"]] = job
+        return dict(job)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Return a snapshot of a job record, or None if unknown"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            job = dict(job)
+        if job["status"] == "queued":
+            job["wait_time"] = time.time() - job["submitted_at"]
+            job["position"] = self._position(job_id)
+        return job
+
+    def stats(self) -> Dict:
+        """Queue depth, worker count and wait-time statistics"""
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job["status"]] = counts.get(job["status"], 0) + 1
+            wait_times = list(self._wait_times)
+            now = time.time()
+            oldest_wait = max(
+                (now - job["submitted_at"] for job in self._jobs.values() if job["status"] == "queued"),
+                default=0.0,
+            )
+        return {
+            "queue_depth": self._queue.qsize(),
+            "max_queue": self.max_queue,
+            "workers": self.num_workers,
+            "jobs": counts,
+            "oldest_queued_wait": oldest_wait,
+            "avg_wait_time": sum(wait_times) / len(wait_times) if wait_times else 0.0,
+            "max_wait_time": max(wait_times, default=0.0),
+        }
+
+    def _position(self, job_id: str) -> int:
+        with self._lock:
+            queued = [jid for jid, job in self._jobs.items() if job["status"] == "queued"]
+        return queued.index(job_id) if job_id in queued else 0
+
+    def _worker_loop(self):
+        while True:
+            job_id, payload = self._queue.get()
+            with self._lock:
+                job = self._jobs[job_id]
+                job["status"] = "running"
+                job["started_at"] = time.time()
+                job["wait_time"] = job["started_at"] - job["submitted_at"]
+                self._wait_times.append(job["wait_time"])
+                # Only the most recent waits are kept for the rolling statistics
+                del self._wait_times[:-100]
+            try:
+                result = self.handler(payload, lambda done, total: self._set_progress(job_id, done, total))
+                status, error = "done", None
+            except Exception as e:
+                print(f"[ERROR] Job {job_id} failed: {e}")
+                print(traceback.format_exc())
+                result, status, error = None, "failed", str(getattr(e, "detail", e))
+            with self._lock:
+                job["status"] = status
+                job["result"] = result
+                job["error"] = error
+                job["finished_at"] = time.time()
+                self._prune_finished()
+            self._queue.task_done()
+
+    def _set_progress(self, job_id: str, done: int, total: int):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job["progress"] = {"done": done, "total": total}
+
+    def _prune_finished(self):
+        finished = [jid for jid, job in self._jobs.items() if job["status"] in ("done", "failed")]
+        for jid in finished[: max(0, len(finished) - self.max_finished)]:
+            del self._jobs[jid]
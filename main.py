@@ -1,27 +1,46 @@
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import FileResponse, JSONResponse, HTMLResponse
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import FileResponse, JSONResponse, HTMLResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import os
 import uuid
-import openai
+import asyncio
+import threading
 from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from starlette.concurrency import run_in_threadpool
 import json
-from minimal_tts_rvc.tts_rvc_cli import tts_rvc_pipeline, list_models, validate_models, test_tts_voice, MODELS
+import numpy as np
+from contextlib import ExitStack
+from minimal_tts_rvc.result_cache import ResultCache
+from minimal_tts_rvc.f0_cache import F0Cache
+from minimal_tts_rvc.feature_cache import FeatureCache
+from minimal_tts_rvc.tts_cache import TTSCache
+from minimal_tts_rvc.configs.config import Config
+from minimal_tts_rvc.cpu_profile import apply_cpu_profile, cpu_profile_info
+from minimal_tts_rvc.tts_rvc_cli import tts_rvc_pipeline, tts_rvc_pipeline_async, tts_rvc_stream, tts_rvc_multi_pipeline, tts_rvc_long_pipeline, rvc_stream_converter, warm_up_model, list_models, validate_models, test_tts_voice, prewarm_tts_cache, load_prewarm_phrases, MODELS
+from job_queue import SynthesisJobQueue, QueueFullError
+from warmup import WarmUp, import_modules
 
 # Load environment variables first
 from dotenv import load_dotenv
 load_dotenv()
 
-# Fix deprecated imports - use the new langchain-openai package
-from langchain_openai import OpenAIEmbeddings
-from langchain_chroma import Chroma  # Fixed import
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.schema import Document
-import chromadb
-
-# Import the RAG system
-from rag_system import SpeechRAGSystem
+# openai, langchain, chromadb and the inference stack (torch, transformers, faiss,
+# torchcrepe, librosa, noisereduce, pedalboard) are imported on first use, so the
+# server starts answering right away and loads them in the background warm-up.
+# `python benchmarks/bench_startup.py` reports what importing this module costs.
+WARMUP_MODULES = [
+    "torch",
+    "transformers",
+    "faiss",
+    "librosa",
+    "minimal_tts_rvc.infer",
+    "minimal_tts_rvc.converter_pool",
+    "minimal_tts_rvc.streaming",
+    "minimal_tts_rvc.tts_backends",
+    "rag_system",
+]
 
 app = FastAPI(title="Minimal TTS + RVC API with RAG", description="Text-to-Speech and RVC voice conversion backend with RAG capabilities.")
 
@@ -34,15 +53,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize OpenAI client
-openai.api_key = os.getenv("OPENAI_API_KEY")
-
-# Initialize vector store with proper API key
-embeddings = OpenAIEmbeddings(openai_api_key=os.getenv("OPENAI_API_KEY"))
+# Vector store embeddings, created with the vector store
+embeddings = None
 vector_store = None
 
 # Replace the existing RAG functions with the new system
 rag_system = None
+_rag_lock = threading.Lock()
+
+# Job queue for /jobs: Config().cpu_workers inference workers drain a bounded queue
+SYNTH_QUEUE_MAX = int(os.getenv("SYNTH_QUEUE_MAX", "32"))
+job_queue = None
+_job_queue_lock = threading.Lock()
+
+# /synthesize awaits TTS on the event loop and runs RVC inference here
+inference_executor = None
+_executor_lock = threading.Lock()
+
+# Background startup steps; GET /ready reports them
+warmup = WarmUp()
 
 class SynthesizeRequest(BaseModel):
     text: str
@@ -50,6 +79,16 @@ class SynthesizeRequest(BaseModel):
     use_rag: bool = True
     context_window: int = 3
 
+class SynthesizeMultiRequest(BaseModel):
+    text: str
+    models: List[str]
+    use_rag: bool = True
+    context_window: int = 3
+
+class LongFormRequest(BaseModel):
+    text: str
+    model: str
+
 class SpeechPatternRequest(BaseModel):
     text: str
     description: str
@@ -63,6 +102,9 @@ class RAGResponse(BaseModel):
 def analyze_speech_patterns(text: str) -> Dict:
     """Use OpenAI to analyze speech patterns in text - optimized for tokens"""
     try:
+        import openai
+        
+        openai.api_key = os.getenv("OPENAI_API_KEY")
         # Shorter, more focused prompt
         response = openai.ChatCompletion.create(
             model="gpt-3.5-turbo",
@@ -82,7 +124,12 @@ def analyze_speech_patterns(text: str) -> Dict:
 
 def initialize_vector_store():
     """Initialize the vector store for speech patterns"""
-    global vector_store
+    global vector_store, embeddings
+    from langchain_openai import OpenAIEmbeddings
+    from langchain_chroma import Chroma
+    
+    if embeddings is None:
+        embeddings = OpenAIEmbeddings(openai_api_key=os.getenv("OPENAI_API_KEY"))
     
     # Create persistent directory
     persist_directory = "speech_patterns_db"
@@ -100,6 +147,7 @@ def initialize_vector_store():
 def add_speech_pattern(text: str, description: str, model: str):
     """Add a speech pattern to the vector store"""
     global vector_store
+    from langchain.schema import Document
     
     if vector_store is None:
         vector_store = initialize_vector_store()
@@ -154,16 +202,31 @@ def retrieve_relevant_patterns(query: str, model: str, k: int = 3) -> List[Dict]
 def initialize_rag_system():
     """Initialize the RAG system"""
     global rag_system
-    if rag_system is None:
-        rag_system = SpeechRAGSystem(os.getenv("OPENAI_API_KEY"))
-        # Process documents if they exist
-        if os.path.exists("speech_documents"):
-            print("Processing speech documents with RAG...")
-            rag_system.process_speech_documents()
-        else:
-            print("Speech documents not found. Using fallback patterns.")
+    with _rag_lock:
+        if rag_system is None:
+            from rag_system import SpeechRAGSystem
+            
+            rag_system = SpeechRAGSystem(os.getenv("OPENAI_API_KEY"))
+            # Process documents if they exist
+            if os.path.exists("speech_documents"):
+                print("Processing speech documents with RAG...")
+                rag_system.process_speech_documents()
+            else:
+                print("Speech documents not found. Using fallback patterns.")
     return rag_system
 
+def get_inference_executor() -> ThreadPoolExecutor:
+    """Apply the CPU profile and create the inference executor on first use"""
+    global inference_executor
+    with _executor_lock:
+        if inference_executor is None:
+            workers = Config().cpu_workers
+            # Split torch/FAISS threads between the inference workers before any of them start
+            profile = apply_cpu_profile(workers)
+            print(f"CPU profile: {profile['threads']} torch threads per worker on {profile['cores']} cores, pinning {'on' if profile['pinning'] else 'off'}")
+            inference_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="inference")
+    return inference_executor
+
 def enhance_text_with_advanced_rag(text: str, model: str, emotion: str = None, context_window: int = 3) -> RAGResponse:
     """Enhanced RAG with the new system"""
     global rag_system
@@ -201,13 +264,36 @@ def home():
       <li>GET /models - List available models</li>
       <li>GET /validate - Validate model files exist</li>
       <li>POST /synthesize - Synthesize speech (see docs)</li>
+      <li>POST /synthesize/stream - Stream synthesized speech sentence by sentence</li>
+      <li>POST /jobs - Queue a synthesis job, poll GET /jobs/{job_id}</li>
+      <li>POST /synthesize/long - Queue long-form synthesis of a whole document</li>
+      <li>POST /synthesize/multi - Synthesize one text in several voices</li>
+      <li>WS /ws/convert - Live voice conversion of microphone audio</li>
+      <li>GET /cache/stats - Result cache hit/miss counters</li>
       <li>GET /health - Health check</li>
+      <li>GET /ready - Readiness check, 503 until the background warm-up has finished</li>
     </ul>
     """
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    """Liveness check; answers during warm-up"""
+    return {"status": "ok", "ready": warmup.ready, "models": model_warmup_status(), "cpu_profile": cpu_profile_info()}
+
+@app.get("/ready")
+def ready():
+    """Readiness check: 200 once every warm-up step has finished, 503 before or if one failed"""
+    status = warmup.status()
+    return JSONResponse(content=status, status_code=200 if status["ready"] else 503)
+
+@app.get("/cache/stats")
+def cache_stats():
+    """Hit/miss counters and size of the synthesis result cache and the analysis caches"""
+    stats = ResultCache().stats()
+    stats["f0"] = F0Cache().stats()
+    stats["features"] = FeatureCache().stats()
+    stats["tts"] = TTSCache().stats()
+    return stats
 
 @app.get("/models")
 def get_models():
@@ -261,68 +347,337 @@ def get_audio_file(filename: str):
         filename=filename
     )
 
-@app.post("/synthesize")
-def synthesize(req: SynthesizeRequest):
+def validate_synthesize_request(req: SynthesizeRequest):
     if req.model not in MODELS:
         raise HTTPException(status_code=400, detail=f"Model '{req.model}' not found.")
     if not req.text or not req.text.strip():
         raise HTTPException(status_code=400, detail="Text must not be empty.")
-    
-    # Generate unique output file per request
-    output_dir = "output"
+
+def new_output_path(model_choice: str, output_dir: str = "output") -> str:
+    """Generate a unique output file per request"""
     os.makedirs(output_dir, exist_ok=True)
     unique_id = uuid.uuid4().hex[:8]
-    model_choice = req.model
-    out_path = os.path.join(output_dir, f"{model_choice}_{unique_id}_rvc.mp3")
+    return os.path.join(output_dir, f"{model_choice}_{unique_id}_rvc.mp3")
+
+def enhance_request_text(req: SynthesizeRequest):
+    """Return (text_to_synthesize, rag_result), applying enhanced RAG if requested"""
+    if not req.use_rag:
+        return req.text, None
+    rag_result = enhance_text_with_advanced_rag(req.text, req.model, req.context_window)
+    print(f"RAG enhanced text: {rag_result.enhanced_text}")
+    print(f"Confidence: {rag_result.confidence_score}")
+    return rag_result.enhanced_text, rag_result
+
+def run_synthesis(req: SynthesizeRequest) -> Dict:
+    """Run RAG enhancement, TTS and RVC for a request and return the response payload"""
+    out_path = new_output_path(req.model)
+    text_to_synthesize, rag_result = enhance_request_text(req)
+    
+    # Generate speech
+    tts_rvc_pipeline(text_to_synthesize, req.model, output_dir="output", output_path=out_path)
+    return build_synthesis_response(req, text_to_synthesize, rag_result, out_path)
+
+def run_long_form(req: LongFormRequest, progress=None) -> Dict:
+    """Synthesize a whole document without RAG; progress(done, total) is reported per converted chunk"""
+    out_path = new_output_path(req.model)
+    tts_rvc_long_pipeline(req.text, req.model, out_path, progress=progress)
+    return {
+        "file_path": out_path,
+        "model": req.model,
+        "characters": len(req.text),
+        "audio_url": f"/audio/{os.path.basename(out_path)}",
+        "status": "success"
+    }
+
+def run_job(payload, progress=None) -> Dict:
+    """Job queue handler for /jobs and /synthesize/long payloads"""
+    if isinstance(payload, LongFormRequest):
+        return run_long_form(payload, progress)
+    return run_synthesis(payload)
+
+async def run_synthesis_async(req: SynthesizeRequest) -> Dict:
+    """run_synthesis for the event loop: RAG runs in the threadpool, TTS is awaited, RVC runs on inference_executor"""
+    out_path = new_output_path(req.model)
+    text_to_synthesize, rag_result = await run_in_threadpool(enhance_request_text, req)
+    
+    await tts_rvc_pipeline_async(text_to_synthesize, req.model, output_dir="output", output_path=out_path, executor=await run_in_threadpool(get_inference_executor))
+    return build_synthesis_response(req, text_to_synthesize, rag_result, out_path)
+
+def build_synthesis_response(req: SynthesizeRequest, text_to_synthesize: str, rag_result, out_path: str) -> Dict:
+    """Response payload shared by /synthesize and finished /jobs"""
+    response_data = {
+        "file_path": out_path,
+        "original_text": req.text,
+        "synthesized_text": text_to_synthesize,
+        "model": req.model
+    }
+    
+    if req.use_rag:
+        response_data["rag_info"] = {
+            "enhanced": True,
+            "confidence": rag_result.confidence_score,
+            "patterns_used": len(rag_result.retrieved_patterns)
+        }
+    
+    # Return JSON response with file URL
+    response_data.update({
+        "audio_url": f"/audio/{os.path.basename(out_path)}",
+        "duration": 0,  # You can calculate this if needed
+        "status": "success"
+    })
+    return response_data
+
+@app.post("/synthesize")
+async def synthesize(req: SynthesizeRequest):
+    validate_synthesize_request(req)
+    
+    try:
+        return JSONResponse(content=await run_synthesis_async(req))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Synthesis failed: {e}")
+
+@app.post("/synthesize/stream")
+def synthesize_stream(req: SynthesizeRequest):
+    """Stream MP3 audio sentence by sentence as each one finishes converting"""
+    validate_synthesize_request(req)
     
     try:
-        # Apply enhanced RAG if requested
         if req.use_rag:
-            rag_result = enhance_text_with_advanced_rag(req.text, model_choice, req.context_window)
-            text_to_synthesize = rag_result.enhanced_text
-            print(f"RAG enhanced text: {text_to_synthesize}")
-            print(f"Confidence: {rag_result.confidence_score}")
+            text_to_synthesize = enhance_text_with_advanced_rag(req.text, req.model, req.context_window).enhanced_text
         else:
             text_to_synthesize = req.text
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Synthesis failed: {e}")
+    
+    return StreamingResponse(
+        tts_rvc_stream(text_to_synthesize, req.model),
+        media_type="audio/mpeg",
+        headers={"X-Synthesized-Text": text_to_synthesize.encode("ascii", "ignore").decode()[:1000]}
+    )
+
+@app.websocket("/ws/convert")
+async def convert_live(websocket: WebSocket, model: str, sample_rate: int = 48000, block_ms: int = 300, pitch: Optional[int] = None):
+    """Convert a live stream of mono float32 PCM frames, replying with converted PCM per block"""
+    await websocket.accept()
+    if model not in MODELS:
+        await websocket.close(code=1008, reason=f"Model '{model}' not found.")
+        return
+    options = {"block_ms": block_ms}
+    if pitch is not None:
+        options["pitch"] = pitch
+    loop = asyncio.get_running_loop()
+    # Off the event loop: the first call applies the CPU profile, which imports torch
+    inference_executor = await run_in_threadpool(get_inference_executor)
+    stack = ExitStack()
+    try:
+        # Loading the model can take seconds, so keep it off the event loop
+        streamer = await loop.run_in_executor(
+            inference_executor, stack.enter_context, rvc_stream_converter(model, sample_rate, **options)
+        )
+        await websocket.send_json({"type": "ready", "sample_rate": streamer.tgt_sr, **streamer.stats()})
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes") is not None:
+                audio = np.frombuffer(message["bytes"], dtype="<f4")
+                outputs = await loop.run_in_executor(inference_executor, streamer.push, audio)
+                for output in outputs:
+                    await websocket.send_bytes(output.astype("<f4").tobytes())
+                    await websocket.send_json({"type": "block", **streamer.last_block_stats})
+            elif json.loads(message.get("text") or "{}").get("type") == "end":
+                for output in await loop.run_in_executor(inference_executor, streamer.flush):
+                    await websocket.send_bytes(output.astype("<f4").tobytes())
+                await websocket.send_json({"type": "end", **streamer.stats()})
+                await websocket.close()
+                break
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        await websocket.close(code=1011, reason=f"Conversion failed: {e}"[:120])
+    finally:
+        stack.close()
+
+@app.post("/synthesize/multi")
+def synthesize_multi(req: SynthesizeMultiRequest):
+    """Synthesize one text in several voices, sharing TTS and analysis between them"""
+    # Keep the requested order but convert each model once
+    model_choices = list(dict.fromkeys(req.models))
+    if not model_choices:
+        raise HTTPException(status_code=400, detail="At least one model is required.")
+    for model_choice in model_choices:
+        validate_synthesize_request(SynthesizeRequest(text=req.text, model=model_choice))
+    
+    try:
+        texts = {}
+        for model_choice in model_choices:
+            if req.use_rag:
+                texts[model_choice] = enhance_text_with_advanced_rag(req.text, model_choice, req.context_window).enhanced_text
+            else:
+                texts[model_choice] = req.text
         
-        # Generate speech
-        rvc_path = tts_rvc_pipeline(text_to_synthesize, model_choice, output_dir=output_dir)
-        os.rename(rvc_path, out_path)
-        
-        # Return enhanced response
-        response_data = {
-            "file_path": out_path,
-            "original_text": req.text,
-            "synthesized_text": text_to_synthesize,
-            "model": model_choice
-        }
-        
-        if req.use_rag:
-            response_data["rag_info"] = {
-                "enhanced": True,
-                "confidence": rag_result.confidence_score,
-                "patterns_used": len(rag_result.retrieved_patterns)
-            }
-        
-        # Return JSON response with file URL
-        response_data.update({
-            "audio_url": f"/audio/{os.path.basename(out_path)}",
-            "duration": 0,  # You can calculate this if needed
-            "status": "success"
-        })
-        
-        return JSONResponse(content=response_data)
-        
+        outputs = tts_rvc_multi_pipeline(texts, output_dir="output")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Synthesis failed: {e}")
+    
+    results = [
+        {
+            "model": model_choice,
+            "synthesized_text": texts[model_choice],
+            "file_path": outputs[model_choice],
+            "audio_url": f"/audio/{os.path.basename(outputs[model_choice])}"
+        }
+        for model_choice in model_choices
+    ]
+    return JSONResponse(content={
+        "original_text": req.text,
+        "results": results,
+        "status": "success"
+    })
 
-# Update the startup event
-@app.on_event("startup")
-async def startup_event():
+def get_job_queue() -> SynthesisJobQueue:
+    """Create and start the synthesis job queue on first use"""
+    global job_queue
+    # Warm-up and the request threadpool can both get here first
+    with _job_queue_lock:
+        if job_queue is None:
+            # Applies the CPU profile before the workers start
+            get_inference_executor()
+            job_queue = SynthesisJobQueue(run_job, num_workers=Config().cpu_workers, max_queue=SYNTH_QUEUE_MAX)
+            job_queue.start()
+            print(f"Synthesis job queue started with {job_queue.num_workers} workers")
+    return job_queue
+
+@app.post("/jobs", status_code=202)
+def submit_job(req: SynthesizeRequest):
+    """Queue a synthesis job and return its id immediately"""
+    validate_synthesize_request(req)
+    queue = get_job_queue()
+    try:
+        job = queue.submit(req)
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+    
+    return {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "status_url": f"/jobs/{job['job_id']}",
+        "queue_depth": queue.stats()["queue_depth"]
+    }
+
+@app.post("/synthesize/long", status_code=202)
+def synthesize_long(req: LongFormRequest):
+    """Queue long-form synthesis of a whole document; poll GET /jobs/{job_id} for per-chunk progress"""
+    validate_synthesize_request(SynthesizeRequest(text=req.text, model=req.model))
+    queue = get_job_queue()
+    try:
+        job = queue.submit(req)
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+    
+    return {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "status_url": f"/jobs/{job['job_id']}",
+        "queue_depth": queue.stats()["queue_depth"]
+    }
+
+@app.get("/jobs")
+def job_stats():
+    """Queue depth, worker count and per-job wait times"""
+    return get_job_queue().stats()
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """Report the status of a queued job and its audio URL once done"""
+    job = get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    response_data = {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "wait_time": job["wait_time"]
+    }
+    if job["status"] == "queued":
+        response_data["position"] = job["position"]
+    if job["status"] == "running" and job["progress"] is not None:
+        response_data["progress"] = job["progress"]
+    if job["status"] == "done":
+        response_data.update(job["result"])
+        response_data["status"] = "done"
+    if job["status"] == "failed":
+        response_data["error"] = f"Synthesis failed: {job['error']}"
+    return response_data
+
+def warm_up_cpu_profile():
+    """Warm-up step: apply the CPU profile and create the inference executor"""
+    get_inference_executor()
+    return cpu_profile_info()
+
+def warmup_model_names() -> List[str]:
+    """Models named by Config().warmup_models ("all" for every model); unknown names are skipped"""
+    setting = Config().warmup_models.strip()
+    if setting == "all":
+        return list(MODELS)
+    names = [name.strip() for name in setting.split(",") if name.strip()]
+    for name in names:
+        if name not in MODELS:
+            print(f"[WARNING] RVC_WARMUP_MODELS: model '{name}' not found, skipping it")
+    return [name for name in names if name in MODELS]
+
+def plan_model_warmup() -> List[str]:
+    """Warm-up step: add a step per model in Config().warmup_models"""
+    names = warmup_model_names()
+    for name in names:
+        warmup.add_step(f"model:{name}", lambda name=name: warm_up_voice(name))
+    return names
+
+def warm_up_voice(model_choice: str) -> Dict:
+    """Preload a model and run a dummy conversion on an inference worker, so that thread is warm too"""
+    return get_inference_executor().submit(warm_up_model, model_choice, Config().warmup_seconds).result()
+
+def model_warmup_status() -> Dict:
+    """Per-model warm-up status and times, from the model:<name> warm-up steps"""
+    return {
+        step["name"][len("model:"):]: {
+            "status": step["status"],
+            "seconds": step["seconds"],
+            **(step["detail"] or {}),
+            "error": step["error"],
+        }
+        for step in warmup.status()["steps"]
+        if step["name"].startswith("model:")
+    }
+
+def warm_up_rag():
+    """Warm-up step: initialize the RAG system"""
     print("Initializing RAG system...")
     initialize_rag_system()
     print("RAG system initialized successfully!")
 
+# Update the startup event
+@app.on_event("startup")
+async def startup_event():
+    # Heavy imports, the CPU profile, the job queue, the RAG system and the models in
+    # RVC_WARMUP_MODELS load in the background; GET /ready turns 200 once they have
+    warmup.add_step("imports", lambda: import_modules(WARMUP_MODULES))
+    warmup.add_step("cpu_profile", warm_up_cpu_profile)
+    warmup.add_step("job_queue", lambda: get_job_queue().num_workers)
+    warmup.add_step("rag", warm_up_rag)
+    warmup.add_step("models", plan_model_warmup)
+    warmup.start()
+    print("Warm-up started, GET /ready reports its progress")
+    # Runs in the background so startup does not wait on edge-tts (or on Config, which loads torch)
+    asyncio.create_task(prewarm_tts())
+
+async def prewarm_tts():
+    """Fill the TTS cache from Config().tts_prewarm_file, if set"""
+    prewarm_file = await run_in_threadpool(lambda: Config().tts_prewarm_file)
+    if prewarm_file and os.path.exists(prewarm_file):
+        print(f"Prewarming TTS cache from {prewarm_file}")
+        await prewarm_tts_cache(load_prewarm_phrases(prewarm_file))
+
 if __name__ == "__main__":
     import uvicorn
     print("Starting Minimal TTS + RVC API server...")
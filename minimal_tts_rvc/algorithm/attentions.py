@@ -1,5 +1,6 @@
 import math
 import torch
+from typing import Optional
 from minimal_tts_rvc.algorithm.commons import convert_pad_shape
 
 
@@ -76,19 +77,20 @@ class MultiHeadAttention(torch.nn.Module):
                 self.conv_k.weight.copy_(self.conv_q.weight)
                 self.conv_k.bias.copy_(self.conv_q.bias)
 
-    def forward(self, x, c, attn_mask=None):
+    def forward(self, x, c, attn_mask: Optional[torch.Tensor] = None):
         # Compute query, key, value projections
         q, k, v = self.conv_q(x), self.conv_k(c), self.conv_v(c)
 
         # Compute attention
-        x, self.attn = self.attention(q, k, v, mask=attn_mask)
+        x, _ = self.attention(q, k, v, mask=attn_mask)
 
         # Final output projection
         return self.conv_o(x)
 
-    def attention(self, query, key, value, mask=None):
+    def attention(self, query, key, value, mask: Optional[torch.Tensor] = None):
         # Reshape and compute scaled dot-product attention
-        b, d, t_s, t_t = (*key.size(), query.size(2))
+        b, d, t_s = key.size(0), key.size(1), key.size(2)
+        t_t = query.size(2)
         query = query.view(b, self.n_heads, self.k_channels, t_t).transpose(2, 3)
         key = key.view(b, self.n_heads, self.k_channels, t_s).transpose(2, 3)
         value = value.view(b, self.n_heads, self.k_channels, t_s).transpose(2, 3)
@@ -105,7 +107,7 @@ class MultiHeadAttention(torch.nn.Module):
 
         if mask is not None:
             scores = scores.masked_fill(mask == 0, -1e4)
-            if self.block_length:
+            if self.block_length is not None:
                 block_mask = (
                     torch.ones_like(scores)
                     .triu(-self.block_length)
@@ -124,14 +126,14 @@ class MultiHeadAttention(torch.nn.Module):
 
         return output.transpose(2, 3).contiguous().view(b, d, t_t), p_attn
 
-    def _compute_relative_scores(self, query, length):
+    def _compute_relative_scores(self, query, length: int):
         rel_emb = self._get_relative_embeddings(self.emb_rel_k, length)
         rel_logits = self._matmul_with_relative_keys(
             query / math.sqrt(self.k_channels), rel_emb
         )
         return self._relative_position_to_absolute_position(rel_logits)
 
-    def _apply_relative_values(self, p_attn, length):
+    def _apply_relative_values(self, p_attn, length: int):
         rel_weights = self._absolute_position_to_relative_position(p_attn)
         rel_emb = self._get_relative_embeddings(self.emb_rel_v, length)
         return self._matmul_with_relative_values(rel_weights, rel_emb)
@@ -143,7 +145,7 @@ class MultiHeadAttention(torch.nn.Module):
     def _matmul_with_relative_keys(self, x, y):
         return torch.matmul(x, y.unsqueeze(0).transpose(-2, -1))
 
-    def _get_relative_embeddings(self, embeddings, length):
+    def _get_relative_embeddings(self, embeddings, length: int):
         pad_length = max(length - (self.window_size + 1), 0)
         start = max((self.window_size + 1) - length, 0)
         end = start + 2 * length - 1
@@ -173,13 +175,13 @@ class MultiHeadAttention(torch.nn.Module):
         x = torch.nn.functional.pad(
             x, convert_pad_shape([[0, 0], [0, 0], [0, 0], [0, length - 1]])
         )
-        x_flat = x.view(batch, heads, length**2 + length * (length - 1))
+        x_flat = x.view(batch, heads, length * length + length * (length - 1))
         x_flat = torch.nn.functional.pad(
             x_flat, convert_pad_shape([[0, 0], [0, 0], [length, 0]])
         )
         return x_flat.view(batch, heads, length, 2 * length)[:, :, :, 1:]
 
-    def _attention_bias_proximal(self, length):
+    def _attention_bias_proximal(self, length: int):
         r = torch.arange(length, dtype=torch.float32)
         diff = r.unsqueeze(0) - r.unsqueeze(1)
         return -torch.log1p(torch.abs(diff)).unsqueeze(0).unsqueeze(0)
@@ -210,26 +212,31 @@ class FFN(torch.nn.Module):
         causal: bool = False,
     ):
         super().__init__()
-        self.padding_fn = self._causal_padding if causal else self._same_padding
+        self.causal = causal
 
         self.conv_1 = torch.nn.Conv1d(in_channels, filter_channels, kernel_size)
         self.conv_2 = torch.nn.Conv1d(filter_channels, out_channels, kernel_size)
         self.drop = torch.nn.Dropout(p_dropout)
 
-        self.activation = activation
+        self.gelu = activation == "gelu"
 
     def forward(self, x, x_mask):
-        x = self.conv_1(self.padding_fn(x * x_mask))
+        x = self.conv_1(self._padding(x * x_mask))
         x = self._apply_activation(x)
         x = self.drop(x)
-        x = self.conv_2(self.padding_fn(x * x_mask))
+        x = self.conv_2(self._padding(x * x_mask))
         return x * x_mask
 
     def _apply_activation(self, x):
-        if self.activation == "gelu":
+        if self.gelu:
             return x * torch.sigmoid(1.702 * x)
         return torch.relu(x)
 
+    def _padding(self, x):
+        if self.causal:
+            return self._causal_padding(x)
+        return self._same_padding(x)
+
     def _causal_padding(self, x):
         pad_l, pad_r = self.conv_1.kernel_size[0] - 1, 0
         return torch.nn.functional.pad(
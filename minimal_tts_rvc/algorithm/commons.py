@@ -1,5 +1,5 @@
 import torch
-from typing import Optional
+from typing import List, Optional
 
 
 def init_weights(m, mean=0.0, std=0.01):
@@ -27,16 +27,17 @@ def get_padding(kernel_size, dilation=1):
     return int((kernel_size * dilation - dilation) / 2)
 
 
-def convert_pad_shape(pad_shape):
+def convert_pad_shape(pad_shape: List[List[int]]) -> List[int]:
     """
     Convert the pad shape to a list of integers.
 
     Args:
         pad_shape: The pad shape..
     """
-    l = pad_shape[::-1]
-    pad_shape = [item for sublist in l for item in sublist]
-    return pad_shape
+    pad: List[int] = []
+    for i in range(len(pad_shape) - 1, -1, -1):
+        pad.extend(pad_shape[i])
+    return pad
 
 
 def slice_segments(
@@ -85,6 +86,28 @@ def rand_slice_segments(x, x_lengths=None, segment_size=4):
     return ret, ids_str
 
 
+def fold_weight_norm(module):
+    """
+    Folds weight normalization into plain weights for every submodule of a module.
+
+    Handles both `torch.nn.utils.parametrizations.weight_norm` and the legacy
+    hook-based `torch.nn.utils.weight_norm`; outputs are unchanged.
+
+    Args:
+        module: The module to fold in place.
+    """
+    for submodule in list(module.modules()):
+        if torch.nn.utils.parametrize.is_parametrized(submodule):
+            for name in list(submodule.parametrizations.keys()):
+                torch.nn.utils.parametrize.remove_parametrizations(
+                    submodule, name, leave_parametrized=True
+                )
+        for hook in list(submodule._forward_pre_hooks.values()):
+            if type(hook).__name__ == "WeightNorm":
+                torch.nn.utils.remove_weight_norm(submodule, hook.name)
+    return module
+
+
 @torch.jit.script
 def fused_add_tanh_sigmoid_multiply(input_a, input_b, n_channels):
     """
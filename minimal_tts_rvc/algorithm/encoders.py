@@ -73,14 +73,16 @@ class Encoder(torch.nn.Module):
         attn_mask = x_mask.unsqueeze(2) * x_mask.unsqueeze(-1)
         x = x * x_mask
 
-        for i in range(self.n_layers):
-            y = self.attn_layers[i](x, x, attn_mask)
+        for attn_layer, norm_layer_1, ffn_layer, norm_layer_2 in zip(
+            self.attn_layers, self.norm_layers_1, self.ffn_layers, self.norm_layers_2
+        ):
+            y = attn_layer(x, x, attn_mask)
             y = self.drop(y)
-            x = self.norm_layers_1[i](x + y)
+            x = norm_layer_1(x + y)
 
-            y = self.ffn_layers[i](x, x_mask)
+            y = ffn_layer(x, x_mask)
             y = self.drop(y)
-            x = self.norm_layers_2[i](x + y)
+            x = norm_layer_2(x + y)
 
         return x * x_mask
 
@@ -129,7 +131,7 @@ class TextEncoder(torch.nn.Module):
         self, phone: torch.Tensor, pitch: Optional[torch.Tensor], lengths: torch.Tensor
     ):
         x = self.emb_phone(phone)
-        if pitch is not None and self.emb_pitch:
+        if self.emb_pitch is not None and pitch is not None:
             x += self.emb_pitch(pitch)
 
         x *= math.sqrt(self.hidden_channels)
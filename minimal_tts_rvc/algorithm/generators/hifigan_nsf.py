@@ -185,25 +185,15 @@ class HiFiGANNSFGenerator(torch.nn.Module):
             x = torch.nn.functional.leaky_relu(x, self.lrelu_slope)
             # Apply upsampling layer
             if self.training and self.checkpointing:
-                x = checkpoint(ups, x, use_reentrant=False)
-                x = x + noise_convs(har_source)
-                xs = sum(
-                    [
-                        checkpoint(resblock, x, use_reentrant=False)
-                        for j, resblock in enumerate(self.resblocks)
-                        if j in range(i * self.num_kernels, (i + 1) * self.num_kernels)
-                    ]
-                )
+                xs = self._checkpointed_stage(x, har_source, i)
             else:
                 x = ups(x)
                 x = x + noise_convs(har_source)
-                xs = sum(
-                    [
-                        resblock(x)
-                        for j, resblock in enumerate(self.resblocks)
-                        if j in range(i * self.num_kernels, (i + 1) * self.num_kernels)
-                    ]
-                )
+                # A loop rather than sum() over a filtered list, so TorchScript can compile it
+                xs = torch.zeros_like(x)
+                for j, resblock in enumerate(self.resblocks):
+                    if i * self.num_kernels <= j and j < (i + 1) * self.num_kernels:
+                        xs = xs + resblock(x)
             x = xs / self.num_kernels
 
         x = torch.nn.functional.leaky_relu(x)
@@ -211,6 +201,19 @@ class HiFiGANNSFGenerator(torch.nn.Module):
 
         return x
 
+    @torch.jit.unused
+    def _checkpointed_stage(self, x, har_source, i: int):
+        # Training only; gradient checkpointing cannot be scripted
+        x = checkpoint(self.ups[i], x, use_reentrant=False)
+        x = x + self.noise_convs[i](har_source)
+        return sum(
+            [
+                checkpoint(resblock, x, use_reentrant=False)
+                for j, resblock in enumerate(self.resblocks)
+                if j in range(i * self.num_kernels, (i + 1) * self.num_kernels)
+            ]
+        )
+
     def remove_weight_norm(self):
         for l in self.ups:
             remove_weight_norm(l)
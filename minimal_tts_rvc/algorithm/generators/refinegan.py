@@ -6,6 +6,7 @@ from torch.nn import functional as F
 from torch.nn.utils.parametrizations import weight_norm
 from torch.nn.utils import remove_weight_norm
 from torch.utils.checkpoint import checkpoint
+from typing import Optional
 
 from minimal_tts_rvc.algorithm.commons import init_weights, get_padding
 
@@ -249,7 +250,7 @@ class SineGenerator(nn.Module):
             f0_buf = torch.zeros(f0.shape[0], f0.shape[1], self.dim, device=f0.device)
             # fundamental component
             f0_buf[:, :, 0] = f0[:, :, 0]
-            for idx in np.arange(self.harmonic_num):
+            for idx in range(self.harmonic_num):
                 f0_buf[:, :, idx + 1] = f0_buf[:, :, 0] * (idx + 2)
 
             sine_waves = self._f02sine(f0_buf) * self.sine_amp
@@ -302,7 +303,7 @@ class RefineGANGenerator(nn.Module):
         self.leaky_relu_slope = leaky_relu_slope
         self.checkpointing = checkpointing
 
-        self.upp = np.prod(upsample_rates)
+        self.upp = int(np.prod(upsample_rates))
         self.m_source = SineGenerator(sample_rate)
 
         # expanded f0 sinegen -> match mel_conv
@@ -384,7 +385,9 @@ class RefineGANGenerator(nn.Module):
         )
         self.conv_post.apply(init_weights)
 
-    def forward(self, mel: torch.Tensor, f0: torch.Tensor, g: torch.Tensor = None):
+    def forward(
+        self, mel: torch.Tensor, f0: torch.Tensor, g: Optional[torch.Tensor] = None
+    ):
 
         f0 = F.interpolate(
             f0.unsqueeze(1), size=mel.shape[-1] * self.upp, mode="linear"
@@ -401,17 +404,17 @@ class RefineGANGenerator(nn.Module):
             mel = mel + self.cond(g)
         x = torch.cat([mel, x], dim=1)
 
-        for ups, res, down in zip(
-            self.upsample_blocks,
-            self.upsample_conv_blocks,
-            self.downsample_blocks,
+        for i, (ups, res, down) in enumerate(
+            zip(
+                self.upsample_blocks,
+                self.upsample_conv_blocks,
+                self.downsample_blocks,
+            )
         ):
             x = F.leaky_relu(x, self.leaky_relu_slope)
 
             if self.training and self.checkpointing:
-                x = checkpoint(ups, x, use_reentrant=False)
-                x = torch.cat([x, down(har_source)], dim=1)
-                x = checkpoint(res, x, use_reentrant=False)
+                x = self._checkpointed_stage(x, har_source, i)
             else:
                 x = ups(x)
                 x = torch.cat([x, down(har_source)], dim=1)
@@ -423,6 +426,13 @@ class RefineGANGenerator(nn.Module):
 
         return x
 
+    @torch.jit.unused
+    def _checkpointed_stage(self, x, har_source, i: int):
+        # Training only; gradient checkpointing cannot be scripted
+        x = checkpoint(self.upsample_blocks[i], x, use_reentrant=False)
+        x = torch.cat([x, self.downsample_blocks[i](har_source)], dim=1)
+        return checkpoint(self.upsample_conv_blocks[i], x, use_reentrant=False)
+
     def remove_weight_norm(self):
         remove_weight_norm(self.pre_conv)
         remove_weight_norm(self.mel_conv)
@@ -1,4 +1,5 @@
 import torch
+from typing import Optional
 from minimal_tts_rvc.algorithm.commons import fused_add_tanh_sigmoid_multiply
 
 
@@ -37,7 +38,7 @@ class WaveNet(torch.nn.Module):
 
         self.in_layers = torch.nn.ModuleList()
         self.res_skip_layers = torch.nn.ModuleList()
-        self.drop = torch.nn.Dropout(p_dropout)
+        self.drop = torch.nn.Dropout(float(p_dropout))  # an int p cannot be scripted
 
         # Conditional layer for global conditioning
         if gin_channels:
@@ -75,14 +76,16 @@ class WaveNet(torch.nn.Module):
                 )
             )
 
-    def forward(self, x, x_mask, g=None):
+    def forward(self, x, x_mask, g: Optional[torch.Tensor] = None):
         output = x.clone().zero_()
 
         # Apply conditional layer if global conditioning is provided
         g = self.cond_layer(g) if g is not None else None
 
-        for i in range(self.n_layers):
-            x_in = self.in_layers[i](x)
+        for i, (in_layer, res_skip_layer) in enumerate(
+            zip(self.in_layers, self.res_skip_layers)
+        ):
+            x_in = in_layer(x)
             g_l = (
                 g[
                     :,
@@ -90,7 +93,7 @@ class WaveNet(torch.nn.Module):
                     :,
                 ]
                 if g is not None
-                else 0
+                else torch.zeros_like(x_in)
             )
 
             # Activation with fused Tanh-Sigmoid
@@ -98,7 +101,7 @@ class WaveNet(torch.nn.Module):
             acts = self.drop(acts)
 
             # Residual and skip connections
-            res_skip_acts = self.res_skip_layers[i](acts)
+            res_skip_acts = res_skip_layer(acts)
             if i < self.n_layers - 1:
                 res_acts = res_skip_acts[:, : self.hidden_channels, :]
                 x = (x + res_acts) * x_mask
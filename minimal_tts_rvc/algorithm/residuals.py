@@ -24,11 +24,11 @@ def create_conv1d_layer(channels, kernel_size, dilation):
 
 
 def apply_mask(tensor: torch.Tensor, mask: Optional[torch.Tensor]):
-    return tensor * mask if mask else tensor
+    return tensor * mask if mask is not None else tensor
 
 
 def apply_mask_(tensor: torch.Tensor, mask: Optional[torch.Tensor]):
-    return tensor.mul_(mask) if mask else tensor
+    return tensor.mul_(mask) if mask is not None else tensor
 
 
 class ResBlock(torch.nn.Module):
@@ -51,6 +51,7 @@ class ResBlock(torch.nn.Module):
         # Create convolutional layers with specified dilations and initialize weights
         self.convs1 = self._create_convs(channels, kernel_size, dilations)
         self.convs2 = self._create_convs(channels, kernel_size, [1] * len(dilations))
+        self.lrelu_slope = LRELU_SLOPE
 
     @staticmethod
     def _create_convs(channels: int, kernel_size: int, dilations: Tuple[int]):
@@ -68,12 +69,12 @@ class ResBlock(torch.nn.Module):
         layers.apply(init_weights)
         return layers
 
-    def forward(self, x: torch.Tensor, x_mask: torch.Tensor = None):
+    def forward(self, x: torch.Tensor, x_mask: Optional[torch.Tensor] = None):
         for conv1, conv2 in zip(self.convs1, self.convs2):
             x_residual = x
-            x = torch.nn.functional.leaky_relu(x, LRELU_SLOPE)
+            x = torch.nn.functional.leaky_relu(x, self.lrelu_slope)
             x = apply_mask(x, x_mask)
-            x = torch.nn.functional.leaky_relu(conv1(x), LRELU_SLOPE)
+            x = torch.nn.functional.leaky_relu(conv1(x), self.lrelu_slope)
             x = apply_mask(x, x_mask)
             x = conv2(x)
             x = x + x_residual
@@ -91,13 +92,17 @@ class Flip(torch.nn.Module):
     This module flips the input along the time dimension.
     """
 
-    def forward(self, x, *args, reverse=False, **kwargs):
+    def forward(
+        self,
+        x: torch.Tensor,
+        x_mask: torch.Tensor,
+        g: Optional[torch.Tensor] = None,
+        reverse: bool = False,
+    ):
         x = torch.flip(x, [1])
-        if not reverse:
-            logdet = torch.zeros(x.size(0), dtype=x.dtype, device=x.device)
-            return x, logdet
-        else:
-            return x
+        # Both directions return a logdet, so the flows share one signature for TorchScript
+        logdet = torch.zeros(x.size(0), dtype=x.dtype, device=x.device)
+        return x, logdet
 
 
 class ResidualCouplingBlock(torch.nn.Module):
@@ -159,8 +164,8 @@ class ResidualCouplingBlock(torch.nn.Module):
             for flow in self.flows:
                 x, _ = flow(x, x_mask, g=g, reverse=reverse)
         else:
-            for flow in reversed(self.flows):
-                x = flow.forward(x, x_mask, g=g, reverse=reverse)
+            for flow in self.flows[::-1]:
+                x, _ = flow.forward(x, x_mask, g=g, reverse=reverse)
         return x
 
     def remove_weight_norm(self):
@@ -255,7 +260,8 @@ class ResidualCouplingLayer(torch.nn.Module):
         else:
             x1 = (x1 - m) * torch.exp(-logs) * x_mask
             x = torch.cat([x0, x1], 1)
-            return x
+            logdet = -torch.sum(logs, [1, 2])
+            return x, logdet
 
     def remove_weight_norm(self):
         self.enc.remove_weight_norm()
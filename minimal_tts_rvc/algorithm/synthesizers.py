@@ -4,7 +4,11 @@ from minimal_tts_rvc.algorithm.generators.hifigan_mrf import HiFiGANMRFGenerator
 from minimal_tts_rvc.algorithm.generators.hifigan_nsf import HiFiGANNSFGenerator
 from minimal_tts_rvc.algorithm.generators.hifigan import HiFiGANGenerator
 from minimal_tts_rvc.algorithm.generators.refinegan import RefineGANGenerator
-from minimal_tts_rvc.algorithm.commons import slice_segments, rand_slice_segments
+from minimal_tts_rvc.algorithm.commons import (
+    slice_segments,
+    rand_slice_segments,
+    fold_weight_norm,
+)
 from minimal_tts_rvc.algorithm.residuals import ResidualCouplingBlock
 from minimal_tts_rvc.algorithm.encoders import TextEncoder, PosteriorEncoder
 
@@ -37,6 +41,9 @@ class Synthesizer(torch.nn.Module):
         kwargs: Additional keyword arguments.
     """
 
+    # A constant, so TorchScript compiles only the decoder call this model can make
+    __constants__ = ["use_f0"]
+
     def __init__(
         self,
         spec_channels: int,
@@ -66,7 +73,7 @@ class Synthesizer(torch.nn.Module):
     ):
         super().__init__()
         self.segment_size = segment_size
-        self.use_f0 = use_f0
+        self.use_f0 = bool(use_f0)
         self.randomized = randomized
 
         self.enc_p = TextEncoder(
@@ -76,7 +83,7 @@ class Synthesizer(torch.nn.Module):
             n_heads,
             n_layers,
             kernel_size,
-            p_dropout,
+            float(p_dropout),  # configs store 0, which TorchScript rejects as a dropout p
             text_enc_hidden_dim,
             f0=use_f0,
         )
@@ -154,18 +161,19 @@ class Synthesizer(torch.nn.Module):
         self.emb_g = torch.nn.Embedding(spk_embed_dim, gin_channels)
 
     def _remove_weight_norm_from(self, module):
-        for hook in module._forward_pre_hooks.values():
-            if getattr(hook, "__class__", None).__name__ == "WeightNorm":
-                torch.nn.utils.remove_weight_norm(module)
+        fold_weight_norm(module)
 
     def remove_weight_norm(self):
-        for module in [self.dec, self.flow, self.enc_q]:
-            self._remove_weight_norm_from(module)
+        # enc_q is deleted for inference
+        for module in [self.dec, self.flow, getattr(self, "enc_q", None)]:
+            if module is not None:
+                self._remove_weight_norm_from(module)
 
     def __prepare_scriptable__(self):
         self.remove_weight_norm()
         return self
 
+    @torch.jit.unused
     def forward(
         self,
         phone: torch.Tensor,
@@ -210,7 +218,7 @@ class Synthesizer(torch.nn.Module):
         phone_lengths: torch.Tensor,
         pitch: Optional[torch.Tensor] = None,
         nsff0: Optional[torch.Tensor] = None,
-        sid: torch.Tensor = None,
+        sid: Optional[torch.Tensor] = None,
         rate: Optional[torch.Tensor] = None,
     ):
         """
@@ -224,6 +232,7 @@ class Synthesizer(torch.nn.Module):
             sid (torch.Tensor): Speaker embedding.
             rate (torch.Tensor, optional): Rate for time-stretching.
         """
+        assert sid is not None, "sid is required"
         g = self.emb_g(sid).unsqueeze(-1)
         m_p, logs_p, x_mask = self.enc_p(phone, pitch, phone_lengths)
         z_p = (m_p + torch.exp(logs_p) * torch.randn_like(m_p) * 0.66666) * x_mask
@@ -235,10 +244,10 @@ class Synthesizer(torch.nn.Module):
                 nsff0 = nsff0[:, head:]
 
         z = self.flow(z_p, x_mask, g=g, reverse=True)
-        o = (
-            self.dec(z * x_mask, nsff0, g=g)
-            if self.use_f0
-            else self.dec(z * x_mask, g=g)
-        )
+        if self.use_f0:
+            assert nsff0 is not None, "nsff0 is required with pitch guidance"
+            o = self.dec(z * x_mask, nsff0, g=g)
+        else:
+            o = self.dec(z * x_mask, g=g)
 
         return o, x_mask, (z, z_p, m_p, logs_p)
@@ -1,4 +1,3 @@
-import torch
 import json
 import os
 
@@ -23,6 +22,9 @@ def singleton(cls):
 @singleton
 class Config:
     def __init__(self):
+        # Imported on first use so that importing this module does not load torch
+        import torch
+
         self.device = "cuda:0" if torch.cuda.is_available() else "cpu"
         self.gpu_name = (
             torch.cuda.get_device_name(int(self.device.split(":")[-1]))
@@ -32,6 +34,71 @@ class Config:
         self.json_config = self.load_config_json()
         self.gpu_mem = None
         self.x_pad, self.x_query, self.x_center, self.x_max = self.device_config()
+        # Segments of long inputs converted per batch in Pipeline.pipeline
+        self.segment_batch_size = int(os.getenv("RVC_SEGMENT_BATCH_SIZE", "1"))
+        # Memory budget for warm voice models kept by the converter pool
+        self.model_cache_mb = int(os.getenv("RVC_MODEL_CACHE_MB", "2048"))
+        # On-disk cache of encoded synthesis results
+        project_root = os.path.dirname(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        )
+        self.result_cache_dir = os.getenv(
+            "RESULT_CACHE_DIR", os.path.join(project_root, "cache", "results")
+        )
+        self.result_cache_mb = int(os.getenv("RESULT_CACHE_MB", "1024"))
+        # FAISS indexes: memory-mapped loading shares pages between worker processes
+        self.index_mmap = os.getenv("RVC_INDEX_MMAP", "0") == "1"
+        self.index_cache_dir = os.getenv(
+            "RVC_INDEX_CACHE_DIR", os.path.join(project_root, "cache", "index")
+        )
+        # Raw F0 contours reused across models; an empty dir keeps them in memory only
+        self.f0_cache_entries = int(os.getenv("RVC_F0_CACHE_ENTRIES", "64"))
+        self.f0_cache_dir = os.getenv("RVC_F0_CACHE_DIR", "")
+        # Memory budget for HuBERT features reused across voice models
+        self.feature_cache_mb = int(os.getenv("RVC_FEATURE_CACHE_MB", "256"))
+        # On-disk cache of edge-tts audio, optionally prewarmed with common phrases
+        self.tts_cache_dir = os.getenv(
+            "TTS_CACHE_DIR", os.path.join(project_root, "cache", "tts")
+        )
+        self.tts_cache_mb = int(os.getenv("TTS_CACHE_MB", "256"))
+        self.tts_prewarm_file = os.getenv("TTS_PREWARM_FILE", "")
+        # TTS backends: optional override of every model's backend, and per-backend
+        # concurrency limits and timeouts (seconds) for edge-tts and the local engines
+        self.tts_backend = os.getenv("TTS_BACKEND", "")
+        self.tts_edge_concurrency = int(os.getenv("TTS_EDGE_CONCURRENCY", "4"))
+        self.tts_edge_timeout = float(os.getenv("TTS_EDGE_TIMEOUT", "30"))
+        self.tts_local_concurrency = int(os.getenv("TTS_LOCAL_CONCURRENCY", "2"))
+        self.tts_local_timeout = float(os.getenv("TTS_LOCAL_TIMEOUT", "30"))
+        # Synthesizer runtime: eager PyTorch, or graphs exported by synth_export
+        # (torchscript or onnx, run on CPU)
+        self.synth_runtime = os.getenv("RVC_SYNTH_RUNTIME", "eager")
+        self.synth_export_dir = os.getenv(
+            "RVC_EXPORT_DIR", os.path.join(project_root, "models", "exported")
+        )
+        # Reduced-precision CPU inference: int8 HuBERT linear layers, and a bf16
+        # generator for the eager Synthesizer ("none" keeps fp32)
+        self.hubert_quant = os.getenv("RVC_HUBERT_QUANT", "none")
+        self.synth_quant = os.getenv("RVC_SYNTH_QUANT", "none")
+        # CPU execution profile: concurrent inference workers, torch threads per
+        # worker (0 splits the available cores evenly), inter-op threads (0 keeps
+        # torch's default), FAISS OpenMP threads (0 follows the torch threads) and
+        # whether each worker thread is pinned to its own cores
+        self.cpu_workers = int(os.getenv("SYNTH_WORKERS", "2"))
+        self.cpu_threads = int(os.getenv("RVC_CPU_THREADS", "0"))
+        self.cpu_interop_threads = int(os.getenv("RVC_CPU_INTEROP_THREADS", "0"))
+        self.faiss_threads = int(os.getenv("RVC_FAISS_THREADS", "0"))
+        self.cpu_pinning = os.getenv("RVC_CPU_PINNING", "0") == "1"
+        # Memory-mapped voice model packages written by model_package, used in place
+        # of a .pth when up to date
+        self.model_package_dir = os.getenv(
+            "RVC_PACKAGE_DIR", os.path.join(project_root, "models", "packages")
+        )
+        # Models preloaded by the server's background warm-up, each with one dummy
+        # conversion of warmup_seconds: comma-separated names, "all", or empty for none
+        self.warmup_models = os.getenv("RVC_WARMUP_MODELS", "")
+        self.warmup_seconds = float(os.getenv("RVC_WARMUP_SECONDS", "1.0"))
+        # Chunks of a split_audio (long-form) conversion converted at the same time
+        self.long_form_workers = int(os.getenv("RVC_LONG_FORM_WORKERS", "2"))
 
     def load_config_json(self):
         configs = {}
@@ -58,6 +125,8 @@ class Config:
         return x_pad, x_query, x_center, x_max
 
     def set_cuda_config(self):
+        import torch
+
         i_device = int(self.device.split(":")[-1])
         self.gpu_name = torch.cuda.get_device_name(i_device)
         self.gpu_mem = torch.cuda.get_device_properties(i_device).total_memory // (
@@ -66,6 +135,8 @@ class Config:
 
 
 def max_vram_gpu(gpu):
+    import torch
+
     if torch.cuda.is_available():
         gpu_properties = torch.cuda.get_device_properties(gpu)
         total_memory_gb = round(gpu_properties.total_memory / 1024 / 1024 / 1024)
@@ -75,6 +146,8 @@ def max_vram_gpu(gpu):
 
 
 def get_gpu_info():
+    import torch
+
     ngpu = torch.cuda.device_count()
     gpu_infos = []
     if torch.cuda.is_available() or ngpu != 0:
@@ -93,6 +166,8 @@ def get_gpu_info():
 
 
 def get_number_of_gpus():
+    import torch
+
     if torch.cuda.is_available():
         num_gpus = torch.cuda.device_count()
         return "-".join(map(str, range(num_gpus)))
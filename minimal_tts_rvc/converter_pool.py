@@ -0,0 +1,164 @@
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import torch
+
+from minimal_tts_rvc.infer import VoiceConverter, resolve_index_path
+from minimal_tts_rvc.index_cache import IndexCache
+from minimal_tts_rvc.configs.config import Config, singleton
+
+
+def converter_nbytes(converter):
+    """
+    Estimates the memory held by a loaded VoiceConverter (generator weights plus checkpoint).
+
+    Args:
+        converter (VoiceConverter): A converter with a model loaded through get_vc.
+    """
+    tensors = []
+    if converter.net_g is not None:
+        tensors += list(converter.net_g.parameters()) + list(converter.net_g.buffers())
+    if converter.cpt is not None:
+        tensors += [
+            tensor
+            for tensor in converter.cpt.get("weight", {}).values()
+            if isinstance(tensor, torch.Tensor)
+        ]
+    # Packaged models share their memory-mapped weights with net_g; count them once
+    seen = set()
+    nbytes = 0
+    for tensor in tensors:
+        key = (tensor.device, tensor.data_ptr())
+        if key not in seen:
+            seen.add(key)
+            nbytes += tensor.numel() * tensor.element_size()
+    return nbytes
+
+
+class _PoolEntry:
+    def __init__(self, model_path, index_path=None):
+        self.model_path = model_path
+        self.index_path = resolve_index_path(index_path)
+        self.converter = VoiceConverter()
+        self.load_lock = threading.Lock()
+        self.in_use = 0
+        self.nbytes = 0
+
+
+@singleton
+class ConverterPool:
+    """
+    A process-wide pool of warm VoiceConverter instances keyed by model name.
+
+    Each entry keeps its `net_g`/`cpt` loaded between requests. HuBERT and RMVPE are
+    shared across entries, so only the per-voice weights and the FAISS indexes held
+    by IndexCache count against the budget. When the budget is exceeded, the least
+    recently used idle entries are evicted together with their index.
+
+    Args:
+        max_bytes (int, optional): Memory budget for loaded models. Defaults to
+            `Config().model_cache_mb`.
+    """
+
+    def __init__(self, max_bytes=None):
+        if max_bytes is None:
+            max_bytes = Config().model_cache_mb * 1024**2
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.evictions = 0
+
+    @contextmanager
+    def checkout(self, name, model_path, index_path=None, sid=0):
+        """
+        Yields a warm VoiceConverter for the given model, loading it if needed.
+
+        The entry cannot be evicted while it is checked out.
+
+        Args:
+            name (str): Model name used as the pool key.
+            model_path (str): Path to the model weights.
+            index_path (str, optional): Path to the model's index file, evicted with the model.
+            sid (int, optional): Speaker ID. Default is 0.
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or entry.model_path != model_path:
+                entry = _PoolEntry(model_path, index_path)
+                self._entries[name] = entry
+            self._entries.move_to_end(name)
+            entry.in_use += 1
+        try:
+            with entry.load_lock:
+                if entry.converter.loaded_model != model_path:
+                    entry.converter.get_vc(model_path, sid)
+                    entry.nbytes = converter_nbytes(entry.converter)
+                    self.loads += 1
+                # Load the index up front so it is counted before the budget check
+                if entry.index_path and os.path.exists(entry.index_path):
+                    IndexCache().load(entry.index_path)
+            self._enforce_budget()
+            yield entry.converter
+        finally:
+            with self._lock:
+                entry.in_use -= 1
+
+    def _enforce_budget(self):
+        with self._lock:
+            index_cache = IndexCache()
+            total = sum(entry.nbytes for entry in self._entries.values())
+            total += index_cache.nbytes()
+            for name in list(self._entries):
+                if total <= self.max_bytes:
+                    break
+                entry = self._entries[name]
+                if entry.in_use:
+                    continue
+                total -= self._evict(name)
+
+    def _evict(self, name):
+        entry = self._entries.pop(name)
+        freed = entry.nbytes
+        if entry.index_path:
+            index_cache = IndexCache()
+            freed += index_cache.nbytes(entry.index_path)
+            index_cache.evict(entry.index_path)
+        print(f"Evicting voice model '{name}' ({freed / 1024**2:.1f} MB)")
+        if entry.converter.cpt is not None:
+            entry.converter.cleanup_model()
+        self.evictions += 1
+        return freed
+
+    def evict(self, name):
+        """
+        Evicts a model from the pool if it is loaded and idle.
+
+        Args:
+            name (str): Model name used as the pool key.
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and not entry.in_use:
+                self._evict(name)
+
+    def stats(self):
+        """
+        Returns the loaded models, their memory use and pool counters.
+        """
+        with self._lock:
+            models = {
+                name: {"nbytes": entry.nbytes, "in_use": entry.in_use}
+                for name, entry in self._entries.items()
+            }
+            index_bytes = IndexCache().nbytes()
+            return {
+                "models": models,
+                "index_bytes": index_bytes,
+                "total_bytes": sum(m["nbytes"] for m in models.values()) + index_bytes,
+                "max_bytes": self.max_bytes,
+                "loads": self.loads,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,137 @@
+import os
+import queue
+import itertools
+import threading
+from contextlib import contextmanager
+
+from minimal_tts_rvc.configs.config import Config
+
+_profile = {}
+_profile_lock = threading.Lock()
+_worker_slots = itertools.count()
+_worker_state = threading.local()
+# Slots not held by a conversion; created by apply_cpu_profile
+_free_slots = None
+
+
+def available_cores():
+    """Returns the CPU cores this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def apply_cpu_profile(workers=None):
+    """
+    Applies the process-wide part of the CPU execution profile and returns it.
+
+    Torch threads default to the available cores split evenly between `workers`,
+    so concurrent conversions do not each spawn a thread per core, and
+    inference_slot holds conversions to `workers` at a time. OMP_NUM_THREADS
+    and MKL_NUM_THREADS are set for child processes that have not chosen their own.
+    Call it once at startup, before inference threads start.
+
+    Args:
+        workers (int, optional): Conversions run concurrently. Defaults to `Config().cpu_workers`.
+    """
+    import torch
+
+    config = Config()
+    workers = max(1, workers or config.cpu_workers)
+    cores = available_cores()
+    threads = config.cpu_threads or max(1, len(cores) // workers)
+    faiss_threads = config.faiss_threads or threads
+
+    with _profile_lock:
+        torch.set_num_threads(threads)
+        if config.cpu_interop_threads > 0:
+            try:
+                torch.set_num_interop_threads(config.cpu_interop_threads)
+            except RuntimeError as error:
+                # Only allowed before the first inter-op parallel work
+                print(f"Could not set inter-op threads: {error}")
+        os.environ.setdefault("OMP_NUM_THREADS", str(threads))
+        os.environ.setdefault("MKL_NUM_THREADS", str(threads))
+        _profile.update(
+            workers=workers,
+            cores=len(cores),
+            threads=threads,
+            interop_threads=torch.get_num_interop_threads(),
+            faiss_threads=faiss_threads,
+            pinning=config.cpu_pinning,
+        )
+        _profile["core_sets"] = [
+            [cores[(slot * threads + i) % len(cores)] for i in range(threads)]
+            for slot in range(workers)
+        ]
+        global _free_slots
+        _free_slots = queue.SimpleQueue()
+        for slot in range(workers):
+            _free_slots.put(slot)
+        return dict(_profile)
+
+
+def init_cpu_worker():
+    """
+    Applies the per-thread part of the CPU execution profile to the calling thread.
+
+    OpenMP thread counts are per thread, so each worker thread sets the torch and
+    FAISS counts itself, and with `Config().cpu_pinning` is pinned to the cores of
+    the next worker slot. It is for pools that size themselves to the profile, such
+    as training feature extraction; conversions use inference_slot. It runs once
+    per thread and does nothing before apply_cpu_profile.
+    """
+    if getattr(_worker_state, "slot", None) is not None or not _profile:
+        return
+    _enter_slot(next(_worker_slots) % _profile["workers"])
+
+
+@contextmanager
+def inference_slot():
+    """
+    Runs the body in a free worker slot of the CPU execution profile, waiting for one.
+
+    Every RVC conversion holds a slot, so at most `workers` of them run at once,
+    however many threads ask: the job queue, the inference executor, the multi-voice
+    and long-form chunk threads and the streaming threadpool. The calling thread
+    gets the profile's torch and FAISS thread counts and, with pinning, the slot's
+    cores. It does nothing before apply_cpu_profile.
+    """
+    free_slots = _free_slots
+    # A thread that already holds a slot keeps it rather than waiting on itself
+    if free_slots is None or getattr(_worker_state, "holding", False):
+        yield
+        return
+    slot = free_slots.get()
+    _worker_state.holding = True
+    try:
+        _enter_slot(slot)
+        yield
+    finally:
+        _worker_state.holding = False
+        free_slots.put(slot)
+
+
+def _enter_slot(slot):
+    # Thread counts are set once per thread; the pinned cores follow the slot
+    previous = getattr(_worker_state, "slot", None)
+    if previous is None:
+        import torch
+
+        torch.set_num_threads(_profile["threads"])
+        try:
+            import faiss
+
+            faiss.omp_set_num_threads(_profile["faiss_threads"])
+        except ImportError:
+            pass
+    if _profile["pinning"] and hasattr(os, "sched_setaffinity") and slot != previous:
+        # On Linux pid 0 is the calling thread; OpenMP threads it starts inherit the mask
+        os.sched_setaffinity(0, _profile["core_sets"][slot])
+    _worker_state.slot = slot
+
+
+def cpu_profile_info():
+    """Returns the applied CPU execution profile, empty before apply_cpu_profile."""
+    with _profile_lock:
+        return dict(_profile)
@@ -0,0 +1,131 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from minimal_tts_rvc.configs.config import Config, singleton
+
+
+def audio_hash(audio):
+    """
+    Returns a content hash of an audio array, including its dtype and shape.
+
+    Args:
+        audio (np.ndarray): The audio signal.
+    """
+    audio = np.ascontiguousarray(audio)
+    digest = hashlib.sha1(f"{audio.dtype.str}:{audio.shape}:".encode("utf-8"))
+    digest.update(memoryview(audio).cast("B"))
+    return digest.hexdigest()
+
+
+@singleton
+class F0Cache:
+    """
+    A per-process LRU cache of raw F0 contours.
+
+    Contours are stored as estimated, before autotune and pitch shift, so converting
+    the same audio through several models or with different retrieval settings only
+    redoes the cheap post-processing. With a cache directory, contours are also
+    written to `<cache_dir>/<key[:2]>/<key>.npy` and read back on a memory miss;
+    these files are small and are not evicted.
+
+    Args:
+        max_entries (int, optional): Contours kept in memory. Defaults to `Config().f0_cache_entries`.
+        cache_dir (str, optional): Directory for the on-disk store. Defaults to
+            `Config().f0_cache_dir`; empty disables it.
+    """
+
+    def __init__(self, max_entries=None, cache_dir=None):
+        config = Config()
+        self.max_entries = (
+            max_entries if max_entries is not None else config.f0_cache_entries
+        )
+        self.cache_dir = cache_dir if cache_dir is not None else config.f0_cache_dir
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(audio, f0_method, hop_length, p_len, thresholds):
+        """
+        Returns the cache key for a contour.
+
+        Args:
+            audio (np.ndarray): The audio the contour is estimated from.
+            f0_method (str): F0 estimation method.
+            hop_length (int): Hop length used by the estimator.
+            p_len (int): Requested contour length.
+            thresholds (tuple): Frequency bounds and voicing thresholds used by the estimator.
+        """
+        params = f"{f0_method}:{int(hop_length)}:{int(p_len)}:{tuple(thresholds)}"
+        return hashlib.sha1(f"{audio_hash(audio)}:{params}".encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.npy")
+
+    def get(self, key):
+        """
+        Returns a copy of the cached contour, or None on a miss.
+
+        Args:
+            key (str): Cache key from F0Cache.key.
+        """
+        with self._lock:
+            f0 = self._entries.get(key)
+            if f0 is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return f0.copy()
+        if self.cache_dir and os.path.exists(self._path(key)):
+            f0 = np.load(self._path(key))
+            with self._lock:
+                self.hits += 1
+                self._store(key, f0)
+            return f0.copy()
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, f0):
+        """
+        Stores a raw contour.
+
+        Args:
+            key (str): Cache key from F0Cache.key.
+            f0 (np.ndarray): The contour as returned by the estimator.
+        """
+        f0 = np.array(f0, copy=True)
+        with self._lock:
+            self._store(key, f0)
+        if self.cache_dir:
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, f0)
+            os.replace(tmp_path, path)
+
+    def _store(self, key, f0):
+        self._entries[key] = f0
+        self._entries.move_to_end(key)
+        while len(self._entries) > max(self.max_entries, 0):
+            self._entries.popitem(last=False)
+
+    def stats(self):
+        """
+        Returns hit/miss counters and the number of contours in memory.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "cache_dir": self.cache_dir or None,
+            }
@@ -0,0 +1,96 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from minimal_tts_rvc.configs.config import Config, singleton
+
+
+@singleton
+class FeatureCache:
+    """
+    A per-process LRU cache of HuBERT/ContentVec features for audio segments.
+
+    Features only depend on the input audio and the embedder, so converting one clip
+    into several voices extracts them once. Entries hold the encoder's
+    `last_hidden_state` for a segment, before the v1 projection and index retrieval,
+    on the device it was computed on. The least recently used entries are dropped
+    once the budget is exceeded.
+
+    Args:
+        max_bytes (int, optional): Memory budget. Defaults to `Config().feature_cache_mb`.
+    """
+
+    def __init__(self, max_bytes=None):
+        if max_bytes is None:
+            max_bytes = Config().feature_cache_mb * 1024**2
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(audio_key, embedder_key, start, end):
+        """
+        Returns the cache key for one segment.
+
+        Args:
+            audio_key (str): Content hash of the padded input audio (see f0_cache.audio_hash).
+            embedder_key (str): Identifies the embedder model the features come from.
+            start (int): Segment start in samples.
+            end (int): Segment end in samples, or None for the end of the audio.
+        """
+        return hashlib.sha1(
+            f"{audio_key}:{embedder_key}:{start}:{end}".encode("utf-8")
+        ).hexdigest()
+
+    def get(self, key):
+        """
+        Returns the cached features, or None on a miss. The tensor must not be modified.
+
+        Args:
+            key (str): Cache key from FeatureCache.key.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, feats):
+        """
+        Stores the features of a segment and evicts old entries past the budget.
+
+        Args:
+            key (str): Cache key from FeatureCache.key.
+            feats (torch.Tensor): The `last_hidden_state` of the segment, shape (1, frames, dim).
+        """
+        feats = feats.detach()
+        nbytes = feats.numel() * feats.element_size()
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            self._entries[key] = (feats, nbytes)
+            self._entries.move_to_end(key)
+            total = sum(size for _, size in self._entries.values())
+            while total > self.max_bytes:
+                _, (_, size) = self._entries.popitem(last=False)
+                total -= size
+
+    def stats(self):
+        """
+        Returns hit/miss counters and the memory held by cached features.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "total_bytes": sum(size for _, size in self._entries.values()),
+                "max_bytes": self.max_bytes,
+            }
@@ -0,0 +1,114 @@
+import os
+import hashlib
+import threading
+
+import faiss
+import numpy as np
+
+from minimal_tts_rvc.configs.config import Config, singleton
+
+
+@singleton
+class IndexCache:
+    """
+    A per-process cache of FAISS indexes and their reconstructed feature matrices.
+
+    Entries are keyed by index path and mtime, so a rewritten `.index` file is
+    reloaded on next use. With memory-mapped loading the index is opened with
+    `IO_FLAG_MMAP` and `big_npy` is read from a `.npy` sidecar with `mmap_mode="r"`,
+    so worker processes share the pages instead of each holding a copy. Memory use
+    is reported through `nbytes`, which the converter pool counts against its budget.
+
+    Args:
+        mmap (bool, optional): Whether to memory-map indexes. Defaults to `Config().index_mmap`.
+        cache_dir (str, optional): Directory for `big_npy` sidecars. Defaults to `Config().index_cache_dir`.
+    """
+
+    def __init__(self, mmap=None, cache_dir=None):
+        config = Config()
+        self.mmap = config.index_mmap if mmap is None else mmap
+        self.cache_dir = cache_dir or config.index_cache_dir
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def load(self, path):
+        """
+        Returns `(index, big_npy)` for an index file, loading it on first use.
+
+        Args:
+            path (str): Path to the FAISS index file.
+        """
+        path = os.path.abspath(path)
+        mtime = os.path.getmtime(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry["mtime"] == mtime:
+                return entry["index"], entry["big_npy"]
+
+            if self.mmap:
+                index = faiss.read_index(path, faiss.IO_FLAG_MMAP)
+                big_npy = self._load_mmap_npy(path, mtime, index)
+                nbytes = 0
+            else:
+                index = faiss.read_index(path)
+                big_npy = index.reconstruct_n(0, index.ntotal)
+                nbytes = os.path.getsize(path) + big_npy.nbytes
+            self._entries[path] = {
+                "mtime": mtime,
+                "index": index,
+                "big_npy": big_npy,
+                "nbytes": nbytes,
+            }
+            self.loads += 1
+            return index, big_npy
+
+    def _load_mmap_npy(self, path, mtime, index):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        digest = hashlib.sha1(f"{path}:{mtime}".encode("utf-8")).hexdigest()[:16]
+        npy_path = os.path.join(
+            self.cache_dir, f"{os.path.splitext(os.path.basename(path))[0]}_{digest}.npy"
+        )
+        if not os.path.exists(npy_path):
+            tmp_path = f"{npy_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, index.reconstruct_n(0, index.ntotal))
+            os.replace(tmp_path, npy_path)
+        return np.load(npy_path, mmap_mode="r")
+
+    def evict(self, path):
+        """
+        Drops an index from the cache.
+
+        Args:
+            path (str): Path to the FAISS index file.
+        """
+        with self._lock:
+            self._entries.pop(os.path.abspath(path), None)
+
+    def nbytes(self, path=None):
+        """
+        Returns the private memory held by one cached index, or by all of them.
+
+        Args:
+            path (str, optional): Path to the FAISS index file.
+        """
+        with self._lock:
+            if path is not None:
+                entry = self._entries.get(os.path.abspath(path))
+                return entry["nbytes"] if entry is not None else 0
+            return sum(entry["nbytes"] for entry in self._entries.values())
+
+    def stats(self):
+        """
+        Returns the cached indexes and their memory use.
+        """
+        with self._lock:
+            return {
+                "mmap": self.mmap,
+                "loads": self.loads,
+                "indexes": {
+                    path: {"ntotal": entry["index"].ntotal, "nbytes": entry["nbytes"]}
+                    for path, entry in self._entries.items()
+                },
+            }
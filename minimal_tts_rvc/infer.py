@@ -1,11 +1,14 @@
+import io
 import os
 import sys
 import soxr
 import time
 import torch
+import threading
 import librosa
 import logging
 import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import numpy as np
 import soundfile as sf
 import noisereduce as nr
@@ -28,9 +31,12 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
 
 from minimal_tts_rvc.pipeline import Pipeline as VC
-from minimal_tts_rvc.utils import load_audio_infer, load_embedding
-# from minimal_tts_rvc.tools.split_audio import process_audio, merge_audio
-from minimal_tts_rvc.algorithm.synthesizers import Synthesizer
+from minimal_tts_rvc.utils import load_audio_infer, prepare_audio_infer, load_embedding
+from minimal_tts_rvc.tools.split_audio import process_audio, merge_audio
+from minimal_tts_rvc.synth_export import build_synthesizer, load_exported_synthesizer
+from minimal_tts_rvc.model_package import PACKAGE_EXTENSION, find_package, load_package
+from minimal_tts_rvc.quantize import quantize_hubert, quantize_synthesizer
+from minimal_tts_rvc.cpu_profile import inference_slot
 from minimal_tts_rvc.configs.config import Config
 
 logging.getLogger("httpx").setLevel(logging.WARNING)
@@ -38,6 +44,54 @@ logging.getLogger("httpcore").setLevel(logging.WARNING)
 logging.getLogger("faiss").setLevel(logging.WARNING)
 logging.getLogger("faiss.loader").setLevel(logging.WARNING)
 
+# HuBERT only depends on the embedder, so all voice models share one instance
+# per (embedder, custom embedder, device, quantization).
+_hubert_models = {}
+_hubert_lock = threading.Lock()
+
+
+def load_shared_hubert(embedder_model, embedder_model_custom, device, quant="none"):
+    """
+    Returns the process-wide HuBERT model for an embedder, loading it on first use.
+
+    Args:
+        embedder_model (str): Name of the pre-trained HuBERT model.
+        embedder_model_custom (str): Path to the custom HuBERT model.
+        device (str): Device to load the model on.
+        quant (str, optional): "int8" to quantize its linear layers (CPU only).
+    """
+    if quant != "none" and device != "cpu":
+        print(f"RVC_HUBERT_QUANT={quant} only applies on CPU, using fp32 on {device}")
+        quant = "none"
+    key = (embedder_model, embedder_model_custom, device, quant)
+    with _hubert_lock:
+        if key not in _hubert_models:
+            hubert_model = load_embedding(embedder_model, embedder_model_custom)
+            hubert_model = hubert_model.to(device).float()
+            hubert_model.eval()
+            hubert_model = quantize_hubert(hubert_model, quant)
+            _hubert_models[key] = hubert_model
+        return _hubert_models[key]
+
+
+def resolve_index_path(index_path):
+    """
+    Returns the index file actually used for a model's index path, or None.
+
+    Args:
+        index_path (str): Path to the index file, possibly quoted.
+    """
+    if index_path is None:
+        return None
+    return (
+        index_path.strip()
+        .strip('"')
+        .strip("\n")
+        .strip('"')
+        .strip()
+        .replace("trained", "added")
+    )
+
 
 class VoiceConverter:
     """
@@ -70,9 +124,12 @@ class VoiceConverter:
             embedder_model (str): Path to the pre-trained HuBERT model.
             embedder_model_custom (str): Path to the custom HuBERT model.
         """
-        self.hubert_model = load_embedding(embedder_model, embedder_model_custom)
-        self.hubert_model = self.hubert_model.to(self.config.device).float()
-        self.hubert_model.eval()
+        self.hubert_model = load_shared_hubert(
+            embedder_model,
+            embedder_model_custom,
+            self.config.device,
+            self.config.hubert_quant,
+        )
 
     @staticmethod
     def remove_audio_noise(data, sr, reduction_strength=0.7):
@@ -93,6 +150,27 @@ class VoiceConverter:
             print(f"An error occurred removing audio noise: {error}")
             return None
 
+    @staticmethod
+    def export_sample_rate(sample_rate):
+        """
+        Returns the closest sample rate commonly supported by compressed audio formats.
+
+        Args:
+            sample_rate (int): The sample rate of the audio data.
+        """
+        common_sample_rates = [
+            8000,
+            11025,
+            12000,
+            16000,
+            22050,
+            24000,
+            32000,
+            44100,
+            48000,
+        ]
+        return min(common_sample_rates, key=lambda x: abs(x - sample_rate))
+
     @staticmethod
     def convert_audio_format(input_path, output_path, output_format):
         """
@@ -107,18 +185,7 @@ class VoiceConverter:
             if output_format != "WAV":
                 print(f"Saving audio as {output_format}...")
                 audio, sample_rate = librosa.load(input_path, sr=None)
-                common_sample_rates = [
-                    8000,
-                    11025,
-                    12000,
-                    16000,
-                    22050,
-                    24000,
-                    32000,
-                    44100,
-                    48000,
-                ]
-                target_sr = min(common_sample_rates, key=lambda x: abs(x - sample_rate))
+                target_sr = VoiceConverter.export_sample_rate(sample_rate)
                 audio = librosa.resample(
                     audio, orig_sr=sample_rate, target_sr=target_sr, res_type="soxr_vhq"
                 )
@@ -127,6 +194,30 @@ class VoiceConverter:
         except Exception as error:
             print(f"An error occurred converting the audio format: {error}")
 
+    @staticmethod
+    def encode_audio(audio, sample_rate, output_format):
+        """
+        Encodes audio data in memory and returns the encoded bytes.
+
+        Args:
+            audio (numpy.ndarray): The audio data as a NumPy array.
+            sample_rate (int): The sample rate of the audio data.
+            output_format (str): Desired audio format (e.g., "WAV", "MP3").
+        """
+        if output_format != "WAV":
+            target_sr = VoiceConverter.export_sample_rate(sample_rate)
+            if target_sr != sample_rate:
+                audio = librosa.resample(
+                    audio.astype(np.float32),
+                    orig_sr=sample_rate,
+                    target_sr=target_sr,
+                    res_type="soxr_vhq",
+                )
+            sample_rate = target_sr
+        buffer = io.BytesIO()
+        sf.write(buffer, audio, sample_rate, format=output_format.lower())
+        return buffer.getvalue()
+
     @staticmethod
     def post_process_audio(
         audio_input,
@@ -197,6 +288,66 @@ class VoiceConverter:
         audio_output_path: str,
         model_path: str,
         index_path: str,
+        export_format: str = "WAV",
+        **kwargs,
+    ):
+        """
+        Performs voice conversion on the input audio file.
+
+        Args:
+            audio_input_path (str): Path to the input audio file.
+            audio_output_path (str): Path to the output audio file.
+            model_path (str): Path to the voice conversion model.
+            index_path (str): Path to the index file.
+            export_format (str): Format for exporting the audio.
+            **kwargs: Conversion options, see convert_audio_array.
+        """
+        if not model_path:
+            print("No model path provided. Aborting conversion.")
+            return
+
+        try:
+            start_time = time.time()
+            print(f"Converting audio '{audio_input_path}'...")
+
+            audio = load_audio_infer(
+                audio_input_path,
+                16000,
+                **kwargs,
+            )
+            audio_opt, tgt_sr = self.convert_audio_array(
+                audio,
+                16000,
+                model_path=model_path,
+                index_path=index_path,
+                **{
+                    key: value
+                    for key, value in kwargs.items()
+                    if key not in ("formant_shifting", "formant_qfrency", "formant_timbre")
+                },
+            )
+
+            output_path_format = audio_output_path.replace(
+                ".wav", f".{export_format.lower()}"
+            )
+            with open(output_path_format, "wb") as output_file:
+                output_file.write(self.encode_audio(audio_opt, tgt_sr, export_format))
+            audio_output_path = output_path_format
+
+            elapsed_time = time.time() - start_time
+            print(
+                f"Conversion completed at '{audio_output_path}' in {elapsed_time:.2f} seconds."
+            )
+        except Exception as error:
+            print(f"An error occurred during audio conversion: {error}")
+            print(traceback.format_exc())
+
+    def convert_audio_array(
+        self,
+        audio,
+        sample_rate: int,
+        model_path: str,
+        index_path: str,
         pitch: int = 0,
         f0_file: str = None,
         f0_method: str = "rmvpe",
@@ -207,96 +358,77 @@ class VoiceConverter:
         split_audio: bool = False,
         f0_autotune: bool = False,
         f0_autotune_strength: float = 1,
+        f0_autotune_key: str = "C",
+        f0_autotune_scale: str = "chromatic",
         embedder_model: str = "contentvec",
         embedder_model_custom: str = None,
         clean_audio: bool = False,
         clean_strength: float = 0.5,
-        export_format: str = "WAV",
         post_process: bool = False,
         resample_sr: int = 0,
         sid: int = 0,
+        batch_size: int = None,
+        progress=None,
         **kwargs,
     ):
         """
-        Performs voice conversion on the input audio.
+        Performs voice conversion on audio held in memory and returns the converted
+        audio with its sample rate. Errors are raised rather than printed.
 
         Args:
+            audio (numpy.ndarray): The input audio data.
+            sample_rate (int): The sample rate of the input audio.
+            model_path (str): Path to the voice conversion model.
+            index_path (str): Path to the index file.
             pitch (int): Key for F0 up-sampling.
+            f0_file (str): Path to the F0 file.
+            f0_method (str): Method for F0 extraction.
             index_rate (float): Rate for index matching.
             volume_envelope (int): RMS mix rate.
             protect (float): Protection rate for certain audio segments.
             hop_length (int): Hop length for audio processing.
-            f0_method (str): Method for F0 extraction.
-            audio_input_path (str): Path to the input audio file.
-            audio_output_path (str): Path to the output audio file.
-            model_path (str): Path to the voice conversion model.
-            index_path (str): Path to the index file.
             split_audio (bool): Whether to split the audio for processing.
             f0_autotune (bool): Whether to use F0 autotune.
-            clean_audio (bool): Whether to clean the audio.
-            clean_strength (float): Strength of the audio cleaning.
-            export_format (str): Format for exporting the audio.
-            f0_file (str): Path to the F0 file.
+            f0_autotune_strength (float): How far autotune moves towards the note.
+            f0_autotune_key (str): Root note of the autotune scale (e.g. "C", "F#").
+            f0_autotune_scale (str): Autotune scale, a name from Autotune.SCALES or a list of semitone offsets.
             embedder_model (str): Path to the embedder model.
             embedder_model_custom (str): Path to the custom embedder model.
+            clean_audio (bool): Whether to clean the audio.
+            clean_strength (float): Strength of the audio cleaning.
+            post_process (bool): Whether to apply the post-processing effects in kwargs.
             resample_sr (int, optional): Resample sampling rate. Default is 0.
             sid (int, optional): Speaker ID. Default is 0.
+            batch_size (int, optional): Segments per batch on long inputs. Defaults to `Config().segment_batch_size`.
+            progress (callable, optional): With split_audio, called as `progress(done, total)` after each chunk.
             **kwargs: Additional keyword arguments.
         """
-        if not model_path:
-            print("No model path provided. Aborting conversion.")
-            return
-
         self.get_vc(model_path, sid)
 
-        try:
-            start_time = time.time()
-            print(f"Converting audio '{audio_input_path}'...")
-
-            audio = load_audio_infer(
-                audio_input_path,
-                16000,
-                **kwargs,
-            )
-            audio_max = np.abs(audio).max() / 0.95
-
-            if audio_max > 1:
-                audio /= audio_max
+        audio = prepare_audio_infer(audio, sample_rate, 16000, **kwargs)
+        audio_max = np.abs(audio).max() / 0.95
 
-            if not self.hubert_model or embedder_model != self.last_embedder_model:
-                self.load_hubert(embedder_model, embedder_model_custom)
-                self.last_embedder_model = embedder_model
+        if audio_max > 1:
+            audio /= audio_max
 
-            # Handle case where index_path is None (like for ChrisPratt model)
-            if index_path is None:
-                file_index = None
-            else:
-                file_index = (
-                    index_path.strip()
-                    .strip('"')
-                    .strip("\n")
-                    .strip('"')
-                    .strip()
-                    .replace("trained", "added")
-                )
+        if not self.hubert_model or embedder_model != self.last_embedder_model:
+            self.load_hubert(embedder_model, embedder_model_custom)
+            self.last_embedder_model = embedder_model
 
-            if self.tgt_sr != resample_sr >= 16000:
-                self.tgt_sr = resample_sr
+        # Handle case where index_path is None (like for ChrisPratt model)
+        file_index = resolve_index_path(index_path)
 
-            if split_audio:
-                chunks, intervals = process_audio(audio, 16000)
-                print(f"Audio split into {len(chunks)} chunks for processing.")
-            else:
-                chunks = []
-                chunks.append(audio)
+        # self.tgt_sr stays the model's rate, since pooled converters are shared
+        tgt_sr = resample_sr if self.tgt_sr != resample_sr >= 16000 else self.tgt_sr
 
-            converted_chunks = []
-            for c in chunks:
-                audio_opt = self.vc.pipeline(
+        def convert_chunk(chunk):
+            # Waits for a CPU profile slot, however many threads convert at once
+            with inference_slot():
+                return self.vc.pipeline(
                     model=self.hubert_model,
                     net_g=self.net_g,
                     sid=sid,
-                    audio=c,
+                    audio=chunk,
                     pitch=pitch,
                     f0_method=f0_method,
                     file_index=file_index,
@@ -309,47 +441,100 @@ class VoiceConverter:
                     f0_autotune=f0_autotune,
                     f0_autotune_strength=f0_autotune_strength,
                     f0_file=f0_file,
+                    batch_size=batch_size,
+                    f0_autotune_key=f0_autotune_key,
+                    f0_autotune_scale=f0_autotune_scale,
+                    embedder_key=f"{embedder_model}:{embedder_model_custom}:{self.config.hubert_quant}",
                 )
-                converted_chunks.append(audio_opt)
-                if split_audio:
-                    print(f"Converted audio chunk {len(converted_chunks)}")
-
-            if split_audio:
-                audio_opt = merge_audio(
-                    chunks, converted_chunks, intervals, 16000, self.tgt_sr
-                )
-            else:
-                audio_opt = converted_chunks[0]
 
-            if clean_audio:
-                cleaned_audio = self.remove_audio_noise(
-                    audio_opt, self.tgt_sr, clean_strength
-                )
-                if cleaned_audio is not None:
-                    audio_opt = cleaned_audio
-
-            if post_process:
-                audio_opt = self.post_process_audio(
-                    audio_input=audio_opt,
-                    sample_rate=self.tgt_sr,
-                    **kwargs,
-                )
+        if split_audio:
+            chunks, intervals = process_audio(audio, 16000)
+            print(f"Audio split into {len(chunks)} chunks for processing.")
+        if split_audio and not chunks:
+            audio_opt = np.zeros(len(audio) * self.tgt_sr // 16000, dtype=np.float32)
+        elif split_audio:
+            if progress is None:
+                progress = lambda done, total: print(f"Converted audio chunk {done}/{total}")
+            converted_chunks = [None] * len(chunks)
+            # Chunks share this converter's warm HuBERT and generator
+            workers = max(1, min(self.config.long_form_workers, len(chunks)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(convert_chunk, chunk): i
+                    for i, chunk in enumerate(chunks)
+                }
+                for done, future in enumerate(as_completed(futures), start=1):
+                    converted_chunks[futures[future]] = future.result()
+                    progress(done, len(chunks))
+            audio_opt = merge_audio(
+                chunks, converted_chunks, intervals, 16000, self.tgt_sr
+            )
+        else:
+            audio_opt = convert_chunk(audio)
 
-            sf.write(audio_output_path, audio_opt, self.tgt_sr, format="WAV")
-            output_path_format = audio_output_path.replace(
-                ".wav", f".{export_format.lower()}"
+        if tgt_sr != self.tgt_sr:
+            # The generator always produces the model's rate
+            audio_opt = librosa.resample(
+                audio_opt, orig_sr=self.tgt_sr, target_sr=tgt_sr, res_type="soxr_vhq"
             )
-            audio_output_path = self.convert_audio_format(
-                audio_output_path, output_path_format, export_format
+
+        if clean_audio:
+            cleaned_audio = self.remove_audio_noise(
+                audio_opt, tgt_sr, clean_strength
             )
+            if cleaned_audio is not None:
+                audio_opt = cleaned_audio
 
-            elapsed_time = time.time() - start_time
-            print(
-                f"Conversion completed at '{audio_output_path}' in {elapsed_time:.2f} seconds."
+        if post_process:
+            audio_opt = self.post_process_audio(
+                audio_input=audio_opt,
+                sample_rate=tgt_sr,
+                **kwargs,
             )
-        except Exception as error:
-            print(f"An error occurred during audio conversion: {error}")
-            print(traceback.format_exc())
+
+        return audio_opt, tgt_sr
+
+    def convert_audio_multi(self, audio, sample_rate: int, models: list, **kwargs):
+        """
+        Converts one clip into several voices and returns `(audio, sample_rate)` per model.
+
+        Each voice runs on its own warm converter from ConverterPool, so no model is
+        reloaded in place of another. The input is prepared once, and F0 and HuBERT
+        features are computed for the first voice and served from F0Cache and
+        FeatureCache for the others, so each further voice only costs index
+        retrieval and its own generator pass.
+
+        Args:
+            audio (numpy.ndarray): The input audio data.
+            sample_rate (int): The sample rate of the input audio.
+            models (list): One dict per voice with `model_path`, `index_path`, optionally
+                `name` (the pool key, defaults to `model_path`) and any convert_audio_array
+                argument to override for that voice.
+            **kwargs: convert_audio_array arguments shared by every voice.
+        """
+        # converter_pool imports this module
+        from minimal_tts_rvc.converter_pool import ConverterPool
+
+        audio = prepare_audio_infer(audio, sample_rate, 16000, **kwargs)
+        kwargs = {
+            key: value
+            for key, value in kwargs.items()
+            if key not in ("formant_shifting", "formant_qfrency", "formant_timbre")
+        }
+        pool = ConverterPool()
+        results = []
+        for model in models:
+            options = dict(kwargs)
+            options.update(model)
+            name = options.pop("name", options["model_path"])
+            with pool.checkout(
+                name,
+                options["model_path"],
+                options["index_path"],
+                options.get("sid", 0),
+            ) as converter:
+                results.append(converter.convert_audio_array(audio, 16000, **options))
+        return results
 
     def convert_audio_batch(
         self,
@@ -433,7 +618,7 @@ class VoiceConverter:
         if not self.loaded_model or self.loaded_model != weight_root:
             self.load_model(weight_root)
             if self.cpt is not None:
-                self.setup_network()
+                self.setup_network(weight_root)
                 self.setup_vc_instance()
             self.loaded_model = weight_root
 
@@ -456,22 +641,41 @@ class VoiceConverter:
         """
         Loads the model weights from the specified path.
 
+        A `.pth` with an up-to-date package in `Config().model_package_dir` is loaded
+        from the package, memory-mapped; a package's tensor file can also be given
+        directly, with its JSON config next to it.
+
         Args:
             weight_root (str): Path to the model weights.
         """
         try:
+            if not os.path.isfile(weight_root):
+                self.cpt = None
+                return
+            if weight_root.endswith(PACKAGE_EXTENSION):
+                package = weight_root, weight_root[: -len(PACKAGE_EXTENSION)] + ".json"
+            else:
+                package = find_package(weight_root)
             self.cpt = (
-                torch.load(weight_root, map_location="cpu", weights_only=True)
-                if os.path.isfile(weight_root)
-                else None
+                load_package(*package)
+                if package is not None
+                else torch.load(weight_root, map_location="cpu", weights_only=True)
             )
         except Exception as e:
             print(f"Error loading model: {e}")
             self.cpt = None
 
-    def setup_network(self):
+    def setup_network(self, weight_root=None):
         """
         Sets up the network configuration based on the loaded checkpoint.
+
+        With `Config().synth_runtime` set to "torchscript" or "onnx", the graph
+        exported for weight_root by synth_export is used when it is up to date,
+        and the eager network otherwise. `Config().synth_quant` applies to the
+        eager network on CPU.
+
+        Args:
+            weight_root (str, optional): Path the checkpoint was loaded from.
         """
         if self.cpt is not None:
             self.tgt_sr = self.cpt["config"][-1]
@@ -481,16 +685,22 @@ class VoiceConverter:
             self.version = self.cpt.get("version", "v1")
             self.text_enc_hidden_dim = 768 if self.version == "v2" else 256
             self.vocoder = self.cpt.get("vocoder", "HiFi-GAN")
-            self.net_g = Synthesizer(
-                *self.cpt["config"],
-                use_f0=self.use_f0,
-                text_enc_hidden_dim=self.text_enc_hidden_dim,
-                vocoder=self.vocoder,
-            )
-            del self.net_g.enc_q
-            self.net_g.load_state_dict(self.cpt["weight"], strict=False)
-            self.net_g = self.net_g.to(self.config.device).float()
-            self.net_g.eval()
+            self.net_g = None
+            runtime = self.config.synth_runtime
+            if runtime != "eager" and weight_root is not None:
+                try:
+                    self.net_g = load_exported_synthesizer(weight_root, runtime)
+                except Exception as error:
+                    print(f"Could not load the {runtime} graph for {weight_root}: {error}")
+                if self.net_g is None:
+                    print(f"No {runtime} graph for {weight_root}, using eager mode")
+            if self.net_g is None:
+                self.net_g = build_synthesizer(self.cpt, self.config.device)
+                quant = self.config.synth_quant
+                if quant != "none" and self.config.device != "cpu":
+                    print(f"RVC_SYNTH_QUANT={quant} only applies on CPU, using fp32")
+                elif quant != "none":
+                    self.net_g = quantize_synthesizer(self.net_g, quant)
 
     def setup_vc_instance(self):
         """
@@ -0,0 +1,232 @@
+import os
+import sys
+import glob
+import json
+import struct
+import argparse
+
+import numpy as np
+import torch
+
+from minimal_tts_rvc.algorithm.synthesizers import Synthesizer
+from minimal_tts_rvc.configs.config import Config
+
+PACKAGE_EXTENSION = ".safetensors"
+PACKAGE_VERSION = 1
+
+# safetensors dtype names
+_DTYPES = {
+    torch.float32: "F32",
+    torch.float16: "F16",
+    torch.int64: "I64",
+}
+_NUMPY_DTYPES = {"F32": np.float32, "F16": np.float16, "I64": np.int64}
+
+
+def package_paths(model_path, package_dir=None):
+    """
+    Returns `(tensor_path, config_path)` for a model's package.
+
+    Args:
+        model_path (str): Path to the `.pth` file.
+        package_dir (str, optional): Defaults to `Config().model_package_dir`.
+    """
+    package_dir = package_dir or Config().model_package_dir
+    stem = os.path.splitext(os.path.basename(model_path))[0]
+    tensor_path = os.path.join(package_dir, stem + PACKAGE_EXTENSION)
+    return tensor_path, os.path.join(package_dir, stem + ".json")
+
+
+def write_tensors(path, tensors):
+    """
+    Writes tensors to a safetensors file: a little-endian u64 header length, a JSON
+    header with each tensor's dtype, shape and byte range, then the raw data.
+
+    Args:
+        path (str): File to write.
+        tensors (dict): Tensor name -> contiguous CPU tensor with a dtype in `_DTYPES`.
+    """
+    header = {}
+    offset = 0
+    for name, tensor in tensors.items():
+        nbytes = tensor.numel() * tensor.element_size()
+        header[name] = {
+            "dtype": _DTYPES[tensor.dtype],
+            "shape": list(tensor.shape),
+            "data_offsets": [offset, offset + nbytes],
+        }
+        offset += nbytes
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    # Pad the header so the data, and every 4-byte tensor in it, stays aligned
+    header_bytes += b" " * (-len(header_bytes) % 8)
+    with open(path, "wb") as f:
+        f.write(struct.pack("<Q", len(header_bytes)))
+        f.write(header_bytes)
+        for tensor in tensors.values():
+            f.write(tensor.contiguous().numpy().tobytes())
+
+
+def read_tensors(path):
+    """
+    Memory-maps a safetensors file and returns its tensors without copying them.
+
+    The mapping is private, so pages are read from the page cache on first use and
+    shared between processes that load the same file; writes to the tensors are
+    never written back.
+
+    Args:
+        path (str): File written by write_tensors.
+    """
+    with open(path, "rb") as f:
+        (header_length,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_length))
+    header.pop("__metadata__", None)
+    data = np.memmap(path, dtype=np.uint8, mode="c", offset=8 + header_length)
+    tensors = {}
+    for name, info in header.items():
+        begin, end = info["data_offsets"]
+        array = data[begin:end].view(_NUMPY_DTYPES[info["dtype"]]).reshape(info["shape"])
+        tensors[name] = torch.from_numpy(array)
+    return tensors
+
+
+def convert_model(model_path, package_dir=None, dtype="float32"):
+    """
+    Writes a voice model as a package: the inference Synthesizer's weights, with weight
+    norm folded in, as a flat tensor file, and the checkpoint config as JSON.
+
+    Args:
+        model_path (str): Path to the `.pth` file.
+        package_dir (str, optional): Defaults to `Config().model_package_dir`.
+        dtype (str, optional): "float32" loads without a copy; "float16" halves the
+            file but is converted to float32 on load.
+    """
+    # Imported here: synth_export imports this module for build_synthesizer
+    from minimal_tts_rvc.synth_export import build_synthesizer
+
+    cpt = torch.load(model_path, map_location="cpu", weights_only=True)
+    net_g = build_synthesizer(cpt)
+    tensors = {
+        name: tensor.detach().to(getattr(torch, dtype))
+        for name, tensor in net_g.state_dict().items()
+    }
+    tensor_path, config_path = package_paths(model_path, package_dir)
+    os.makedirs(os.path.dirname(tensor_path), exist_ok=True)
+    write_tensors(tensor_path, tensors)
+
+    config = {
+        "package_version": PACKAGE_VERSION,
+        "source": os.path.abspath(model_path),
+        "source_mtime": os.path.getmtime(model_path),
+        "config": list(cpt["config"]),
+        "sr": cpt["config"][-1],
+        "f0": cpt.get("f0", 1),
+        "version": cpt.get("version", "v1"),
+        "vocoder": cpt.get("vocoder", "HiFi-GAN"),
+    }
+    with open(config_path, "w") as f:
+        json.dump(config, f, indent=2)
+    return tensor_path
+
+
+def load_package(tensor_path, config_path):
+    """
+    Loads a package as a checkpoint dict for VoiceConverter.
+
+    The dict has the keys of a `.pth` checkpoint, with memory-mapped weights, plus
+    `"packaged": True`; build_synthesizer then assigns the weights to the network's
+    parameters instead of copying them.
+
+    Args:
+        tensor_path (str): Path to the package's tensor file.
+        config_path (str): Path to its JSON config.
+    """
+    with open(config_path, "r") as f:
+        config = json.load(f)
+    if config.get("package_version") != PACKAGE_VERSION:
+        raise ValueError(
+            f"Unsupported package version {config.get('package_version')} in {config_path}"
+        )
+    return {
+        "config": config["config"],
+        "f0": config["f0"],
+        "version": config["version"],
+        "vocoder": config["vocoder"],
+        "weight": read_tensors(tensor_path),
+        "packaged": True,
+    }
+
+
+def find_package(model_path, package_dir=None):
+    """
+    Returns `(tensor_path, config_path)` for a model's up-to-date package, or None.
+
+    Args:
+        model_path (str): Path to the `.pth` file.
+        package_dir (str, optional): Defaults to `Config().model_package_dir`.
+    """
+    tensor_path, config_path = package_paths(model_path, package_dir)
+    if not (os.path.exists(tensor_path) and os.path.exists(config_path)):
+        return None
+    with open(config_path, "r") as f:
+        config = json.load(f)
+    if config.get("source_mtime") != os.path.getmtime(model_path):
+        print(f"Package {tensor_path} is older than {model_path}, re-convert it")
+        return None
+    return tensor_path, config_path
+
+
+def build_packaged_synthesizer(cpt):
+    """
+    Builds the inference Synthesizer for a packaged checkpoint without initializing weights.
+
+    The network is created on the meta device, weight norm is folded to match the
+    stored weights, and the memory-mapped tensors become its parameters.
+
+    Args:
+        cpt (dict): Checkpoint returned by load_package.
+    """
+    version = cpt.get("version", "v1")
+    with torch.device("meta"):
+        net_g = Synthesizer(
+            *cpt["config"],
+            use_f0=cpt.get("f0", 1),
+            text_enc_hidden_dim=768 if version == "v2" else 256,
+            vocoder=cpt.get("vocoder", "HiFi-GAN"),
+        )
+    del net_g.enc_q
+    net_g.remove_weight_norm()
+    net_g.load_state_dict(cpt["weight"], strict=True, assign=True)
+    return net_g
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert voice models to memory-mapped packages for fast loading"
+    )
+    parser.add_argument(
+        "models",
+        nargs="*",
+        help="Model .pth files (default: every .pth in models/)",
+    )
+    parser.add_argument("--output", default=None, help="Package directory")
+    parser.add_argument("--dtype", choices=("float32", "float16"), default="float32")
+    args = parser.parse_args()
+
+    models = args.models
+    if not models:
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        models = sorted(glob.glob(os.path.join(project_root, "models", "*.pth")))
+    failed = 0
+    for model_path in models:
+        try:
+            tensor_path = convert_model(model_path, args.output, args.dtype)
+            print(f"Converted {model_path} -> {tensor_path}")
+        except Exception as error:
+            failed += 1
+            print(f"Failed to convert {model_path}: {error}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,10 @@ import os
 import gc
 import re
 import sys
+import threading
 import torch
 import torch.nn.functional as F
 import torchcrepe
-import faiss
 import librosa
 import numpy as np
 from scipy import signal
@@ -16,6 +16,9 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
 
 from minimal_tts_rvc.predictors.RMVPE import RMVPE0Predictor
+from minimal_tts_rvc.index_cache import IndexCache
+from minimal_tts_rvc.f0_cache import F0Cache, audio_hash
+from minimal_tts_rvc.feature_cache import FeatureCache
 # from predictors.FCPE import FCPEF0Predictor
 
 import logging
@@ -31,6 +34,27 @@ bh, ah = signal.butter(
 
 input_audio_path2wav = {}
 
+# RMVPE does not depend on the voice model, so one predictor per device is
+# shared by every Pipeline in the process.
+_rmvpe_predictors = {}
+_rmvpe_lock = threading.Lock()
+
+
+def get_rmvpe_predictor(device):
+    """
+    Returns the process-wide RMVPE predictor for the given device, loading it on first use.
+
+    Args:
+        device: The device the predictor should run on.
+    """
+    with _rmvpe_lock:
+        if device not in _rmvpe_predictors:
+            rmvpe_path = os.path.join(
+                current_dir, "rvc", "models", "predictors", "rmvpe.pt"
+            )
+            _rmvpe_predictors[device] = RMVPE0Predictor(rmvpe_path, device=device)
+        return _rmvpe_predictors[device]
+
 
 class AudioProcessor:
     """
@@ -92,6 +116,19 @@ class Autotune:
     A class for applying autotune to a given fundamental frequency (F0) contour.
     """
 
+    # Semitone offsets from the key for the supported scales
+    SCALES = {
+        "chromatic": list(range(12)),
+        "major": [0, 2, 4, 5, 7, 9, 11],
+        "minor": [0, 2, 3, 5, 7, 8, 10],
+        "harmonic_minor": [0, 2, 3, 5, 7, 8, 11],
+        "pentatonic_major": [0, 2, 4, 7, 9],
+        "pentatonic_minor": [0, 3, 5, 7, 10],
+        "blues": [0, 3, 5, 6, 7, 10],
+    }
+    KEYS = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
+    KEY_ALIASES = {"Db": "C#", "Eb": "D#", "Gb": "F#", "Ab": "G#", "Bb": "A#"}
+
     def __init__(self, ref_freqs):
         """
         Initializes the Autotune class with a set of reference frequencies.
@@ -101,19 +138,61 @@ class Autotune:
         """
         self.ref_freqs = ref_freqs
         self.note_dict = self.ref_freqs  # No interpolation needed
+        self.notes = np.sort(np.asarray(ref_freqs, dtype=np.float64))
+        self._scale_notes = {}
+
+    def scale_notes(self, key="C", scale="chromatic"):
+        """
+        Returns the sorted reference frequencies that belong to a key and scale.
+
+        Args:
+            key: Root note name (e.g. "C", "F#", "Bb").
+            scale: A name from Autotune.SCALES or a list of semitone offsets from the key.
+        """
+        intervals = self.SCALES[scale] if isinstance(scale, str) else list(scale)
+        cache_key = (key, tuple(intervals))
+        if cache_key not in self._scale_notes:
+            root = self.KEYS.index(self.KEY_ALIASES.get(key, key))
+            allowed = {(root + interval) % 12 for interval in intervals}
+            # MIDI note numbers of the reference table (G1 is note 31)
+            midi = np.rint(69 + 12 * np.log2(self.notes / 440.0)).astype(int)
+            self._scale_notes[cache_key] = self.notes[np.isin(midi % 12, list(allowed))]
+        return self._scale_notes[cache_key]
 
-    def autotune_f0(self, f0, f0_autotune_strength):
+    def autotune_f0(self, f0, f0_autotune_strength, key="C", scale="chromatic"):
         """
         Autotunes a given F0 contour by snapping each frequency to the closest reference frequency.
 
+        The nearest note is found in the log-frequency domain with a binary search over
+        the sorted note table. Unvoiced frames (F0 of 0) are left untouched.
+
         Args:
             f0: The input F0 contour as a NumPy array.
+            f0_autotune_strength: How far to move towards the note (0 to 1).
+            key: Root note of the scale to snap to.
+            scale: Scale name from Autotune.SCALES or a list of semitone offsets.
         """
-        autotuned_f0 = np.zeros_like(f0)
-        for i, freq in enumerate(f0):
-            closest_note = min(self.note_dict, key=lambda x: abs(x - freq))
-            autotuned_f0[i] = freq + (closest_note - freq) * f0_autotune_strength
-        return autotuned_f0
+        notes = self.scale_notes(key, scale)
+        log_notes = np.log2(notes)
+        autotuned_f0 = np.array(f0, dtype=np.float64, copy=True)
+        voiced = autotuned_f0 > 0
+        freqs = autotuned_f0[voiced]
+        if freqs.size == 0 or notes.size == 0:
+            return autotuned_f0.astype(np.asarray(f0).dtype)
+        log_freqs = np.log2(freqs)
+        if notes.size == 1:
+            nearest = np.zeros(freqs.shape, dtype=int)
+        else:
+            upper = np.clip(np.searchsorted(log_notes, log_freqs), 1, notes.size - 1)
+            lower = upper - 1
+            nearest = np.where(
+                log_freqs - log_notes[lower] <= log_notes[upper] - log_freqs,
+                lower,
+                upper,
+            )
+        closest_note = notes[nearest]
+        autotuned_f0[voiced] = freqs + (closest_note - freqs) * f0_autotune_strength
+        return autotuned_f0.astype(np.asarray(f0).dtype)
 
 
 class Pipeline:
@@ -148,6 +227,7 @@ class Pipeline:
         self.f0_mel_min = 1127 * np.log(1 + self.f0_min / 700)
         self.f0_mel_max = 1127 * np.log(1 + self.f0_max / 700)
         self.device = config.device
+        self.batch_size = config.segment_batch_size
         self.ref_freqs = [
             49.00,  # G1
             51.91,  # G#1 / Ab1
@@ -206,13 +286,7 @@ class Pipeline:
         ]
         self.autotune = Autotune(self.ref_freqs)
         self.note_dict = self.autotune.note_dict
-        # Get the directory where this file is located
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        rmvpe_path = os.path.join(current_dir, "rvc", "models", "predictors", "rmvpe.pt")
-        self.model_rmvpe = RMVPE0Predictor(
-            rmvpe_path,
-            device=self.device,
-        )
+        self.model_rmvpe = get_rmvpe_predictor(self.device)
 
     def get_f0_crepe(
         self,
@@ -325,30 +399,16 @@ class Pipeline:
             f0_median_hybrid = np.nanmedian(f0_computation_stack, axis=0)
         return f0_median_hybrid
 
-    def get_f0(
-        self,
-        input_audio_path,
-        x,
-        p_len,
-        pitch,
-        f0_method,
-        hop_length,
-        f0_autotune,
-        f0_autotune_strength,
-        inp_f0=None,
-    ):
+    def estimate_f0(self, input_audio_path, x, p_len, f0_method, hop_length):
         """
-        Estimates the fundamental frequency (F0) of a given audio signal using various methods.
+        Runs the F0 estimator, returning the raw contour before autotune and pitch shift.
 
         Args:
             input_audio_path: Path to the input audio file.
             x: The input audio signal as a NumPy array.
             p_len: Desired length of the F0 output.
-            pitch: Key to adjust the pitch of the F0 contour.
             f0_method: Method to use for F0 estimation (e.g., "crepe").
             hop_length: Hop length for F0 estimation methods.
-            f0_autotune: Whether to apply autotune to the F0 contour.
-            inp_f0: Optional input F0 contour to use instead of estimating.
         """
         global input_audio_path2wav
         if f0_method == "crepe":
@@ -385,9 +445,53 @@ class Pipeline:
                 p_len,
                 hop_length,
             )
+        return f0
+
+    def get_f0(
+        self,
+        input_audio_path,
+        x,
+        p_len,
+        pitch,
+        f0_method,
+        hop_length,
+        f0_autotune,
+        f0_autotune_strength,
+        inp_f0=None,
+        f0_autotune_key="C",
+        f0_autotune_scale="chromatic",
+    ):
+        """
+        Estimates the fundamental frequency (F0) of a given audio signal using various methods.
+
+        Raw contours are cached by F0Cache, so only autotune, pitch shift and
+        quantization run again for audio that was already analysed.
+
+        Args:
+            input_audio_path: Path to the input audio file.
+            x: The input audio signal as a NumPy array.
+            p_len: Desired length of the F0 output.
+            pitch: Key to adjust the pitch of the F0 contour.
+            f0_method: Method to use for F0 estimation (e.g., "crepe").
+            hop_length: Hop length for F0 estimation methods.
+            f0_autotune: Whether to apply autotune to the F0 contour.
+            inp_f0: Optional input F0 contour to use instead of estimating.
+            f0_autotune_key: Root note of the autotune scale.
+            f0_autotune_scale: Autotune scale name or list of semitone offsets.
+        """
+        f0_cache = F0Cache()
+        cache_key = f0_cache.key(
+            x, f0_method, hop_length, p_len, (self.f0_min, self.f0_max, 0.03)
+        )
+        f0 = f0_cache.get(cache_key)
+        if f0 is None:
+            f0 = self.estimate_f0(input_audio_path, x, p_len, f0_method, hop_length)
+            f0_cache.put(cache_key, f0)
 
         if f0_autotune is True:
-            f0 = Autotune.autotune_f0(self, f0, f0_autotune_strength)
+            f0 = self.autotune.autotune_f0(
+                f0, f0_autotune_strength, f0_autotune_key, f0_autotune_scale
+            )
 
         f0 *= pow(2, pitch / 12)
         tf0 = self.sample_rate // self.window
@@ -402,16 +506,22 @@ class Pipeline:
             f0[self.x_pad * tf0 : self.x_pad * tf0 + len(replace_f0)] = replace_f0[
                 :shape
             ]
-        f0bak = f0.copy()
+        return self.coarse_f0(f0), f0
+
+    def coarse_f0(self, f0):
+        """
+        Quantizes an F0 contour to the 1-255 mel-scale bins used for pitch guidance.
+
+        Args:
+            f0: The F0 contour in Hz as a NumPy array; 0 marks unvoiced frames.
+        """
         f0_mel = 1127 * np.log(1 + f0 / 700)
         f0_mel[f0_mel > 0] = (f0_mel[f0_mel > 0] - self.f0_mel_min) * 254 / (
             self.f0_mel_max - self.f0_mel_min
         ) + 1
         f0_mel[f0_mel <= 1] = 1
         f0_mel[f0_mel > 255] = 255
-        f0_coarse = np.rint(f0_mel).astype(int)
-
-        return f0_coarse, f0bak
+        return np.rint(f0_mel).astype(int)
 
     def voice_conversion(
         self,
@@ -426,6 +536,7 @@ class Pipeline:
         index_rate,
         version,
         protect,
+        feature_key=None,
     ):
         """
         Performs voice conversion on a given audio segment.
@@ -442,16 +553,11 @@ class Pipeline:
             index_rate: Blending rate for speaker embedding retrieval.
             version: Model version (Keep to support old models).
             protect: Protection level for preserving the original pitch.
+            feature_key: FeatureCache key of the segment, or None to skip the cache.
         """
         with torch.no_grad():
             pitch_guidance = pitch != None and pitchf != None
-            # prepare source audio
-            feats = torch.from_numpy(audio0).float()
-            feats = feats.mean(-1) if feats.dim() == 2 else feats
-            assert feats.dim() == 1, feats.dim()
-            feats = feats.view(1, -1).to(self.device)
-            # extract features
-            feats = model(feats)["last_hidden_state"]
+            feats = self._extract_features(model, audio0, feature_key)
             feats = (
                 model.final_proj(feats[0]).unsqueeze(0) if version == "v1" else feats
             )
@@ -498,6 +604,199 @@ class Pipeline:
                 torch.cuda.empty_cache()
         return audio1
 
+    def _extract_features(self, model, audio0, feature_key=None):
+        feature_cache = FeatureCache()
+        feats = feature_cache.get(feature_key) if feature_key else None
+        if feats is None:
+            # prepare source audio
+            feats = torch.from_numpy(audio0).float()
+            feats = feats.mean(-1) if feats.dim() == 2 else feats
+            assert feats.dim() == 1, feats.dim()
+            feats = feats.view(1, -1).to(self.device)
+            # extract features
+            feats = model(feats)["last_hidden_state"]
+            if feature_key:
+                feature_cache.put(feature_key, feats)
+        return feats
+
+    def voice_conversion_batch(
+        self,
+        model,
+        net_g,
+        sid,
+        audios,
+        pitches,
+        pitchfs,
+        index,
+        big_npy,
+        index_rate,
+        version,
+        protect,
+        batch_size,
+        feature_keys=None,
+    ):
+        """
+        Performs voice conversion on several audio segments, batching segments of similar length.
+
+        Segments are sorted by length and converted in groups of batch_size, with one
+        HuBERT transformer pass, one FAISS search and one net_g.infer call per group.
+        Returns the converted segments in input order.
+
+        Args:
+            model: The feature extractor model.
+            net_g: The generative model for synthesizing speech.
+            sid: Speaker ID for the target voice.
+            audios: The input audio segments.
+            pitches: Quantized F0 contour for each segment, or None entries without pitch guidance.
+            pitchfs: Original F0 contour for each segment, or None entries without pitch guidance.
+            index: FAISS index for speaker embedding retrieval.
+            big_npy: Speaker embeddings stored in a NumPy array.
+            index_rate: Blending rate for speaker embedding retrieval.
+            version: Model version (Keep to support old models).
+            protect: Protection level for preserving the original pitch.
+            batch_size: Maximum number of segments per batch.
+            feature_keys: FeatureCache key of each segment, or None to skip the cache.
+        """
+        feature_keys = feature_keys or [None] * len(audios)
+        order = sorted(range(len(audios)), key=lambda i: audios[i].shape[0])
+        converted = [None] * len(audios)
+        for start in range(0, len(order), batch_size):
+            group = order[start : start + batch_size]
+            outputs = self._voice_conversion_group(
+                model,
+                net_g,
+                sid,
+                [audios[i] for i in group],
+                [pitches[i] for i in group],
+                [pitchfs[i] for i in group],
+                index,
+                big_npy,
+                index_rate,
+                version,
+                protect,
+                [feature_keys[i] for i in group],
+            )
+            for i, output in zip(group, outputs):
+                converted[i] = output
+        return converted
+
+    def _extract_features_batch(self, model, audios):
+        # The convolutional feature extractor uses GroupNorm over time, so zero
+        # padding would change its statistics; run it per segment and batch the
+        # projection and transformer with an attention mask instead.
+        extract_features = []
+        with torch.no_grad():
+            for audio0 in audios:
+                feats = torch.from_numpy(audio0).float()
+                feats = feats.mean(-1) if feats.dim() == 2 else feats
+                feats = feats.view(1, -1).to(self.device)
+                extract_features.append(model.feature_extractor(feats)[0].transpose(0, 1))
+            feat_lengths = [feats.shape[0] for feats in extract_features]
+            padded = torch.nn.utils.rnn.pad_sequence(extract_features, batch_first=True)
+            attention_mask = torch.zeros(
+                padded.shape[:2], dtype=torch.bool, device=self.device
+            )
+            for i, length in enumerate(feat_lengths):
+                attention_mask[i, :length] = True
+            hidden_states = model.feature_projection(padded)
+            if isinstance(hidden_states, tuple):
+                hidden_states = hidden_states[0]
+            hidden_states = model.encoder(
+                hidden_states, attention_mask=attention_mask
+            )[0]
+        return hidden_states, feat_lengths
+
+    def _group_features(self, model, audios, feature_keys):
+        # Only segments missing from the feature cache go through HuBERT
+        feature_cache = FeatureCache()
+        feats_list = [feature_cache.get(key) if key else None for key in feature_keys]
+        missing = [i for i, feats in enumerate(feats_list) if feats is None]
+        if missing:
+            hidden_states, feat_lengths = self._extract_features_batch(
+                model, [audios[i] for i in missing]
+            )
+            for row, (i, length) in enumerate(zip(missing, feat_lengths)):
+                feats_list[i] = hidden_states[row : row + 1, :length]
+                if feature_keys[i]:
+                    # clone so the cache does not keep the whole padded batch alive
+                    feature_cache.put(feature_keys[i], feats_list[i].clone())
+        return feats_list
+
+    def _voice_conversion_group(
+        self,
+        model,
+        net_g,
+        sid,
+        audios,
+        pitches,
+        pitchfs,
+        index,
+        big_npy,
+        index_rate,
+        version,
+        protect,
+        feature_keys,
+    ):
+        with torch.no_grad():
+            pitch_guidance = pitches[0] is not None and pitchfs[0] is not None
+            feats_list = self._group_features(model, audios, feature_keys)
+            if version == "v1":
+                feats_list = [model.final_proj(feats) for feats in feats_list]
+            feat_lengths = [feats.shape[1] for feats in feats_list]
+            feats0_list = (
+                [feats.clone() for feats in feats_list] if pitch_guidance else None
+            )
+            if index:
+                # one search over the valid frames of every segment in the batch
+                retrieved = self._retrieve_speaker_embeddings(
+                    torch.cat(feats_list, dim=1), index, big_npy, index_rate
+                )
+                feats_list = list(torch.split(retrieved, feat_lengths, dim=1))
+
+            phones, p_lens, pitch_batch, pitchf_batch = [], [], [], []
+            for i, feats in enumerate(feats_list):
+                feats = F.interpolate(feats.permute(0, 2, 1), scale_factor=2).permute(
+                    0, 2, 1
+                )
+                p_len = min(audios[i].shape[0] // self.window, feats.shape[1])
+                feats = feats[:, :p_len]
+                if pitch_guidance:
+                    feats0 = F.interpolate(
+                        feats0_list[i].permute(0, 2, 1), scale_factor=2
+                    ).permute(0, 2, 1)[:, :p_len]
+                    pitch, pitchf = pitches[i][:, :p_len], pitchfs[i][:, :p_len]
+                    if protect < 0.5:
+                        pitchff = pitchf.clone()
+                        pitchff[pitchf > 0] = 1
+                        pitchff[pitchf < 1] = protect
+                        feats = feats * pitchff.unsqueeze(-1) + feats0 * (
+                            1 - pitchff.unsqueeze(-1)
+                        )
+                        feats = feats.to(feats0.dtype)
+                    pitch_batch.append(pitch[0])
+                    pitchf_batch.append(pitchf[0].float())
+                phones.append(feats[0].float())
+                p_lens.append(p_len)
+
+            phone = torch.nn.utils.rnn.pad_sequence(phones, batch_first=True)
+            phone_lengths = torch.tensor(p_lens, device=self.device).long()
+            if pitch_guidance:
+                pitch = torch.nn.utils.rnn.pad_sequence(pitch_batch, batch_first=True)
+                pitchf = torch.nn.utils.rnn.pad_sequence(pitchf_batch, batch_first=True)
+            else:
+                pitch = pitchf = None
+            sids = sid.expand(len(audios))
+            audio_batch = net_g.infer(phone, phone_lengths, pitch, pitchf, sids)[0]
+            hop = audio_batch.shape[-1] // phone.shape[1]
+            outputs = [
+                audio_batch[i, 0, : p_lens[i] * hop].data.cpu().float().numpy()
+                for i in range(len(audios))
+            ]
+            del feats_list, feats0_list, phone, pitch, pitchf
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        return outputs
+
     def _retrieve_speaker_embeddings(self, feats, index, big_npy, index_rate):
         npy = feats[0].cpu().numpy()
         score, ix = index.search(npy, k=8)
@@ -510,6 +809,40 @@ class Pipeline:
         )
         return feats
 
+    def find_split_points(self, audio):
+        """
+        Finds where long audio is cut into segments, one cut per t_center samples.
+
+        Each cut is placed at the quietest point (smallest absolute moving sum over one
+        window) within t_query samples of the nominal position. The moving sum comes from
+        a single cumulative sum and every search window is reduced with one argmin over a
+        strided view.
+
+        Args:
+            audio: The high-pass filtered input audio signal.
+        """
+        n_samples = audio.shape[0]
+        if n_samples + self.window <= self.t_max:
+            return []
+        audio_pad = np.pad(audio, (self.window // 2, self.window // 2), mode="reflect")
+        cumsum = np.concatenate(([0.0], np.cumsum(audio_pad, dtype=np.float64)))
+        audio_sum = np.abs(cumsum[self.window : self.window + n_samples] - cumsum[:n_samples])
+
+        centers = np.arange(self.t_center, n_samples, self.t_center)
+        width = 2 * self.t_query
+        full = centers[centers + self.t_query <= n_samples]
+        opt_ts = []
+        if full.size:
+            windows = np.lib.stride_tricks.sliding_window_view(audio_sum, width)[
+                full[0] - self.t_query :: self.t_center
+            ][: full.size]
+            opt_ts.extend((full - self.t_query + np.argmin(windows, axis=1)).tolist())
+        for t in centers[full.size :]:
+            opt_ts.append(
+                int(t - self.t_query + np.argmin(audio_sum[t - self.t_query : t + self.t_query]))
+            )
+        return opt_ts
+
     def pipeline(
         self,
         model,
@@ -528,6 +861,10 @@ class Pipeline:
         f0_autotune,
         f0_autotune_strength,
         f0_file,
+        batch_size=None,
+        f0_autotune_key="C",
+        f0_autotune_scale="chromatic",
+        embedder_key=None,
     ):
         """
         The main pipeline function for performing voice conversion.
@@ -551,32 +888,22 @@ class Pipeline:
             hop_length: Hop length for F0 estimation methods.
             f0_autotune: Whether to apply autotune to the F0 contour.
             f0_file: Path to a file containing an F0 contour to use.
+            batch_size: Number of segments converted per batch on long inputs (1 converts them one by one).
+            f0_autotune_key: Root note of the autotune scale.
+            f0_autotune_scale: Autotune scale name or list of semitone offsets.
+            embedder_key: Identifies the embedder behind `model`; when set, segment features are
+                reused through FeatureCache.
         """
         if file_index is not None and file_index != "" and os.path.exists(file_index) and index_rate > 0:
             try:
-                index = faiss.read_index(file_index)
-                big_npy = index.reconstruct_n(0, index.ntotal)
+                index, big_npy = IndexCache().load(file_index)
             except Exception as error:
                 print(f"An error occurred reading the FAISS index: {error}")
                 index = big_npy = None
         else:
             index = big_npy = None
         audio = signal.filtfilt(bh, ah, audio)
-        audio_pad = np.pad(audio, (self.window // 2, self.window // 2), mode="reflect")
-        opt_ts = []
-        if audio_pad.shape[0] > self.t_max:
-            audio_sum = np.zeros_like(audio)
-            for i in range(self.window):
-                audio_sum += audio_pad[i : i - self.window]
-            for t in range(self.t_center, audio.shape[0], self.t_center):
-                opt_ts.append(
-                    t
-                    - self.t_query
-                    + np.where(
-                        np.abs(audio_sum[t - self.t_query : t + self.t_query])
-                        == np.abs(audio_sum[t - self.t_query : t + self.t_query]).min()
-                    )[0][0]
-                )
+        opt_ts = self.find_split_points(audio)
         s = 0
         audio_opt = []
         t = None
@@ -605,6 +932,8 @@ class Pipeline:
                 f0_autotune,
                 f0_autotune_strength,
                 inp_f0,
+                f0_autotune_key,
+                f0_autotune_scale,
             )
             pitch = pitch[:p_len]
             pitchf = pitchf[:p_len]
@@ -612,73 +941,76 @@ class Pipeline:
                 pitchf = pitchf.astype(np.float32)
             pitch = torch.tensor(pitch, device=self.device).unsqueeze(0).long()
             pitchf = torch.tensor(pitchf, device=self.device).unsqueeze(0).float()
+        # (audio start, audio end, f0 start, f0 end) of each segment in audio_pad
+        segments = []
         for t in opt_ts:
             t = t // self.window * self.window
-            if pitch_guidance:
-                audio_opt.append(
-                    self.voice_conversion(
-                        model,
-                        net_g,
-                        sid,
-                        audio_pad[s : t + self.t_pad2 + self.window],
-                        pitch[:, s // self.window : (t + self.t_pad2) // self.window],
-                        pitchf[:, s // self.window : (t + self.t_pad2) // self.window],
-                        index,
-                        big_npy,
-                        index_rate,
-                        version,
-                        protect,
-                    )[self.t_pad_tgt : -self.t_pad_tgt]
-                )
-            else:
-                audio_opt.append(
-                    self.voice_conversion(
-                        model,
-                        net_g,
-                        sid,
-                        audio_pad[s : t + self.t_pad2 + self.window],
-                        None,
-                        None,
-                        index,
-                        big_npy,
-                        index_rate,
-                        version,
-                        protect,
-                    )[self.t_pad_tgt : -self.t_pad_tgt]
+            segments.append(
+                (
+                    s,
+                    t + self.t_pad2 + self.window,
+                    s // self.window,
+                    (t + self.t_pad2) // self.window,
                 )
+            )
             s = t
+        segments.append((t, None, t // self.window if t is not None else None, None))
+        audio_segments = [audio_pad[start:end] for start, end, _, _ in segments]
         if pitch_guidance:
-            audio_opt.append(
-                self.voice_conversion(
-                    model,
-                    net_g,
-                    sid,
-                    audio_pad[t:],
-                    pitch[:, t // self.window :] if t is not None else pitch,
-                    pitchf[:, t // self.window :] if t is not None else pitchf,
-                    index,
-                    big_npy,
-                    index_rate,
-                    version,
-                    protect,
-                )[self.t_pad_tgt : -self.t_pad_tgt]
+            pitch_segments = [pitch[:, start:end] for _, _, start, end in segments]
+            pitchf_segments = [pitchf[:, start:end] for _, _, start, end in segments]
+        else:
+            pitch_segments = pitchf_segments = [None] * len(segments)
+        if embedder_key is not None:
+            audio_key = audio_hash(audio_pad)
+            feature_cache = FeatureCache()
+            feature_keys = [
+                feature_cache.key(audio_key, embedder_key, start, end)
+                for start, end, _, _ in segments
+            ]
+        else:
+            feature_keys = [None] * len(segments)
+        batch_size = self.batch_size if batch_size is None else batch_size
+        if batch_size > 1 and len(segments) > 1:
+            converted = self.voice_conversion_batch(
+                model,
+                net_g,
+                sid,
+                audio_segments,
+                pitch_segments,
+                pitchf_segments,
+                index,
+                big_npy,
+                index_rate,
+                version,
+                protect,
+                batch_size,
+                feature_keys,
             )
         else:
-            audio_opt.append(
+            converted = [
                 self.voice_conversion(
                     model,
                     net_g,
                     sid,
-                    audio_pad[t:],
-                    None,
-                    None,
+                    audio_segment,
+                    pitch_segment,
+                    pitchf_segment,
                     index,
                     big_npy,
                     index_rate,
                     version,
                     protect,
-                )[self.t_pad_tgt : -self.t_pad_tgt]
-            )
+                    feature_key,
+                )
+                for audio_segment, pitch_segment, pitchf_segment, feature_key in zip(
+                    audio_segments, pitch_segments, pitchf_segments, feature_keys
+                )
+            ]
+        audio_opt = [
+            audio_segment[self.t_pad_tgt : -self.t_pad_tgt]
+            for audio_segment in converted
+        ]
         audio_opt = np.concatenate(audio_opt)
         if volume_envelope != 1:
             audio_opt = AudioProcessor.change_rms(
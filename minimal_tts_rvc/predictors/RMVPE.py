@@ -496,15 +496,10 @@ class RMVPE0Predictor:
         center = np.argmax(salience, axis=1)
         salience = np.pad(salience, ((0, 0), (4, 4)))
         center += 4
-        todo_salience = []
-        todo_cents_mapping = []
-        starts = center - 4
-        ends = center + 5
-        for idx in range(salience.shape[0]):
-            todo_salience.append(salience[:, starts[idx] : ends[idx]][idx])
-            todo_cents_mapping.append(self.cents_mapping[starts[idx] : ends[idx]])
-        todo_salience = np.array(todo_salience)
-        todo_cents_mapping = np.array(todo_cents_mapping)
+        # Gather the 9-bin window around each frame's peak in one indexing step
+        window = center[:, None] + np.arange(-4, 5)[None, :]
+        todo_salience = np.take_along_axis(salience, window, axis=1)
+        todo_cents_mapping = self.cents_mapping[window]
         product_sum = np.sum(todo_salience * todo_cents_mapping, 1)
         weight_sum = np.sum(todo_salience, 1)
         devided = product_sum / weight_sum
@@ -0,0 +1,69 @@
+import torch
+
+HUBERT_QUANT_MODES = ("none", "int8")
+SYNTH_QUANT_MODES = ("none", "bf16")
+
+
+def check_mode(mode, modes, setting):
+    mode = (mode or "none").lower()
+    if mode not in modes:
+        raise ValueError(f"Unknown {setting} '{mode}', expected one of {modes}")
+    return mode
+
+
+def quantize_hubert(hubert_model, mode="int8"):
+    """
+    Returns HuBERT with its linear layers dynamically quantized to int8.
+
+    The attention projections, feed-forward layers and final_proj are quantized;
+    the convolutional feature encoder stays in fp32. Only runs on CPU.
+
+    Args:
+        hubert_model (HubertModelWithFinalProj): The fp32 model, on the CPU.
+        mode (str, optional): One of HUBERT_QUANT_MODES.
+    """
+    mode = check_mode(mode, HUBERT_QUANT_MODES, "RVC_HUBERT_QUANT")
+    if mode == "none":
+        return hubert_model
+    return torch.ao.quantization.quantize_dynamic(
+        hubert_model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+
+
+class AutocastDecoder(torch.nn.Module):
+    """
+    Runs a generator under CPU bf16 autocast and returns fp32 audio.
+
+    Convolutions and transposed convolutions run in bf16, while the NSF sine
+    source keeps its phase accumulation in fp32 since its inputs are never cast.
+
+    Args:
+        dec (torch.nn.Module): The generator to wrap.
+    """
+
+    def __init__(self, dec):
+        super().__init__()
+        self.dec = dec
+
+    def forward(self, *args, **kwargs):
+        with torch.autocast("cpu", dtype=torch.bfloat16):
+            return self.dec(*args, **kwargs).float()
+
+
+def quantize_synthesizer(net_g, mode):
+    """
+    Returns an eager Synthesizer with a reduced-precision inference path.
+
+    "bf16" runs the generator under bf16 autocast, which is only fast on CPUs with
+    native bf16 support. There is no int8 mode: the generator's convolutions have
+    no dynamic int8 kernels, and quantizing the few linear layers elsewhere gains
+    nothing measurable. Only runs on CPU.
+
+    Args:
+        net_g (Synthesizer): The fp32 network with weight norm folded in.
+        mode (str): One of SYNTH_QUANT_MODES.
+    """
+    mode = check_mode(mode, SYNTH_QUANT_MODES, "RVC_SYNTH_QUANT")
+    if mode == "bf16" and net_g.dec is not None:
+        net_g.dec = AutocastDecoder(net_g.dec)
+    return net_g
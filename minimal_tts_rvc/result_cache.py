@@ -0,0 +1,163 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+from minimal_tts_rvc.configs.config import Config, singleton
+
+
+def result_cache_key(text, model_choice, params):
+    """
+    Returns the content hash identifying a synthesis result.
+
+    Args:
+        text (str): The final text sent to TTS (after any RAG enhancement).
+        model_choice (str): Model name.
+        params (dict): Every parameter that affects the output (voice, model files, convert_audio options).
+    """
+    payload = json.dumps(
+        {"text": text, "model": model_choice, "params": params},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    """
+    A content-addressed on-disk cache of encoded audio.
+
+    Files live at `<cache_dir>/<key[:2]>/<key>.<ext>`. An in-memory index ordered by
+    last use is rebuilt from file mtimes on startup, and the least recently used
+    files are deleted once the total size exceeds the budget. Several worker
+    processes can share one directory: a lookup that misses the index still finds
+    files another worker has written.
+
+    Args:
+        cache_dir (str): Directory for cached files.
+        max_bytes (int): Size budget.
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._index = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._load_index()
+
+    def _load_index(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.startswith(".") or name.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, os.path.splitext(name)[0], path, stat.st_size))
+        for _, key, path, size in sorted(entries):
+            self._index[key] = (path, size)
+
+    def _path(self, key, ext):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.{ext.lower()}")
+
+    def get(self, key, ext="mp3"):
+        """
+        Returns the cached file path for a key, or None on a miss.
+
+        Args:
+            key (str): Cache key.
+            ext (str, optional): File extension to look for when another worker wrote the entry.
+        """
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is not None and not os.path.exists(entry[0]):
+                del self._index[key]
+                entry = None
+            try:
+                if entry is None and os.path.exists(self._path(key, ext)):
+                    path = self._path(key, ext)
+                    entry = (path, os.path.getsize(path))
+                if entry is not None:
+                    # Refresh mtime so other workers sharing the directory see the use
+                    os.utime(entry[0])
+            except OSError:
+                # Another worker evicted the file since the checks above
+                self._index.pop(key, None)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._index[key] = entry
+            self._index.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, data, ext="mp3"):
+        """
+        Stores an encoded result and evicts old entries past the budget.
+
+        Args:
+            key (str): Cache key.
+            data (bytes): The encoded audio to store.
+            ext (str, optional): File extension of the encoded audio.
+        """
+        path = self._path(key, ext)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        size = os.path.getsize(path)
+        with self._lock:
+            self._index[key] = (path, size)
+            self._index.move_to_end(key)
+            self._evict()
+        return path
+
+    def _evict(self):
+        total = sum(size for _, size in self._index.values())
+        while total > self.max_bytes and len(self._index) > 1:
+            key, (path, size) = self._index.popitem(last=False)
+            total -= size
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def stats(self):
+        """
+        Returns hit/miss counters and the current cache size.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._index),
+                "total_bytes": sum(size for _, size in self._index.values()),
+                "max_bytes": self.max_bytes,
+            }
+
+
+@singleton
+class ResultCache(DiskCache):
+    """
+    The on-disk cache of encoded synthesis results, keyed by result_cache_key.
+
+    Args:
+        cache_dir (str, optional): Directory for cached files. Defaults to `Config().result_cache_dir`.
+        max_bytes (int, optional): Size budget. Defaults to `Config().result_cache_mb`.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        config = Config()
+        super().__init__(
+            cache_dir or config.result_cache_dir,
+            max_bytes if max_bytes is not None else config.result_cache_mb * 1024**2,
+        )
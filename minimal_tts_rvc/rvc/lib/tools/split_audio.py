@@ -4,7 +4,7 @@ import librosa
 
 def process_audio(audio, sr=16000, silence_thresh=-60, min_silence_len=250):
     """
-    Splits an audio signal into segments using a fixed frame size and hop size.
+    Splits an audio signal into its non-silent segments.
 
     Parameters:
     - audio (np.ndarray): The audio signal to split.
@@ -26,54 +26,87 @@ def process_audio(audio, sr=16000, silence_thresh=-60, min_silence_len=250):
     return audio_segments, intervals
 
 
-def merge_audio(audio_segments_org, audio_segments_new, intervals, sr_orig, sr_new):
+def merge_layout(audio_segments_org, audio_segments_new, intervals, sr_orig, sr_new):
     """
-    Merges audio segments back into a single audio signal, filling gaps with silence.
-    Assumes audio segments are already at sr_new.
+    Returns the start of each converted segment in the merged signal and its total length.
+
+    Each segment keeps its original start and the silent gaps between segments are
+    restored. A converted segment shorter than its original is padded with silence
+    after it; one that came out longer is preceded by the difference in silence.
+
+    Parameters: see merge_audio.
 
-    Parameters:
-    - audio_segments_org (list of np.ndarray): The non-silent audio segments (at sr_orig).
-    - audio_segments_new (list of np.ndarray): The non-silent audio segments (at sr_new).
-    - intervals (np.ndarray): The intervals used for splitting the original audio.
-    - sr_orig (int): The sample rate of the original audio
-    - sr_new (int): The sample rate of the model
     Returns:
-    - np.ndarray: The merged audio signal with silent gaps restored.
+    - np.ndarray: Start offset of each converted segment.
+    - int: Length of the merged signal.
     """
-    merged_audio = np.array([], dtype=audio_segments_new[0].dtype)
     sr_ratio = sr_new / sr_orig
-
+    offsets = np.zeros(len(intervals), dtype=np.int64)
+    position = 0
     for i, (start, end) in enumerate(intervals):
-
         start_new = int(start * sr_ratio)
         end_new = int(end * sr_ratio)
 
         original_duration = len(audio_segments_org[i]) / sr_orig
         new_duration = len(audio_segments_new[i]) / sr_new
         duration_diff = new_duration - original_duration
-
         silence_samples = int(abs(duration_diff) * sr_new)
-        silence_compensation = np.zeros(
-            silence_samples, dtype=audio_segments_new[0].dtype
-        )
 
         if i == 0 and start_new > 0:
-            initial_silence = np.zeros(start_new, dtype=audio_segments_new[0].dtype)
-            merged_audio = np.concatenate((merged_audio, initial_silence))
-
+            position += start_new
         if duration_diff > 0:
-            merged_audio = np.concatenate((merged_audio, silence_compensation))
-
-        merged_audio = np.concatenate((merged_audio, audio_segments_new[i]))
-
+            position += silence_samples
+        offsets[i] = position
+        position += len(audio_segments_new[i])
         if duration_diff < 0:
-            merged_audio = np.concatenate((merged_audio, silence_compensation))
+            position += silence_samples
 
         if i < len(intervals) - 1:
             next_start_new = int(intervals[i + 1][0] * sr_ratio)
-            silence_duration = next_start_new - end_new
-            if silence_duration > 0:
-                silence = np.zeros(silence_duration, dtype=audio_segments_new[0].dtype)
-                merged_audio = np.concatenate((merged_audio, silence))
+            position += max(0, next_start_new - end_new)
+    return offsets, position
+
 
+def merge_audio(
+    audio_segments_org, audio_segments_new, intervals, sr_orig, sr_new, crossfade_ms=0
+):
+    """
+    Merges audio segments back into a single audio signal, filling gaps with silence.
+    Assumes audio segments are already at sr_new.
+
+    The merged length is computed first and every segment is written into one
+    preallocated array, so merging is linear in the number of segments.
+
+    Parameters:
+    - audio_segments_org (list of np.ndarray): The non-silent audio segments (at sr_orig).
+    - audio_segments_new (list of np.ndarray): The non-silent audio segments (at sr_new).
+    - intervals (np.ndarray): The intervals used for splitting the original audio.
+    - sr_orig (int): The sample rate of the original audio
+    - sr_new (int): The sample rate of the model
+    - crossfade_ms (float): Fade each segment in and out of the surrounding silence
+      over this many milliseconds (at most half the segment) to avoid clicks at
+      segment boundaries (default 0, no fades).
+    Returns:
+    - np.ndarray: The merged audio signal with silent gaps restored.
+    """
+    offsets, length = merge_layout(
+        audio_segments_org, audio_segments_new, intervals, sr_orig, sr_new
+    )
+    dtype = audio_segments_new[0].dtype
+    merged_audio = np.zeros(length, dtype=dtype)
+    fade_length = int(crossfade_ms / 1000 * sr_new)
+    fade_in = fade_curve(fade_length, dtype)
+    for offset, segment in zip(offsets, audio_segments_new):
+        end = offset + len(segment)
+        merged_audio[offset:end] = segment
+        fade = min(fade_length, len(segment) // 2)
+        if fade:
+            ramp = fade_in if fade == fade_length else fade_curve(fade, dtype)
+            merged_audio[offset : offset + fade] *= ramp
+            merged_audio[end - fade : end] *= ramp[::-1]
     return merged_audio
+
+
+def fade_curve(length, dtype=np.float32):
+    """Returns an equal-power (sin^2) fade-in of the given length."""
+    return (np.sin(0.5 * np.pi * np.linspace(0, 1, length)) ** 2).astype(dtype)
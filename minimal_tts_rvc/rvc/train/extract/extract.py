@@ -12,6 +12,14 @@ import json
 
 now_dir = os.getcwd()
 sys.path.append(os.path.join(now_dir))
+# Project root, for the CPU execution profile shared with the API server
+sys.path.append(
+    os.path.dirname(
+        os.path.dirname(
+            os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        )
+    )
+)
 
 # Zluda hijack
 import rvc.lib.zluda
@@ -20,6 +28,7 @@ from rvc.lib.utils import load_audio, load_embedding
 from rvc.train.extract.preparing_files import generate_config, generate_filelist
 from rvc.lib.predictors.RMVPE import RMVPE0Predictor
 from rvc.configs.config import Config
+from minimal_tts_rvc.cpu_profile import apply_cpu_profile, init_cpu_worker
 
 # Load config
 config = Config()
@@ -102,6 +111,7 @@ class FeatureInput:
 
     def process_files(self, files, f0_method, hop_length, device, threads):
         self.device = device
+        apply_cpu_profile(max(1, threads))
         if f0_method == "rmvpe":
             self.model_rmvpe = RMVPE0Predictor(
                 os.path.join("rvc", "models", "predictors", "rmvpe.pt"),
@@ -109,6 +119,7 @@ class FeatureInput:
             )
 
         def worker(file_info):
+            init_cpu_worker()
             self.process_file(file_info, f0_method, hop_length)
 
         with tqdm.tqdm(total=len(files), leave=True) as pbar:
@@ -148,8 +159,10 @@ def process_file_embedding(
     model = load_embedding(embedder_model, embedder_model_custom).to(device).float()
     model.eval()
     n_threads = max(1, n_threads)
+    apply_cpu_profile(n_threads)
 
     def worker(file_info):
+        init_cpu_worker()
         wav_file_path, _, _, out_file_path = file_info
         if os.path.exists(out_file_path):
             return
@@ -0,0 +1,270 @@
+import os
+import time
+from collections import deque
+
+import numpy as np
+import soxr
+import torch
+import torch.nn.functional as F
+
+from minimal_tts_rvc.infer import resolve_index_path
+from minimal_tts_rvc.index_cache import IndexCache
+from minimal_tts_rvc.cpu_profile import inference_slot
+
+SAMPLE_RATE = 16000  # Hz, HuBERT and RMVPE input rate
+WINDOW = 160  # samples per 10 ms feature frame
+
+
+def frames(ms):
+    """Returns a duration in milliseconds as a whole number of 10 ms frames."""
+    return max(0, int(round(ms / 10)))
+
+
+class StreamingConverter:
+    """
+    Converts a live audio stream block by block with a warm VoiceConverter.
+
+    Incoming audio is resampled to 16 kHz and collected into blocks. Each block is
+    appended to a rolling buffer that keeps `context_ms` of past audio, so HuBERT sees
+    the block with its left context. RMVPE only needs a short context, so F0 is
+    estimated on the block plus `f0_context_ms` and kept in a rolling buffer of its
+    own. net_g.infer decodes only the tail of the buffer: the block, a crossfade
+    region and a small SOLA search region. The start of each output block is aligned
+    with the tail of the previous one by SOLA (the offset with the highest
+    normalized cross-correlation within the search region) and crossfaded into it.
+
+    The end-to-end delay is about block + crossfade + search time plus the time a
+    block takes to process, which is recorded per block in `block_stats`.
+
+    Args:
+        converter (VoiceConverter): Converter to run, e.g. checked out of ConverterPool.
+        model_path (str): Path to the voice model; loaded into the converter if needed.
+        index_path (str, optional): Path to the model's index file.
+        sample_rate (int, optional): Sample rate of the incoming audio.
+        block_ms (int, optional): Length of each converted block.
+        context_ms (int, optional): Past audio HuBERT sees in front of each block.
+        crossfade_ms (int, optional): Crossfade between consecutive output blocks.
+        sola_search_ms (int, optional): Range searched for the best crossfade offset.
+        f0_context_ms (int, optional): Past audio RMVPE sees in front of each block.
+        pitch (int, optional): Pitch shift in semitones.
+        index_rate (float, optional): Blending rate for index retrieval.
+        protect (float, optional): Protection of unvoiced consonants (0.5 disables it).
+        sid (int, optional): Speaker ID.
+        embedder_model (str, optional): Name of the HuBERT embedder.
+        embedder_model_custom (str, optional): Path to a custom HuBERT embedder.
+    """
+
+    def __init__(
+        self,
+        converter,
+        model_path,
+        index_path=None,
+        sample_rate=SAMPLE_RATE,
+        block_ms=300,
+        context_ms=1000,
+        crossfade_ms=50,
+        sola_search_ms=10,
+        f0_context_ms=200,
+        pitch=0,
+        index_rate=0.75,
+        protect=0.5,
+        sid=0,
+        embedder_model="contentvec",
+        embedder_model_custom=None,
+    ):
+        if crossfade_ms > block_ms:
+            raise ValueError("crossfade_ms must not be longer than block_ms")
+        converter.get_vc(model_path, sid)
+        if not converter.hubert_model or embedder_model != converter.last_embedder_model:
+            converter.load_hubert(embedder_model, embedder_model_custom)
+            converter.last_embedder_model = embedder_model
+        self.converter = converter
+        self.vc = converter.vc
+        self.net_g = converter.net_g
+        self.hubert_model = converter.hubert_model
+        self.tgt_sr = converter.tgt_sr
+        self.use_f0 = converter.use_f0
+        self.version = converter.version
+        self.device = converter.config.device
+        self.sid = torch.tensor([sid], device=self.device).long()
+        self.pitch = pitch
+        self.index_rate = index_rate
+        self.protect = protect
+
+        self.index = self.big_npy = None
+        file_index = resolve_index_path(index_path)
+        if file_index and os.path.exists(file_index) and index_rate > 0:
+            self.index, self.big_npy = IndexCache().load(file_index)
+
+        self.block_frames = max(1, frames(block_ms))
+        self.crossfade_frames = max(1, frames(crossfade_ms))
+        self.sola_frames = frames(sola_search_ms)
+        self.f0_context_frames = frames(f0_context_ms)
+        self.return_frames = self.block_frames + self.crossfade_frames + self.sola_frames
+        self.total_frames = frames(context_ms) + self.return_frames
+        self.block = self.block_frames * WINDOW
+
+        # Rolling buffers of the last total_frames of input audio and F0
+        self.input_wav = np.zeros(self.total_frames * WINDOW, dtype=np.float32)
+        self.f0 = np.zeros(self.total_frames, dtype=np.float64)
+        self.pending = np.zeros(0, dtype=np.float32)
+        self.resampler = (
+            soxr.ResampleStream(sample_rate, SAMPLE_RATE, 1, dtype="float32")
+            if sample_rate != SAMPLE_RATE
+            else None
+        )
+
+        # SOLA state at the model's sample rate
+        self.tgt_frame = self.tgt_sr // 100
+        crossfade = self.crossfade_frames * self.tgt_frame
+        self.sola_buffer = np.zeros(crossfade, dtype=np.float32)
+        self.fade_in = np.sin(0.5 * np.pi * np.linspace(0, 1, crossfade, dtype=np.float32)) ** 2
+        self.fade_out = 1 - self.fade_in
+
+        self.algorithmic_latency_ms = 10 * self.return_frames
+        self.block_stats = deque(maxlen=200)
+        self.last_block_stats = None
+        self.blocks = 0
+
+    def push(self, audio):
+        """
+        Adds incoming audio and returns the converted blocks it completed, at `tgt_sr`.
+
+        Args:
+            audio (numpy.ndarray): Mono audio at the stream's sample rate.
+        """
+        audio = np.asarray(audio, dtype=np.float32)
+        if self.resampler is not None:
+            audio = self.resampler.resample_chunk(audio)
+        self.pending = np.concatenate([self.pending, audio])
+        outputs = []
+        while self.pending.shape[0] >= self.block:
+            block, self.pending = self.pending[: self.block], self.pending[self.block :]
+            outputs.append(self._process_block(block))
+        return outputs
+
+    def flush(self):
+        """Converts the remaining audio, padded with silence, and the final crossfade tail."""
+        outputs = []
+        if self.resampler is not None:
+            self.pending = np.concatenate(
+                [self.pending, self.resampler.resample_chunk(np.zeros(0, np.float32), last=True)]
+            )
+        if self.pending.shape[0]:
+            remaining = self.pending.shape[0]
+            block = np.zeros(self.block, dtype=np.float32)
+            block[:remaining] = self.pending
+            self.pending = np.zeros(0, dtype=np.float32)
+            # The block's output starts with the previous tail crossfaded in; keep the
+            # converted remainder and one crossfade beyond it, running into the new
+            # tail, and fade that out as below
+            crossfade = self.sola_buffer.shape[0]
+            output = np.concatenate([self._process_block(block), self.sola_buffer])
+            output = output[: remaining * self.tgt_sr // SAMPLE_RATE + crossfade]
+            output[-crossfade:] *= self.fade_out
+            outputs.append(output)
+        else:
+            outputs.append(self.sola_buffer * self.fade_out)
+        return outputs
+
+    def stats(self):
+        """Returns latency statistics over the most recent blocks."""
+        processing = [stat["processing_ms"] for stat in self.block_stats]
+        return {
+            "blocks": self.blocks,
+            "block_ms": 10 * self.block_frames,
+            "algorithmic_latency_ms": self.algorithmic_latency_ms,
+            "processing_ms_mean": float(np.mean(processing)) if processing else None,
+            "processing_ms_p95": float(np.percentile(processing, 95)) if processing else None,
+            "real_time_factor": (
+                float(np.mean(processing)) / (10 * self.block_frames) if processing else None
+            ),
+        }
+
+    def _process_block(self, block):
+        # Each block holds a CPU profile slot, like any other conversion
+        with inference_slot():
+            start = time.perf_counter()
+            self.input_wav[: -self.block] = self.input_wav[self.block :]
+            self.input_wav[-self.block :] = block
+            if self.use_f0:
+                self._update_f0()
+            infer_wav = self._infer()
+            output = self._sola(infer_wav)
+            processing_ms = (time.perf_counter() - start) * 1000
+        self.blocks += 1
+        stat = {
+            "block": self.blocks,
+            "processing_ms": processing_ms,
+            "latency_ms": self.algorithmic_latency_ms + processing_ms,
+        }
+        self.block_stats.append(stat)
+        self.last_block_stats = stat
+        return output
+
+    def _update_f0(self):
+        # RMVPE frame j is centered on sample j * WINDOW of the audio it is given
+        context = self.f0_context_frames * WINDOW
+        f0 = self.vc.model_rmvpe.infer_from_audio(
+            self.input_wav[-(self.block + context) :], thred=0.03
+        )
+        self.f0[: -self.block_frames] = self.f0[self.block_frames :]
+        self.f0[-self.block_frames :] = f0[
+            self.f0_context_frames : self.f0_context_frames + self.block_frames
+        ]
+
+    def _infer(self):
+        p_len = self.total_frames
+        with torch.no_grad():
+            feats = self.vc._extract_features(self.hubert_model, self.input_wav)
+            if self.version == "v1":
+                feats = self.hubert_model.final_proj(feats[0]).unsqueeze(0)
+            feats0 = feats.clone() if self.use_f0 and self.protect < 0.5 else None
+            if self.index is not None:
+                feats = self.vc._retrieve_speaker_embeddings(
+                    feats, self.index, self.big_npy, self.index_rate
+                )
+            feats = F.interpolate(feats.permute(0, 2, 1), scale_factor=2).permute(0, 2, 1)
+            # HuBERT's 400-sample receptive field leaves the last frames out; repeat the final one
+            if feats.shape[1] < p_len:
+                feats = torch.cat(
+                    [feats, feats[:, -1:].expand(-1, p_len - feats.shape[1], -1)], dim=1
+                )
+            feats = feats[:, :p_len]
+
+            pitch = pitchf = None
+            if self.use_f0:
+                f0 = self.f0 * pow(2, self.pitch / 12)
+                pitch = torch.tensor(self.vc.coarse_f0(f0), device=self.device).unsqueeze(0).long()
+                pitchf = torch.tensor(f0, device=self.device).unsqueeze(0).float()
+                if feats0 is not None:
+                    feats0 = F.interpolate(feats0.permute(0, 2, 1), scale_factor=2).permute(0, 2, 1)
+                    if feats0.shape[1] < p_len:
+                        feats0 = torch.cat(
+                            [feats0, feats0[:, -1:].expand(-1, p_len - feats0.shape[1], -1)],
+                            dim=1,
+                        )
+                    feats0 = feats0[:, :p_len]
+                    pitchff = pitchf.clone()
+                    pitchff[pitchf > 0] = 1
+                    pitchff[pitchf < 1] = self.protect
+                    feats = feats * pitchff.unsqueeze(-1) + feats0 * (1 - pitchff.unsqueeze(-1))
+
+            lengths = torch.tensor([p_len], device=self.device).long()
+            rate = torch.tensor([self.return_frames / p_len], device=self.device)
+            audio = self.net_g.infer(feats.float(), lengths, pitch, pitchf, self.sid, rate)[0]
+        audio = audio[0, 0].data.cpu().float().numpy()
+        return audio[-self.return_frames * self.tgt_frame :]
+
+    def _sola(self, infer_wav):
+        crossfade = self.sola_buffer.shape[0]
+        search = self.sola_frames * self.tgt_frame
+        block = self.block_frames * self.tgt_frame
+        head = infer_wav[: crossfade + search]
+        correlation = np.correlate(head, self.sola_buffer, mode="valid")
+        energy = np.convolve(head**2, np.ones(crossfade, dtype=np.float32), mode="valid")
+        offset = int(np.argmax(correlation / np.sqrt(energy + 1e-8)))
+        output = infer_wav[offset : offset + block].copy()
+        output[:crossfade] = output[:crossfade] * self.fade_in + self.sola_buffer * self.fade_out
+        self.sola_buffer = infer_wav[offset + block : offset + block + crossfade].copy()
+        return output
@@ -0,0 +1,269 @@
+import os
+import sys
+import glob
+import json
+import argparse
+
+import torch
+
+from minimal_tts_rvc.algorithm.synthesizers import Synthesizer
+from minimal_tts_rvc.configs.config import Config
+from minimal_tts_rvc.model_package import build_packaged_synthesizer
+
+EXPORT_FORMATS = ("torchscript", "onnx")
+EXPORT_EXTENSIONS = {"torchscript": ".ts", "onnx": ".onnx"}
+
+
+def build_synthesizer(cpt, device="cpu"):
+    """
+    Builds the inference Synthesizer for a loaded checkpoint, with weight norm folded in.
+
+    Args:
+        cpt (dict): Checkpoint loaded from a `.pth` file, or by model_package.load_package.
+        device (str, optional): Device to move the network to.
+    """
+    cpt["config"][-3] = cpt["weight"]["emb_g.weight"].shape[0]
+    if cpt.get("packaged"):
+        # Packaged weights are already folded and become the parameters as they are
+        net_g = build_packaged_synthesizer(cpt)
+    else:
+        version = cpt.get("version", "v1")
+        net_g = Synthesizer(
+            *cpt["config"],
+            use_f0=cpt.get("f0", 1),
+            text_enc_hidden_dim=768 if version == "v2" else 256,
+            vocoder=cpt.get("vocoder", "HiFi-GAN"),
+        )
+        del net_g.enc_q
+        net_g.load_state_dict(cpt["weight"], strict=False)
+        # Inference never updates the weights, so skip recomputing them every forward
+        net_g.remove_weight_norm()
+    net_g = net_g.to(device).float()
+    net_g.eval()
+    return net_g
+
+
+class InferenceGraph(torch.nn.Module):
+    """
+    Synthesizer.infer with the prior noise as an input, for ONNX export.
+
+    ONNX runtimes draw their own random numbers, so the noise added to the prior is
+    passed in to keep that step reproducible; the generator's sine source still
+    draws its own phase and noise.
+    """
+
+    def __init__(self, net_g):
+        super().__init__()
+        self.net_g = net_g
+
+    def forward(self, phone, phone_lengths, pitch, nsff0, sid, noise):
+        net_g = self.net_g
+        g = net_g.emb_g(sid).unsqueeze(-1)
+        m_p, logs_p, x_mask = net_g.enc_p(
+            phone, pitch if net_g.use_f0 else None, phone_lengths
+        )
+        z_p = (m_p + torch.exp(logs_p) * noise * 0.66666) * x_mask
+        z = net_g.flow(z_p, x_mask, g=g, reverse=True)
+        if net_g.use_f0:
+            return net_g.dec(z * x_mask, nsff0, g=g)
+        return net_g.dec(z * x_mask, g=g)
+
+
+def example_inputs(net_g, cpt, frames=200):
+    """
+    Returns `(phone, phone_lengths, pitch, nsff0, sid, noise)` for tracing and parity checks.
+
+    Args:
+        net_g (Synthesizer): The network the inputs are for.
+        cpt (dict): Its checkpoint.
+        frames (int, optional): Number of feature frames.
+    """
+    version = cpt.get("version", "v1")
+    phone = torch.randn(1, frames, 768 if version == "v2" else 256)
+    phone_lengths = torch.tensor([frames]).long()
+    pitch = torch.randint(1, 255, (1, frames)).long()
+    nsff0 = torch.rand(1, frames) * 300 + 80
+    sid = torch.tensor([0]).long()
+    noise = torch.randn(1, cpt["config"][2], frames)
+    return phone, phone_lengths, pitch, nsff0, sid, noise
+
+
+def export_paths(model_path, fmt, export_dir=None):
+    """
+    Returns `(artifact_path, meta_path)` for a model's exported graph.
+
+    Args:
+        model_path (str): Path to the `.pth` file.
+        fmt (str): One of EXPORT_FORMATS.
+        export_dir (str, optional): Defaults to `Config().synth_export_dir`.
+    """
+    export_dir = export_dir or Config().synth_export_dir
+    stem = os.path.splitext(os.path.basename(model_path))[0]
+    artifact_path = os.path.join(export_dir, stem + EXPORT_EXTENSIONS[fmt])
+    return artifact_path, artifact_path + ".json"
+
+
+def export_model(model_path, fmt="torchscript", export_dir=None):
+    """
+    Exports a voice model's inference graph with weight norm folded in.
+
+    TorchScript scripts the whole Synthesizer, so `infer` keeps its signature;
+    ONNX exports InferenceGraph with dynamic batch and frame axes.
+
+    Args:
+        model_path (str): Path to the `.pth` file.
+        fmt (str, optional): One of EXPORT_FORMATS.
+        export_dir (str, optional): Defaults to `Config().synth_export_dir`.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}', expected one of {EXPORT_FORMATS}")
+    cpt = torch.load(model_path, map_location="cpu", weights_only=True)
+    net_g = build_synthesizer(cpt).__prepare_scriptable__()
+    artifact_path, meta_path = export_paths(model_path, fmt, export_dir)
+    os.makedirs(os.path.dirname(artifact_path), exist_ok=True)
+
+    with torch.no_grad():
+        if fmt == "torchscript":
+            torch.jit.save(torch.jit.script(net_g), artifact_path)
+        else:
+            dynamic = {0: "batch", 1: "frames"}
+            torch.onnx.export(
+                InferenceGraph(net_g),
+                example_inputs(net_g, cpt),
+                artifact_path,
+                input_names=["phone", "phone_lengths", "pitch", "nsff0", "sid", "noise"],
+                output_names=["audio"],
+                dynamic_axes={
+                    "phone": dynamic,
+                    "phone_lengths": {0: "batch"},
+                    "pitch": dynamic,
+                    "nsff0": dynamic,
+                    "sid": {0: "batch"},
+                    "noise": {0: "batch", 2: "frames"},
+                    "audio": {0: "batch", 2: "samples"},
+                },
+                opset_version=17,
+            )
+
+    meta = {
+        "format": fmt,
+        "source": os.path.abspath(model_path),
+        "source_mtime": os.path.getmtime(model_path),
+        "tgt_sr": cpt["config"][-1],
+        "inter_channels": cpt["config"][2],
+        "use_f0": cpt.get("f0", 1),
+        "version": cpt.get("version", "v1"),
+        "vocoder": cpt.get("vocoder", "HiFi-GAN"),
+    }
+    with open(meta_path, "w") as f:
+        json.dump(meta, f, indent=2)
+    return artifact_path
+
+
+class ExportedSynthesizer(torch.nn.Module):
+    """
+    Runs an exported inference graph on CPU behind the Synthesizer.infer interface.
+
+    Inputs on another device are moved to the CPU and the audio is moved back, so
+    the pipeline can use it in place of `net_g`. With `rate`, TorchScript decodes only
+    the last frames like Synthesizer.infer; ONNX decodes every frame and trims the audio.
+
+    Args:
+        artifact_path (str): Path written by export_model.
+        meta (dict): The artifact's metadata.
+    """
+
+    def __init__(self, artifact_path, meta):
+        super().__init__()
+        self.format = meta["format"]
+        self.inter_channels = meta["inter_channels"]
+        self.use_f0 = meta["use_f0"]
+        if self.format == "torchscript":
+            self.module = torch.jit.load(artifact_path, map_location="cpu")
+            self.module.eval()
+        else:
+            import onnxruntime
+
+            self.session = onnxruntime.InferenceSession(
+                artifact_path, providers=["CPUExecutionProvider"]
+            )
+            self.input_names = {node.name for node in self.session.get_inputs()}
+
+    def infer(self, phone, phone_lengths, pitch=None, nsff0=None, sid=None, rate=None):
+        device = phone.device
+        args = [
+            tensor.cpu() if tensor is not None else None
+            for tensor in (phone, phone_lengths, pitch, nsff0, sid, rate)
+        ]
+        if self.format == "torchscript":
+            with torch.no_grad():
+                audio = self.module.infer(*args)[0]
+        else:
+            rate = args.pop()
+            noise = torch.randn(phone.shape[0], self.inter_channels, phone.shape[1])
+            names = ["phone", "phone_lengths", "pitch", "nsff0", "sid", "noise"]
+            feed = {
+                name: tensor.numpy()
+                for name, tensor in zip(names, args + [noise])
+                if name in self.input_names and tensor is not None
+            }
+            audio = torch.from_numpy(self.session.run(["audio"], feed)[0])
+            if rate is not None:
+                # InferenceGraph has no rate input: decode every frame and keep the
+                # samples of the last frames, as Synthesizer.infer would return
+                frames = phone.shape[1]
+                head = int(frames * (1.0 - rate.item()))
+                audio = audio[..., head * (audio.shape[-1] // frames) :]
+        return audio.to(device), None, None
+
+
+def load_exported_synthesizer(model_path, runtime, export_dir=None):
+    """
+    Returns an ExportedSynthesizer for a model, or None if no up-to-date artifact exists.
+
+    Args:
+        model_path (str): Path to the `.pth` file.
+        runtime (str): One of EXPORT_FORMATS.
+        export_dir (str, optional): Defaults to `Config().synth_export_dir`.
+    """
+    artifact_path, meta_path = export_paths(model_path, runtime, export_dir)
+    if not (os.path.exists(artifact_path) and os.path.exists(meta_path)):
+        return None
+    with open(meta_path, "r") as f:
+        meta = json.load(f)
+    if meta.get("source_mtime") != os.path.getmtime(model_path):
+        print(f"Exported graph {artifact_path} is older than {model_path}, re-export it")
+        return None
+    return ExportedSynthesizer(artifact_path, meta)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export voice models to TorchScript or ONNX for RVC_SYNTH_RUNTIME"
+    )
+    parser.add_argument(
+        "models",
+        nargs="*",
+        help="Model .pth files (default: every .pth in models/)",
+    )
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="torchscript")
+    parser.add_argument("--output", default=None, help="Export directory")
+    args = parser.parse_args()
+
+    models = args.models
+    if not models:
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        models = sorted(glob.glob(os.path.join(project_root, "models", "*.pth")))
+    failed = 0
+    for model_path in models:
+        try:
+            artifact_path = export_model(model_path, args.format, args.output)
+            print(f"Exported {model_path} -> {artifact_path}")
+        except Exception as error:
+            failed += 1
+            print(f"Failed to export {model_path}: {error}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
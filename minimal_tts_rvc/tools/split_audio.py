@@ -0,0 +1,112 @@
+import numpy as np
+import librosa
+
+
+def process_audio(audio, sr=16000, silence_thresh=-60, min_silence_len=250):
+    """
+    Splits an audio signal into its non-silent segments.
+
+    Parameters:
+    - audio (np.ndarray): The audio signal to split.
+    - sr (int): The sample rate of the input audio (default is 16000).
+    - silence_thresh (int): Silence threshold (default =-60dB)
+    - min_silence_len (int): Minimum silence duration (default 250ms).
+
+    Returns:
+    - list of np.ndarray: A list of audio segments.
+    - np.ndarray: The intervals where the audio was split.
+    """
+    frame_length = int(min_silence_len / 1000 * sr)
+    hop_length = frame_length // 2
+    intervals = librosa.effects.split(
+        audio, top_db=-silence_thresh, frame_length=frame_length, hop_length=hop_length
+    )
+    audio_segments = [audio[start:end] for start, end in intervals]
+
+    return audio_segments, intervals
+
+
+def merge_layout(audio_segments_org, audio_segments_new, intervals, sr_orig, sr_new):
+    """
+    Returns the start of each converted segment in the merged signal and its total length.
+
+    Each segment keeps its original start and the silent gaps between segments are
+    restored. A converted segment shorter than its original is padded with silence
+    after it; one that came out longer is preceded by the difference in silence.
+
+    Parameters: see merge_audio.
+
+    Returns:
+    - np.ndarray: Start offset of each converted segment.
+    - int: Length of the merged signal.
+    """
+    sr_ratio = sr_new / sr_orig
+    offsets = np.zeros(len(intervals), dtype=np.int64)
+    position = 0
+    for i, (start, end) in enumerate(intervals):
+        start_new = int(start * sr_ratio)
+        end_new = int(end * sr_ratio)
+
+        original_duration = len(audio_segments_org[i]) / sr_orig
+        new_duration = len(audio_segments_new[i]) / sr_new
+        duration_diff = new_duration - original_duration
+        silence_samples = int(abs(duration_diff) * sr_new)
+
+        if i == 0 and start_new > 0:
+            position += start_new
+        if duration_diff > 0:
+            position += silence_samples
+        offsets[i] = position
+        position += len(audio_segments_new[i])
+        if duration_diff < 0:
+            position += silence_samples
+
+        if i < len(intervals) - 1:
+            next_start_new = int(intervals[i + 1][0] * sr_ratio)
+            position += max(0, next_start_new - end_new)
+    return offsets, position
+
+
+def merge_audio(
+    audio_segments_org, audio_segments_new, intervals, sr_orig, sr_new, crossfade_ms=0
+):
+    """
+    Merges audio segments back into a single audio signal, filling gaps with silence.
+    Assumes audio segments are already at sr_new.
+
+    The merged length is computed first and every segment is written into one
+    preallocated array, so merging is linear in the number of segments.
+
+    Parameters:
+    - audio_segments_org (list of np.ndarray): The non-silent audio segments (at sr_orig).
+    - audio_segments_new (list of np.ndarray): The non-silent audio segments (at sr_new).
+    - intervals (np.ndarray): The intervals used for splitting the original audio.
+    - sr_orig (int): The sample rate of the original audio
+    - sr_new (int): The sample rate of the model
+    - crossfade_ms (float): Fade each segment in and out of the surrounding silence
+      over this many milliseconds (at most half the segment) to avoid clicks at
+      segment boundaries (default 0, no fades).
+    Returns:
+    - np.ndarray: The merged audio signal with silent gaps restored.
+    """
+    offsets, length = merge_layout(
+        audio_segments_org, audio_segments_new, intervals, sr_orig, sr_new
+    )
+    dtype = audio_segments_new[0].dtype
+    merged_audio = np.zeros(length, dtype=dtype)
+    fade_length = int(crossfade_ms / 1000 * sr_new)
+    fade_in = fade_curve(fade_length, dtype)
+    for offset, segment in zip(offsets, audio_segments_new):
+        end = offset + len(segment)
+        merged_audio[offset:end] = segment
+        fade = min(fade_length, len(segment) // 2)
+        if fade:
+            ramp = fade_in if fade == fade_length else fade_curve(fade, dtype)
+            merged_audio[offset : offset + fade] *= ramp
+            merged_audio[end - fade : end] *= ramp[::-1]
+    return merged_audio
+
+
+def fade_curve(length, dtype=np.float32):
+    """Returns an equal-power (sin^2) fade-in of the given length."""
+    return (np.sin(0.5 * np.pi * np.linspace(0, 1, length)) ** 2).astype(dtype)
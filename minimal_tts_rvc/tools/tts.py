@@ -1,8 +1,14 @@
 import sys
 import asyncio
-import edge_tts
 import os
 
+project_root = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.append(project_root)
+
+from minimal_tts_rvc.tts_backends import get_tts_backend
+
 
 async def main():
     # Parse command line arguments
@@ -11,6 +17,8 @@ async def main():
     voice = str(sys.argv[3])
     rate = int(sys.argv[4])
     output_file = str(sys.argv[5])
+    # Optional: "edge" (default), "espeak" or "synthetic"
+    backend = str(sys.argv[6]) if len(sys.argv) > 6 else "edge"
 
     rates = f"+{rate}%" if rate >= 0 else f"{rate}%"
     if tts_file and os.path.exists(tts_file):
@@ -21,7 +29,9 @@ async def main():
         except UnicodeDecodeError:
             with open(tts_file, "r") as file:
                 text = file.read()
-    await edge_tts.Communicate(text, voice, rate=rates).save(output_file)
+    audio = await get_tts_backend(backend).synthesize(text, voice, rates)
+    with open(output_file, "wb") as file:
+        file.write(audio)
     # print(f"TTS with {voice} completed. Output TTS file: '{output_file}'")
 
 
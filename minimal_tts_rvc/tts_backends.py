@@ -0,0 +1,242 @@
+import io
+import re
+import shutil
+import asyncio
+import hashlib
+import threading
+
+import edge_tts
+import numpy as np
+import soundfile as sf
+
+from minimal_tts_rvc.configs.config import Config
+
+
+def parse_rate(rate):
+    """
+    Returns an edge-tts style rate such as "+10%" or "-5%" as a speed factor.
+
+    Args:
+        rate (str): Speaking rate relative to normal speed.
+    """
+    match = re.fullmatch(r"\s*([+-]?\d+(?:\.\d+)?)%\s*", rate or "+0%")
+    if match is None:
+        raise ValueError(f"Invalid TTS rate '{rate}', expected e.g. '+10%'")
+    return max(0.1, 1 + float(match.group(1)) / 100)
+
+
+class TTSBackend:
+    """
+    Base class for TTS engines.
+
+    Subclasses implement `_synthesize`. Calls through `synthesize` are limited to
+    `max_concurrency` at a time per backend across all threads and event loops in
+    the process, and fail with TimeoutError if a free slot or the engine itself takes
+    longer than `timeout` seconds.
+
+    Args:
+        max_concurrency (int): Requests allowed to run at once.
+        timeout (float): Seconds to wait for a slot and, separately, for the engine.
+    """
+
+    name = None
+    ext = "wav"  # format of the encoded audio returned by synthesize
+
+    def __init__(self, max_concurrency, timeout):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrency))
+
+    async def synthesize(self, text, voice, rate="+0%"):
+        """
+        Returns the encoded audio for text.
+
+        Args:
+            text (str): Text to speak.
+            voice (str): Voice name understood by the backend.
+            rate (str, optional): Speaking rate relative to normal speed, e.g. "+10%".
+        """
+        acquired = await self._acquire_slot()
+        if not acquired:
+            raise TimeoutError(
+                f"TTS backend '{self.name}' busy for {self.timeout}s "
+                f"({self.max_concurrency} requests in flight)"
+            )
+        try:
+            return await asyncio.wait_for(
+                self._synthesize(text, voice, rate), self.timeout
+            )
+        except asyncio.TimeoutError:
+            raise TimeoutError(
+                f"TTS backend '{self.name}' timed out after {self.timeout}s"
+            ) from None
+        finally:
+            self._slots.release()
+
+    async def _acquire_slot(self):
+        # The slot is taken on a worker thread so the loop keeps running; if the
+        # waiting task is cancelled, a slot the thread has taken or takes later is
+        # given back instead of leaking.
+        lock = threading.Lock()
+        state = {"acquired": False, "abandoned": False}
+
+        def acquire():
+            acquired = self._slots.acquire(True, self.timeout)
+            with lock:
+                if acquired and state["abandoned"]:
+                    self._slots.release()
+                    return False
+                state["acquired"] = acquired
+                return acquired
+
+        try:
+            return await asyncio.to_thread(acquire)
+        except asyncio.CancelledError:
+            with lock:
+                state["abandoned"] = True
+                if state["acquired"]:
+                    self._slots.release()
+            raise
+
+    async def _synthesize(self, text, voice, rate):
+        raise NotImplementedError
+
+
+class EdgeTTSBackend(TTSBackend):
+    """Microsoft Edge online TTS through edge-tts; returns MP3."""
+
+    name = "edge"
+    ext = "mp3"
+
+    async def _synthesize(self, text, voice, rate):
+        # Add a small delay to avoid rate limiting
+        await asyncio.sleep(0.1)
+        audio = bytearray()
+        async for chunk in edge_tts.Communicate(text, voice, rate=rate).stream():
+            if chunk["type"] == "audio":
+                audio.extend(chunk["data"])
+        return bytes(audio)
+
+
+class EspeakTTSBackend(TTSBackend):
+    """
+    Local TTS through the espeak-ng (or espeak) command line tool; returns WAV.
+
+    Edge voice names such as "en-US-GuyNeural" are mapped to their language code.
+    """
+
+    name = "espeak"
+    ext = "wav"
+
+    @staticmethod
+    def espeak_voice(voice):
+        if voice.endswith("Neural"):
+            return voice.split("-")[0].lower()
+        return voice
+
+    async def _synthesize(self, text, voice, rate):
+        executable = shutil.which("espeak-ng") or shutil.which("espeak")
+        if executable is None:
+            raise RuntimeError("espeak-ng is not installed")
+        process = await asyncio.create_subprocess_exec(
+            executable,
+            "-v",
+            self.espeak_voice(voice),
+            "-s",
+            str(int(175 * parse_rate(rate))),
+            "--stdout",
+            text,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await process.communicate()
+        except asyncio.CancelledError:
+            process.kill()
+            raise
+        if process.returncode != 0:
+            raise RuntimeError(
+                f"espeak failed: {stderr.decode('utf-8', 'replace').strip()}"
+            )
+        return stdout
+
+
+class SyntheticTTSBackend(TTSBackend):
+    """
+    A deterministic offline stand-in for TTS; returns WAV.
+
+    Each character becomes a short voiced or silent frame whose pitch and formants
+    are derived from a hash of the voice and the character, so the same input always
+    gives the same audio. It is not speech, but it exercises F0 estimation, HuBERT
+    and the generators like real TTS output does, which is enough for load tests
+    and CI without network access.
+    """
+
+    name = "synthetic"
+    ext = "wav"
+    sample_rate = 24000
+    char_seconds = 0.07
+
+    async def _synthesize(self, text, voice, rate):
+        return await asyncio.to_thread(self.render, text, voice, rate)
+
+    def render(self, text, voice, rate="+0%"):
+        """Synchronously renders text to WAV bytes."""
+        voice_seed = int.from_bytes(hashlib.sha1(voice.encode("utf-8")).digest()[:4], "little")
+        base_f0 = 95 + voice_seed % 120
+        frame = max(1, int(self.sample_rate * self.char_seconds / parse_rate(rate)))
+        t = np.arange(frame) / self.sample_rate
+        envelope = np.sin(np.pi * np.arange(frame) / frame) ** 2
+        frames = []
+        for char in text:
+            if char.isspace() or not char.isalnum():
+                frames.append(np.zeros(frame))
+                continue
+            char_seed = voice_seed ^ ord(char)
+            f0 = base_f0 * (1 + ((char_seed >> 3) % 13 - 6) / 50)
+            formant = 500 + (char_seed % 7) * 250
+            harmonics = np.arange(1, int(4000 // f0) + 1)
+            weights = np.exp(-((harmonics * f0 - formant) ** 2) / (2 * 400.0**2)) / harmonics
+            wave = np.sin(2 * np.pi * f0 * t[:, None] * harmonics[None, :]) @ weights
+            frames.append(wave * envelope)
+        audio = np.concatenate(frames) if frames else np.zeros(frame)
+        peak = np.abs(audio).max()
+        if peak > 0:
+            audio = 0.5 * audio / peak
+        buffer = io.BytesIO()
+        sf.write(buffer, audio.astype(np.float32), self.sample_rate, format="WAV")
+        return buffer.getvalue()
+
+
+BACKEND_CLASSES = {
+    backend.name: backend
+    for backend in (EdgeTTSBackend, EspeakTTSBackend, SyntheticTTSBackend)
+}
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def get_tts_backend(name="edge"):
+    """
+    Returns the process-wide instance of a TTS backend.
+
+    Limits come from `Config().tts_edge_*` for edge-tts and `Config().tts_local_*`
+    for the local engines.
+
+    Args:
+        name (str, optional): One of BACKEND_CLASSES.
+    """
+    if name not in BACKEND_CLASSES:
+        raise ValueError(
+            f"Unknown TTS backend '{name}', expected one of {sorted(BACKEND_CLASSES)}"
+        )
+    with _backends_lock:
+        if name not in _backends:
+            config = Config()
+            if name == "edge":
+                limits = (config.tts_edge_concurrency, config.tts_edge_timeout)
+            else:
+                limits = (config.tts_local_concurrency, config.tts_local_timeout)
+            _backends[name] = BACKEND_CLASSES[name](*limits)
+        return _backends[name]
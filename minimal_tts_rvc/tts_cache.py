@@ -0,0 +1,48 @@
+import re
+import hashlib
+import unicodedata
+
+from minimal_tts_rvc.configs.config import Config, singleton
+from minimal_tts_rvc.result_cache import DiskCache
+
+
+def normalize_tts_text(text):
+    """
+    Returns text in the form used for TTS cache keys: NFC-normalized with whitespace collapsed.
+
+    Args:
+        text (str): Text sent to TTS.
+    """
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+
+def tts_cache_key(text, voice, rate="+0%", backend="edge"):
+    """
+    Returns the cache key for a TTS request.
+
+    Args:
+        text (str): Text sent to TTS.
+        voice (str): TTS voice name.
+        rate (str, optional): Speaking rate passed to the backend.
+        backend (str, optional): Name of the TTS backend.
+    """
+    payload = f"{backend}\n{voice}\n{rate}\n{normalize_tts_text(text)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@singleton
+class TTSCache(DiskCache):
+    """
+    The on-disk cache of encoded TTS audio, keyed by tts_cache_key.
+
+    Args:
+        cache_dir (str, optional): Directory for cached files. Defaults to `Config().tts_cache_dir`.
+        max_bytes (int, optional): Size budget. Defaults to `Config().tts_cache_mb`.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        config = Config()
+        super().__init__(
+            cache_dir or config.tts_cache_dir,
+            max_bytes if max_bytes is not None else config.tts_cache_mb * 1024**2,
+        )
@@ -1,8 +1,21 @@
+import io
 import os
+import re
 import sys
+import shutil
+import uuid
+import time
 import asyncio
-import edge_tts
-from minimal_tts_rvc.infer import VoiceConverter
+import numpy as np
+import soundfile as sf
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from minimal_tts_rvc.result_cache import ResultCache, result_cache_key
+from minimal_tts_rvc.tts_cache import TTSCache, tts_cache_key
+from minimal_tts_rvc.configs.config import Config
+
+# The inference stack (torch, transformers, faiss, librosa) and edge-tts are imported
+# where they are first used, so importing this module (and main.py) stays fast
 
 # Get the directory where this file is located and construct absolute paths
 import os
@@ -10,6 +23,8 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(current_dir)  # Go up one level to project root
 models_dir = os.path.join(project_root, "models")
 
+# Each entry may also set "tts" (TTS backend: edge, espeak or synthetic; default edge)
+# and "rate" (speaking rate such as "+10%")
 MODELS = {
     "obama": {
         "pth": os.path.join(models_dir, "obama.pth"),
@@ -55,81 +70,454 @@ MODELS = {
     }
 }
 
-def synthesize_tts(text, voice, tts_wav):
-    async def run_tts():
+# Voice models converted at the same time by tts_rvc_multi_pipeline
+MULTI_CONVERT_WORKERS = int(os.getenv("MULTI_CONVERT_WORKERS", "4"))
+
+# RVC conversion parameters shared by every model
+RVC_PARAMS = {
+    "embedder_model": "contentvec",
+    "f0_method": "rmvpe",
+    "sid": 0,
+    "pitch": -8,
+    "clean_audio": True,
+    "clean_strength": 0.5,
+    "volume_envelope": 1.0,
+    "hop_length": 128,
+    "protect": 0.8,
+    "index_rate": 0.75,
+}
+
+# Characters of text per TTS request in long-form synthesis
+LONG_FORM_TTS_CHARS = int(os.getenv("LONG_FORM_TTS_CHARS", "2000"))
+
+# Speaking rate passed to TTS unless a MODELS entry sets its own "rate"
+DEFAULT_TTS_RATE = "+0%"
+
+def model_tts_settings(model):
+    """Return (voice, rate, backend) for a MODELS entry; TTS_BACKEND overrides every model's "tts" backend"""
+    backend = Config().tts_backend or model.get("tts", "edge")
+    return model["voice"], model.get("rate", DEFAULT_TTS_RATE), backend
+
+async def fetch_tts_audio_cached(text, voice, rate=DEFAULT_TTS_RATE, backend="edge"):
+    """Return TTS audio from the TTS cache, running the backend and storing it on a miss"""
+    from minimal_tts_rvc.tts_backends import get_tts_backend
+    
+    tts_backend = get_tts_backend(backend)
+    tts_cache = TTSCache()
+    cache_key = tts_cache_key(text, voice, rate, backend)
+    cached_path = tts_cache.get(cache_key, ext=tts_backend.ext)
+    if cached_path is not None:
         try:
-            # Add a small delay to avoid rate limiting
-            await asyncio.sleep(0.1)
-            communicate = edge_tts.Communicate(text, voice)
-            await communicate.save(tts_wav)
-            print(f"[SUCCESS] TTS file saved to: {tts_wav}")
-        except Exception as e:
-            print(f"[ERROR] TTS synthesis failed for voice '{voice}': {e}")
-            # Try with a fallback voice if the original fails
-            fallback_voice = "en-US-GuyNeural"
-            if voice != fallback_voice:
-                print(f"[INFO] Trying fallback voice: {fallback_voice}")
-                try:
-                    communicate = edge_tts.Communicate(text, fallback_voice)
-                    await communicate.save(tts_wav)
-                    print(f"[SUCCESS] TTS file saved with fallback voice: {tts_wav}")
-                except Exception as e2:
-                    print(f"[ERROR] Fallback voice also failed: {e2}")
-                    raise e2
-            else:
-                raise e
-    asyncio.run(run_tts())
-
-def tts_rvc_pipeline(text, model_choice, output_dir="output"):
+            with open(cached_path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            pass  # evicted by another worker in the meantime
+    
+    audio = await tts_backend.synthesize(text, voice, rate)
+    if audio:
+        tts_cache.put(cache_key, audio, ext=tts_backend.ext)
+    return audio
+
+async def fetch_tts_audio(text, voice, rate=DEFAULT_TTS_RATE, backend="edge"):
+    """Return the encoded TTS audio for text, retrying edge-tts once with a fallback voice"""
+    try:
+        return await fetch_tts_audio_cached(text, voice, rate, backend)
+    except Exception as e:
+        print(f"[ERROR] TTS synthesis failed for voice '{voice}': {e}")
+        # Try with a fallback voice if the original fails
+        fallback_voice = "en-US-GuyNeural"
+        if backend == "edge" and voice != fallback_voice:
+            print(f"[INFO] Trying fallback voice: {fallback_voice}")
+            try:
+                audio = await fetch_tts_audio_cached(text, fallback_voice, rate, backend)
+                print(f"[SUCCESS] TTS synthesized with fallback voice: {fallback_voice}")
+                return audio
+            except Exception as e2:
+                print(f"[ERROR] Fallback voice also failed: {e2}")
+                raise e2
+        else:
+            raise e
+
+def synthesize_tts(text, voice, tts_wav, rate=DEFAULT_TTS_RATE, backend="edge"):
+    """Synthesize text and save the encoded audio to tts_wav"""
+    audio = asyncio.run(fetch_tts_audio(text, voice, rate, backend))
+    with open(tts_wav, "wb") as f:
+        f.write(audio)
+    print(f"[SUCCESS] TTS file saved to: {tts_wav}")
+
+def decode_tts_audio(encoded, voice):
+    """Decode encoded TTS audio in memory to (audio, sample_rate)"""
+    if not encoded:
+        raise RuntimeError(f"TTS returned no audio for voice '{voice}'")
+    audio, sample_rate = sf.read(io.BytesIO(encoded), dtype="float32")
+    return audio, sample_rate
+
+def encode_audio(audio, sample_rate, export_format="MP3"):
+    """Encode converted audio with VoiceConverter.encode_audio"""
+    from minimal_tts_rvc.infer import VoiceConverter
+    
+    return VoiceConverter.encode_audio(audio, sample_rate, export_format)
+
+def synthesize_tts_audio(text, voice, rate=DEFAULT_TTS_RATE, backend="edge"):
+    """Synthesize text and decode it in memory to (audio, sample_rate).
+    
+    Runs its own event loop, so it must not be called from async code; await
+    fetch_tts_audio there instead.
+    """
+    return decode_tts_audio(asyncio.run(fetch_tts_audio(text, voice, rate, backend)), voice)
+
+def check_model_files(model):
+    """Raise FileNotFoundError if a model's weights or index are missing"""
+    if not os.path.exists(model["pth"]):
+        raise FileNotFoundError(f"Model file not found: {model['pth']}")
+    if model["index"] and not os.path.exists(model["index"]):
+        raise FileNotFoundError(f"Index file not found: {model['index']}")
+
+def convert_tts_audio(model_choice, audio, sample_rate):
+    """Run RVC on in-memory TTS audio with the warm converter; returns (audio, sample_rate)"""
+    from minimal_tts_rvc.converter_pool import ConverterPool
+    
+    model = MODELS[model_choice]
+    print(f"[INFO] Running RVC voice conversion with model: {model['pth']} and index: {model['index']}...")
+    with ConverterPool().checkout(model_choice, model["pth"], model["index"]) as vc:
+        return vc.convert_audio_array(
+            audio,
+            sample_rate,
+            model_path=model["pth"],
+            index_path=model["index"],
+            **RVC_PARAMS,
+        )
+
+def warm_up_model(model_choice, seconds=1.0):
+    """Load a model into the converter pool and run one short dummy conversion through it.
+    
+    The conversion runs every stage a request does (HuBERT and RMVPE are loaded on
+    first use), so allocators and kernels are warm when the first real request
+    arrives. Returns the load, conversion and total time in seconds.
+    """
+    from minimal_tts_rvc.converter_pool import ConverterPool
+    
+    model = MODELS[model_choice]
+    check_model_files(model)
+    # A voiced 150 Hz tone with two overtones, so F0 estimation finds pitch throughout
+    t = np.arange(int(seconds * 16000)) / 16000
+    audio = sum(0.3 / k * np.sin(2 * np.pi * 150 * k * t) for k in range(1, 4)).astype(np.float32)
+    start = time.perf_counter()
+    with ConverterPool().checkout(model_choice, model["pth"], model["index"]) as vc:
+        loaded = time.perf_counter()
+        vc.convert_audio_array(
+            audio,
+            16000,
+            model_path=model["pth"],
+            index_path=model["index"],
+            **RVC_PARAMS,
+        )
+    done = time.perf_counter()
+    return {
+        "load_seconds": round(loaded - start, 3),
+        "convert_seconds": round(done - loaded, 3),
+        "total_seconds": round(done - start, 3),
+    }
+
+@contextmanager
+def rvc_stream_converter(model_choice, sample_rate, **options):
+    """Yield a StreamingConverter on the model's warm converter, held for the whole stream"""
+    from minimal_tts_rvc.converter_pool import ConverterPool
+    from minimal_tts_rvc.streaming import StreamingConverter
+    
+    model = MODELS[model_choice]
+    params = {
+        key: RVC_PARAMS[key]
+        for key in ("embedder_model", "sid", "pitch", "protect", "index_rate")
+    }
+    params.update(options)
+    with ConverterPool().checkout(model_choice, model["pth"], model["index"]) as vc:
+        yield StreamingConverter(
+            vc, model["pth"], model["index"], sample_rate=sample_rate, **params
+        )
+
+def synthesis_cache_key(text, model_choice, export_format="MP3"):
+    """Content hash of everything that determines the synthesized audio"""
+    model = MODELS[model_choice]
+    voice, rate, backend = model_tts_settings(model)
+    config = Config()
+    params = dict(RVC_PARAMS)
+    params.update({
+        "voice": voice,
+        "rate": rate,
+        "tts_backend": backend,
+        "pth": model["pth"],
+        "pth_mtime": os.path.getmtime(model["pth"]),
+        "index": model["index"],
+        "index_mtime": os.path.getmtime(model["index"]) if model["index"] else None,
+        "export_format": export_format,
+        # Runtime settings that change the converted audio
+        "synth_runtime": config.synth_runtime,
+        "hubert_quant": config.hubert_quant,
+        "synth_quant": config.synth_quant,
+        "segment_batch_size": config.segment_batch_size,
+    })
+    return result_cache_key(text, model_choice, params)
+
+def tts_rvc_audio(text, model_choice, export_format="MP3"):
+    """Run TTS and RVC fully in memory and return the encoded audio bytes"""
+    model = MODELS[model_choice]
+    print(f"[INFO] Synthesizing TTS with voice: {model['voice']} ({model['desc']})...")
+    audio, sample_rate = synthesize_tts_audio(text, *model_tts_settings(model))
+    audio_opt, tgt_sr = convert_tts_audio(model_choice, audio, sample_rate)
+    return encode_audio(audio_opt, tgt_sr, export_format)
+
+def rvc_encoded_tts(model_choice, encoded_tts, export_format="MP3"):
+    """Decode TTS audio, convert it with the model and return the encoded result (CPU/torch only)"""
+    audio, sample_rate = decode_tts_audio(encoded_tts, MODELS[model_choice]["voice"])
+    audio_opt, tgt_sr = convert_tts_audio(model_choice, audio, sample_rate)
+    return encode_audio(audio_opt, tgt_sr, export_format)
+
+def copy_cached_result(cached_path, rvc_wav):
+    """Copy a cached result to rvc_wav; False if it was evicted in the meantime"""
+    try:
+        shutil.copyfile(cached_path, rvc_wav)
+        return True
+    except FileNotFoundError:
+        return False
+
+def save_result(encoded, rvc_wav, cache_key=None):
+    """Write the encoded result to rvc_wav and store it in the result cache"""
+    with open(rvc_wav, "wb") as f:
+        f.write(encoded)
+    if cache_key is not None:
+        ResultCache().put(cache_key, encoded, ext="mp3")
+    print(f"[SUCCESS] Output written to {rvc_wav}")
+
+def tts_rvc_pipeline(text, model_choice, output_dir="output", request_id=None, use_cache=True, output_path=None):
+    """Synthesize text in the model's voice and write the MP3 once, to output_path if given"""
     try:
         os.makedirs(output_dir, exist_ok=True)
         model = MODELS[model_choice]
-        tts_wav = os.path.join(output_dir, f"{model_choice}_tts.wav")
-        rvc_wav = os.path.join(output_dir, f"{model_choice}_rvc.mp3")
+        # Concurrent requests for the same model need their own output files
+        prefix = f"{model_choice}_{request_id}" if request_id else model_choice
+        rvc_wav = output_path or os.path.join(output_dir, f"{prefix}_rvc.mp3")
         
-        # Check if model files exist
-        if not os.path.exists(model["pth"]):
-            raise FileNotFoundError(f"Model file not found: {model['pth']}")
-        if model["index"] and not os.path.exists(model["index"]):
-            raise FileNotFoundError(f"Index file not found: {model['index']}")
+        check_model_files(model)
         
-        print(f"[INFO] Synthesizing TTS with voice: {model['voice']} ({model['desc']})...")
-        synthesize_tts(text, model["voice"], tts_wav)
+        if use_cache:
+            cache_key = synthesis_cache_key(text, model_choice)
+            cached_path = ResultCache().get(cache_key)
+            if cached_path is not None and copy_cached_result(cached_path, rvc_wav):
+                print(f"[SUCCESS] Result cache hit, output written to {rvc_wav}")
+                return rvc_wav
         
-        # Check if TTS file was created
-        if not os.path.exists(tts_wav):
-            raise FileNotFoundError(f"TTS file was not created: {tts_wav}")
+        encoded = tts_rvc_audio(text, model_choice)
+        save_result(encoded, rvc_wav, cache_key if use_cache else None)
+        return rvc_wav
         
-        print(f"[INFO] Running RVC voice conversion with model: {model['pth']} and index: {model['index']}...")
-        vc = VoiceConverter()
-        vc.convert_audio(
-            audio_input_path=tts_wav,
-            audio_output_path=rvc_wav,
-            model_path=model["pth"],
-            index_path=model["index"],
-            embedder_model="contentvec",
-            f0_method="rmvpe",
-            export_format="MP3",
-            sid=0,
-            pitch=-8,
-            clean_audio=True,
-            clean_strength=0.5,
-            volume_envelope=1.0,
-            hop_length=128,
-            protect=0.8,
-        )
+    except Exception as e:
+        print(f"[ERROR] Pipeline failed: {e}")
+        raise e
+
+async def tts_rvc_pipeline_async(text, model_choice, output_dir="output", request_id=None, use_cache=True, output_path=None, executor=None):
+    """Async tts_rvc_pipeline for callers already running an event loop.
+    
+    TTS is awaited on the caller's loop, so many requests can wait on the
+    network at once; only decoding, RVC inference and writing the result run
+    in executor (the loop's default executor if None).
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        model = MODELS[model_choice]
+        prefix = f"{model_choice}_{request_id}" if request_id else model_choice
+        rvc_wav = output_path or os.path.join(output_dir, f"{prefix}_rvc.mp3")
+        
+        check_model_files(model)
+        
+        cache_key = None
+        if use_cache:
+            cache_key = synthesis_cache_key(text, model_choice)
+            cached_path = ResultCache().get(cache_key)
+            if cached_path is not None and await loop.run_in_executor(
+                executor, copy_cached_result, cached_path, rvc_wav
+            ):
+                print(f"[SUCCESS] Result cache hit, output written to {rvc_wav}")
+                return rvc_wav
+        
+        print(f"[INFO] Synthesizing TTS with voice: {model['voice']} ({model['desc']})...")
+        encoded_tts = await fetch_tts_audio(text, *model_tts_settings(model))
         
-        # Check if RVC file was created
-        if not os.path.exists(rvc_wav):
-            raise FileNotFoundError(f"RVC file was not created: {rvc_wav}")
+        def convert_and_save():
+            save_result(rvc_encoded_tts(model_choice, encoded_tts), rvc_wav, cache_key)
         
-        print(f"[SUCCESS] Output written to {rvc_wav}")
+        await loop.run_in_executor(executor, convert_and_save)
         return rvc_wav
         
     except Exception as e:
         print(f"[ERROR] Pipeline failed: {e}")
         raise e
 
+def tts_rvc_multi_pipeline(texts, output_dir="output", use_cache=True):
+    """Synthesize several voices at once; texts maps model name to the text to speak.
+    
+    Models sharing a TTS voice, rate, backend and text get a single TTS call. Within such a
+    group the first model is converted on its own so F0 and HuBERT features land in
+    their caches, then the remaining models are converted concurrently and reuse them.
+    Returns a dict mapping model name to the written MP3 path.
+    """
+    from minimal_tts_rvc.utils import prepare_audio_infer
+    
+    os.makedirs(output_dir, exist_ok=True)
+    outputs, cache_keys, groups = {}, {}, {}
+    for model_choice, text in texts.items():
+        model = MODELS[model_choice]
+        check_model_files(model)
+        unique_id = uuid.uuid4().hex[:8]
+        outputs[model_choice] = os.path.join(output_dir, f"{model_choice}_{unique_id}_rvc.mp3")
+        if use_cache:
+            cache_keys[model_choice] = synthesis_cache_key(text, model_choice)
+            cached_path = ResultCache().get(cache_keys[model_choice])
+            if cached_path is not None and copy_cached_result(cached_path, outputs[model_choice]):
+                print(f"[SUCCESS] Result cache hit for {model_choice}, output written to {outputs[model_choice]}")
+                continue
+        groups.setdefault((*model_tts_settings(model), text), []).append(model_choice)
+    
+    def convert_and_save(model_choice, audio):
+        audio_opt, tgt_sr = convert_tts_audio(model_choice, audio, 16000)
+        encoded = encode_audio(audio_opt, tgt_sr, "MP3")
+        with open(outputs[model_choice], "wb") as f:
+            f.write(encoded)
+        if use_cache:
+            ResultCache().put(cache_keys[model_choice], encoded, ext="mp3")
+        print(f"[SUCCESS] Output written to {outputs[model_choice]}")
+    
+    with ThreadPoolExecutor(max_workers=max(1, MULTI_CONVERT_WORKERS)) as executor:
+        tts_jobs = {
+            group: executor.submit(synthesize_tts_audio, group[3], *group[:3])
+            for group in groups
+        }
+        pending = []
+        for group, model_choices in groups.items():
+            print(f"[INFO] TTS voice {group[0]} shared by: {', '.join(model_choices)}")
+            audio, sample_rate = tts_jobs[group].result()
+            # Resample once per group; every model then hashes the same array
+            audio = prepare_audio_infer(audio, sample_rate, 16000)
+            convert_and_save(model_choices[0], audio)
+            pending.extend(
+                executor.submit(convert_and_save, model_choice, audio)
+                for model_choice in model_choices[1:]
+            )
+        for future in pending:
+            future.result()
+    
+    return outputs
+
+def split_sentences(text):
+    """Split text into sentences on terminal punctuation, keeping the punctuation"""
+    sentences = re.split(r"(?<=[.!?])\s+|(?<=[\u3002\uff01\uff1f])\s*", text.strip())
+    return [sentence.strip() for sentence in sentences if sentence.strip()]
+
+def tts_rvc_stream(text, model_choice, export_format="MP3"):
+    """Yield encoded audio one sentence at a time, without touching the disk.
+    
+    TTS for sentence N+1 runs in a background thread while RVC converts
+    sentence N, so the first chunk only waits for the first sentence.
+    """
+    model = MODELS[model_choice]
+    check_model_files(model)
+    sentences = split_sentences(text)
+    tts_settings = model_tts_settings(model)
+    
+    with ThreadPoolExecutor(max_workers=1) as tts_executor:
+        pending = tts_executor.submit(synthesize_tts_audio, sentences[0], *tts_settings) if sentences else None
+        for i, sentence in enumerate(sentences):
+            audio, sample_rate = pending.result()
+            if i + 1 < len(sentences):
+                pending = tts_executor.submit(synthesize_tts_audio, sentences[i + 1], *tts_settings)
+            
+            audio_opt, tgt_sr = convert_tts_audio(model_choice, audio, sample_rate)
+            print(f"[INFO] Streamed sentence {i + 1}/{len(sentences)}")
+            yield encode_audio(audio_opt, tgt_sr, export_format)
+
+def split_long_text(text, max_chars=LONG_FORM_TTS_CHARS):
+    """Group sentences into pieces of at most max_chars (longer sentences stay whole)"""
+    pieces, current = [], ""
+    for sentence in split_sentences(text):
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+async def fetch_long_tts_audio(pieces, voice, rate=DEFAULT_TTS_RATE, backend="edge"):
+    """Fetch TTS for every piece at once (bounded by the backend's limit) and join them"""
+    import librosa
+    
+    encoded = await asyncio.gather(
+        *(fetch_tts_audio_cached(piece, voice, rate, backend) for piece in pieces)
+    )
+    decoded = [decode_tts_audio(audio, voice) for audio in encoded]
+    sample_rate = decoded[0][1]
+    audio = np.concatenate([
+        chunk if sr == sample_rate else librosa.resample(chunk, orig_sr=sr, target_sr=sample_rate)
+        for chunk, sr in decoded
+    ])
+    return audio, sample_rate
+
+def tts_rvc_long_pipeline(text, model_choice, output_path, progress=None, export_format="MP3"):
+    """Long-form synthesis of a whole document into output_path.
+    
+    The text is sent to TTS in pieces of up to LONG_FORM_TTS_CHARS, fetched
+    concurrently. The joined speech is split on silence and its chunks are
+    converted in parallel on the model's warm converter (RVC_LONG_FORM_WORKERS),
+    calling progress(done, total) after each chunk. Must not be called on a
+    running event loop.
+    """
+    from minimal_tts_rvc.converter_pool import ConverterPool
+    
+    model = MODELS[model_choice]
+    check_model_files(model)
+    pieces = split_long_text(text)
+    if not pieces:
+        raise ValueError("Text must not be empty.")
+    print(f"[INFO] Long-form synthesis of {len(text)} characters in {len(pieces)} TTS pieces...")
+    audio, sample_rate = asyncio.run(fetch_long_tts_audio(pieces, *model_tts_settings(model)))
+    with ConverterPool().checkout(model_choice, model["pth"], model["index"]) as vc:
+        audio_opt, tgt_sr = vc.convert_audio_array(
+            audio,
+            sample_rate,
+            model_path=model["pth"],
+            index_path=model["index"],
+            split_audio=True,
+            progress=progress,
+            **RVC_PARAMS,
+        )
+    with open(output_path, "wb") as f:
+        f.write(encode_audio(audio_opt, tgt_sr, export_format))
+    print(f"[SUCCESS] Long-form output ({len(audio_opt) / tgt_sr:.1f} s) written to {output_path}")
+    return output_path
+
+def load_prewarm_phrases(path):
+    """Read one phrase per line from path, skipping blank lines and # comments"""
+    with open(path, "r", encoding="utf-8") as f:
+        lines = [line.strip() for line in f]
+    return [line for line in lines if line and not line.startswith("#")]
+
+async def prewarm_tts_cache(phrases, max_concurrency=4):
+    """Fill the TTS cache with phrases in every distinct voice/rate/backend used by MODELS"""
+    voices = {model_tts_settings(model) for model in MODELS.values()}
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def warm(phrase, voice, rate, backend):
+        async with semaphore:
+            try:
+                await fetch_tts_audio_cached(phrase, voice, rate, backend)
+            except Exception as e:
+                print(f"[WARNING] TTS prewarm failed for voice '{voice}': {e}")
+    
+    await asyncio.gather(*(warm(phrase, *settings) for phrase in phrases for settings in voices))
+    print(f"[INFO] TTS cache prewarmed with {len(phrases)} phrases in {len(voices)} voices")
+
 def list_models():
     """Return available models for API"""
     return MODELS
@@ -151,6 +539,8 @@ def validate_models():
 async def test_tts_voice(voice, test_text="Hello"):
     """Test if a TTS voice works"""
     try:
+        import edge_tts
+        
         communicate = edge_tts.Communicate(test_text, voice)
         # Just test if we can create the communicate object
         return True
@@ -57,12 +57,25 @@ def load_audio_infer(
     sample_rate,
     **kwargs,
 ):
-    formant_shifting = kwargs.get("formant_shifting", False)
     try:
         file = file.strip(" ").strip('"').strip("\n").strip('"').strip(" ")
         if not os.path.isfile(file):
             raise FileNotFoundError(f"File not found: {file}")
         audio, sr = sf.read(file)
+    except Exception as error:
+        raise RuntimeError(f"An error occurred loading the audio: {error}")
+    return prepare_audio_infer(audio, sr, sample_rate, **kwargs)
+
+
+def prepare_audio_infer(
+    audio,
+    sr,
+    sample_rate,
+    **kwargs,
+):
+    formant_shifting = kwargs.get("formant_shifting", False)
+    try:
+        audio = np.asarray(audio)
         if len(audio.shape) > 1:
             audio = librosa.to_mono(audio.T)
         if sr != sample_rate:
@@ -0,0 +1,103 @@
+import time
+import importlib
+import threading
+import traceback
+from typing import Callable, Dict, List, Optional
+
+
+def import_modules(names: List[str]) -> Dict[str, float]:
+    """Import modules in order and return the seconds each one added"""
+    timings = {}
+    for name in names:
+        start = time.perf_counter()
+        importlib.import_module(name)
+        timings[name] = round(time.perf_counter() - start, 3)
+    return timings
+
+
+class WarmUp:
+    """Startup steps run in order on a background thread, so the server answers
+    liveness checks while heavy modules and models load.
+
+    A step is a callable; whatever it returns (JSON-serializable, or None) is
+    reported as the step's detail.
+    The instance is ready once every step has finished without an error.
+    """
+
+    def __init__(self):
+        self._steps = []
+        self._lock = threading.Lock()
+        self._thread = None
+        self._started_at = None
+        self._finished_at = None
+
+    def add_step(self, name: str, fn: Callable):
+        """Add a step; a step may add further steps, which run after the ones already added"""
+        step = {
+            "name": name,
+            "fn": fn,
+            "status": "pending",
+            "seconds": None,
+            "detail": None,
+            "error": None,
+        }
+        with self._lock:
+            self._steps.append(step)
+
+    def start(self):
+        """Run the steps on a daemon thread"""
+        self._started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name="warmup", daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the steps have run and return whether the instance is ready"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.ready
+
+    @property
+    def ready(self) -> bool:
+        with self._lock:
+            return self._finished_at is not None and all(step["status"] == "done" for step in self._steps)
+
+    def status(self) -> Dict:
+        """Readiness, elapsed time and per-step status, timing and detail"""
+        with self._lock:
+            steps = [
+                {key: value for key, value in step.items() if key != "fn"}
+                for step in self._steps
+            ]
+            finished_at = self._finished_at
+        end = finished_at or time.time()
+        return {
+            "ready": finished_at is not None and all(step["status"] == "done" for step in steps),
+            "finished": finished_at is not None,
+            "elapsed": round(end - self._started_at, 3) if self._started_at else 0.0,
+            "steps": steps,
+        }
+
+    def _run(self):
+        index = 0
+        while True:
+            with self._lock:
+                if index == len(self._steps):
+                    self._finished_at = time.time()
+                    return
+                step = self._steps[index]
+                step["status"] = "running"
+            index += 1
+            start = time.perf_counter()
+            try:
+                detail = step["fn"]()
+                status, error = "done", None
+            except Exception as e:
+                print(f"[ERROR] Warm-up step '{step['name']}' failed: {e}")
+                print(traceback.format_exc())
+                detail, status, error = None, "failed", str(e)
+            with self._lock:
+                step["status"] = status
+                step["seconds"] = round(time.perf_counter() - start, 3)
+                step["detail"] = detail
+                step["error"] = error
+            print(f"[INFO] Warm-up step '{step['name']}' {status} in {step['seconds']:.2f}s")